@@ -1,13 +1,25 @@
-from fastapi import APIRouter
+import time
+
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 
 from models.interview_models import (
     InterviewStartRequest, InterviewStartResponse,
     InterviewNextRequest, InterviewNextResponse,
-    InterviewEvaluationRequest, InterviewEvaluationResponse
+    InterviewEvaluationRequest, InterviewEvaluationResponse,
+    RecommendationRequest, RecommendationResponse,
+    EvaluationJobRequest, EvaluationJobResponse,
+    BatchEvaluationRequest
 )
 
+from core.config import NEXT_DEADLINE_S, EVALUATION_DEADLINE_S, BATCH_EVALUATION_CONCURRENCY, BATCH_EVALUATION_MAX_ITEMS
+from core.deadline import Deadline, DeadlineExceeded
+from core.responses import dumps_json
 from services.gemini_service import generate_tail_question, evaluate_conversation
 from services.initial_questions import get_random_question
+from services.recommendation import recommend_questions
+from services.evaluation_jobs import submit_job, get_job, validate_callback_url, JobQueueFull, InvalidCallbackUrl
+from services.batch_evaluation import evaluate_batch
 
 router = APIRouter(
     prefix="/interview",
@@ -29,7 +41,11 @@ async def get_next_question(request: InterviewNextRequest):
     이전 대화 내용을 받아 Gemini API를 통해 다음 꼬리 질문을 비동기로 생성하고 성능을 반환합니다.
     """
     # 비동기 함수 호출이므로 await 추가
-    result = await generate_tail_question(request.messages)
+    # 제한 시간을 넘기면 서비스 내부에서 사전 생성/질문 뱅크 질문으로 대체하며, 대체할 질문도 없을 때만 504를 반환합니다.
+    try:
+        result = await generate_tail_question(request.messages, deadline=Deadline(NEXT_DEADLINE_S))
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e))
     return InterviewNextResponse(response=result['response'], performance=result['performance'])
 
 @router.post("/evaluation", response_model=InterviewEvaluationResponse)
@@ -38,8 +54,99 @@ async def evaluate_interview(request: InterviewEvaluationRequest):
     전체 대화 내용을 받아 Gemini API를 통해 구조화된 종합 평가를 비동기로 생성합니다.
     (성능 지표는 내부적으로만 계산되고 클라이언트에게는 반환되지 않습니다.)
     """
-    evaluation_result = await evaluate_conversation(request.conversation)
+    try:
+        evaluation_result = await evaluate_conversation(request.conversation, deadline=Deadline(EVALUATION_DEADLINE_S))
+    except DeadlineExceeded as e:
+        raise HTTPException(status_code=504, detail=str(e))
     return InterviewEvaluationResponse(
         interviewType=request.interviewType,
         evaluation_report=evaluation_result['evaluation_report']
-    )
\ No newline at end of file
+    )
+
+
+@router.post("/evaluation/jobs", response_model=EvaluationJobResponse, status_code=202)
+async def submit_evaluation_job(request: EvaluationJobRequest):
+    """
+    면접 평가를 비동기 작업으로 등록하고 작업 ID를 바로 반환합니다.
+    (대기열은 이벤트 루프의 asyncio.Queue이므로 스레드 풀이 아닌 이벤트 루프에서 실행되도록 async로 정의합니다.)
+    결과는 GET /interview/evaluation/jobs/{job_id}로 조회하거나, callback_url을 지정하면 완료 시 POST로 받습니다.
+    callback_url은 공인 주소로 해석되는 https URL(또는 EVALUATION_CALLBACK_ALLOWED_HOSTS의 호스트)만 허용하며, 아니면 400을 반환합니다.
+    대기열이 가득 차면 503을 반환합니다.
+    """
+    callback_url = str(request.callback_url) if request.callback_url else None
+    try:
+        if callback_url:
+            await validate_callback_url(callback_url)
+        job = await submit_job(request.interviewType, request.conversation, callback_url)
+    except InvalidCallbackUrl as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except JobQueueFull as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "10"})
+    return EvaluationJobResponse(**job)
+
+
+@router.get("/evaluation/jobs/{job_id}", response_model=EvaluationJobResponse)
+def get_evaluation_job(job_id: str):
+    """
+    비동기 평가 작업의 상태와 결과를 반환합니다. 완료 후 일정 시간(EVALUATION_JOB_TTL_S)이 지나면 404를 반환합니다.
+    """
+    job = get_job(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"'{job_id}' 작업을 찾을 수 없습니다.")
+    return EvaluationJobResponse(**job)
+
+
+@router.post("/evaluation/batch")
+async def evaluate_interview_batch(request: BatchEvaluationRequest):
+    """
+    여러 면접 대화를 한 번에 평가하고, 평가가 끝나는 순서대로 결과를 NDJSON(한 줄에 JSON 하나)으로 스트리밍합니다.
+    동시에 실행되는 평가 수는 concurrency(최대 BATCH_EVALUATION_CONCURRENCY)로, 요청 속도는 모든 배치가 공유하는
+    BATCH_EVALUATION_RPM으로 제한되며 429 응답은 백오프 후 재시도합니다.
+
+    - 결과 줄: {"id", "content_hash", "status": "succeeded" | "failed", "result" | "error", "attempts", "elapsed_s"}
+    - 마지막 줄: {"summary": {"batch_id", "total", "succeeded", "failed", "resumed", "elapsed_s"}}
+
+    batch_id를 지정하면 성공한 항목의 결과를 저장해 두므로, 중간에 끊긴 배치를 같은 batch_id로 다시 요청하면
+    남은 항목만 평가합니다. (id와 interviewType·conversation이 모두 같은 성공 항목은 "resumed": true와 함께
+    저장된 결과를 바로 반환하고, 같은 id라도 내용이 바뀌었으면 다시 평가)
+    """
+    if len(request.items) > BATCH_EVALUATION_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"한 번에 최대 {BATCH_EVALUATION_MAX_ITEMS}개까지 평가할 수 있습니다.")
+    ids = [item.id for item in request.items]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="items의 id가 중복되었습니다.")
+
+    concurrency = min(request.concurrency or BATCH_EVALUATION_CONCURRENCY, BATCH_EVALUATION_CONCURRENCY)
+
+    async def stream():
+        start = time.perf_counter()
+        summary = {"batch_id": request.batch_id, "total": len(request.items), "succeeded": 0, "failed": 0, "resumed": 0}
+        async for line in evaluate_batch(request.items, concurrency=concurrency, batch_id=request.batch_id):
+            summary[line["status"]] += 1
+            if line.get("resumed"):
+                summary["resumed"] += 1
+            yield dumps_json(line) + b"\n"
+        summary["elapsed_s"] = round(time.perf_counter() - start, 3)
+        yield dumps_json({"summary": summary}) + b"\n"
+
+    return StreamingResponse(stream(), media_type="application/x-ndjson")
+
+
+@router.post("/recommendations", response_model=RecommendationResponse)
+def recommend_practice_questions(request: RecommendationRequest):
+    """
+    키워드 또는 평가 리포트의 improvement_keywords에 맞는 연습 질문을 질문 뱅크에서 카테고리별로 추천합니다.
+    대화 기록을 함께 넘기면 이미 받은 질문은 제외합니다.
+    """
+    keywords = list(request.keywords)
+    if request.evaluation_report:
+        keywords.extend(request.evaluation_report.improvement_keywords)
+    keywords = list(dict.fromkeys(keyword.strip() for keyword in keywords if keyword.strip()))
+    if not keywords:
+        raise HTTPException(status_code=400, detail="keywords 또는 evaluation_report.improvement_keywords가 필요합니다.")
+
+    asked = [msg.content for msg in request.conversation if msg.role == "assistant"]
+    return RecommendationResponse(
+        keywords=keywords,
+        recommendations=recommend_questions(keywords, request.top_k, asked)
+    )
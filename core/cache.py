@@ -0,0 +1,291 @@
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from core.config import (
+    CACHE_BACKEND, CACHE_SQLITE_PATH, CACHE_COMPRESS_MIN_BYTES, CACHE_SQLITE_EVICT_EVERY, CACHE_NAMESPACES
+)
+
+# 직렬화 형식: 첫 바이트 플래그 + 본문
+# - _FLAG_BYTES: 값이 bytes (아니면 JSON)
+# - _FLAG_ZLIB: 본문이 zlib 압축됨
+_FLAG_BYTES = 1
+_FLAG_ZLIB = 2
+
+
+def _serialize(value: Any) -> bytes:
+    """
+    값을 캐시에 저장할 bytes로 바꿉니다. dict/list 등은 공백 없는 JSON으로, 일정 크기 이상은 zlib으로 압축합니다.
+    """
+    flags = 0
+    if isinstance(value, bytes):
+        body = value
+        flags |= _FLAG_BYTES
+    else:
+        body = json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    if len(body) >= CACHE_COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(body, 6)
+        if len(compressed) < len(body):
+            body = compressed
+            flags |= _FLAG_ZLIB
+    return bytes([flags]) + body
+
+
+def _deserialize(data: bytes) -> Any:
+    flags, body = data[0], data[1:]
+    if flags & _FLAG_ZLIB:
+        body = zlib.decompress(body)
+    if flags & _FLAG_BYTES:
+        return bytes(body)
+    return json.loads(body.decode('utf-8'))
+
+
+def make_key(*parts: Any) -> str:
+    """
+    여러 값을 이어 고정 길이 캐시 키를 만듭니다. (프롬프트처럼 긴 값을 키로 쓸 때 사용)
+    """
+    return hashlib.sha256('\x1f'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+class MemoryLRUBackend:
+    """
+    프로세스 내부 LRU 캐시입니다. 네임스페이스마다 최대 항목 수를 넘으면 가장 오래 쓰지 않은 항목부터 제거합니다.
+    워커 프로세스끼리 공유되지 않으므로 단일 워커 실행이나 테스트용입니다.
+    """
+
+    name = "memory"
+    # 잠금 안에서 dict만 다루므로 이벤트 루프에서 바로 호출해도 됩니다.
+    blocking = False
+
+    def __init__(self):
+        self._data: Dict[str, "OrderedDict[str, Tuple[bytes, float]]"] = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        with self._lock:
+            entries = self._data.get(namespace)
+            if not entries or key not in entries:
+                return None
+            data, expires_at = entries[key]
+            if expires_at <= time.time():
+                del entries[key]
+                return None
+            entries.move_to_end(key)
+            return data
+
+    def set(self, namespace: str, key: str, data: bytes, ttl_s: float, max_entries: int):
+        with self._lock:
+            entries = self._data.setdefault(namespace, OrderedDict())
+            entries[key] = (data, time.time() + ttl_s)
+            entries.move_to_end(key)
+            while len(entries) > max_entries:
+                entries.popitem(last=False)
+
+    def delete(self, namespace: str, key: str):
+        with self._lock:
+            self._data.get(namespace, {}).pop(key, None)
+
+    def count(self, namespace: str) -> int:
+        with self._lock:
+            return len(self._data.get(namespace, ()))
+
+
+class SQLiteBackend:
+    """
+    SQLite(WAL 모드) 파일을 여러 워커 프로세스가 함께 쓰는 공유 캐시입니다.
+    WAL 모드에서는 읽기가 쓰기를 막지 않으므로, uvicorn 워커 수를 늘려도 캐시가 워커마다 나뉘지 않습니다.
+    네임스페이스마다 최대 항목 수를 넘으면 가장 오래 전에 저장한 항목부터 제거합니다.
+    정리 쿼리는 항목 수에 비례하므로 저장할 때마다 실행하지 않고 evict_every번 저장할 때마다 한 번 실행합니다.
+    (그 사이에는 최대 항목 수를 잠시 넘을 수 있고, 만료된 항목은 조회할 때 지웁니다)
+    """
+
+    name = "sqlite"
+    # 다른 워커가 쓰는 동안 잠금을 기다릴 수 있으므로 비동기 코드에서는 스레드에서 호출합니다.
+    blocking = True
+
+    def __init__(self, path: str, evict_every: int = CACHE_SQLITE_EVICT_EVERY):
+        self.path = path
+        self.evict_every = max(evict_every, 1)
+        self._writes: Dict[str, int] = {}
+        self._writes_lock = threading.Lock()
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache_entries ("
+                " namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL,"
+                " expires_at REAL NOT NULL, stored_at REAL NOT NULL,"
+                " PRIMARY KEY (namespace, key))"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_stored ON cache_entries (namespace, stored_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # sqlite3 연결은 스레드 간에 공유할 수 없으므로 스레드마다 하나씩 엽니다.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str) -> Optional[bytes]:
+        row = self._connect().execute(
+            "SELECT value, expires_at FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] <= time.time():
+            self.delete(namespace, key)
+            return None
+        return row[0]
+
+    def set(self, namespace: str, key: str, data: bytes, ttl_s: float, max_entries: int):
+        now = time.time()
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (namespace, key, value, expires_at, stored_at) VALUES (?, ?, ?, ?, ?)",
+            (namespace, key, sqlite3.Binary(data), now + ttl_s, now)
+        )
+        with self._writes_lock:
+            writes = self._writes.get(namespace, 0) + 1
+            self._writes[namespace] = writes
+        if writes % self.evict_every == 0:
+            self.evict(namespace, max_entries)
+
+    def evict(self, namespace: str, max_entries: int):
+        """
+        만료된 항목과, 최대 항목 수를 넘는 가장 오래 전에 저장한 항목을 지웁니다.
+        """
+        now = time.time()
+        self._connect().execute(
+            "DELETE FROM cache_entries WHERE namespace = ? AND (expires_at <= ? OR key IN ("
+            " SELECT key FROM cache_entries WHERE namespace = ? ORDER BY stored_at DESC LIMIT -1 OFFSET ?))",
+            (namespace, now, namespace, max_entries)
+        )
+
+    def delete(self, namespace: str, key: str):
+        self._connect().execute("DELETE FROM cache_entries WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def count(self, namespace: str) -> int:
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM cache_entries WHERE namespace = ?", (namespace,)
+        ).fetchone()[0]
+
+
+class NamespaceCache:
+    """
+    하나의 네임스페이스(crawl, tail_question, evaluation 등)에 대한 캐시입니다.
+    TTL과 최대 항목 수는 네임스페이스별로 core.config.CACHE_NAMESPACES에서 정합니다.
+    캐시 오류는 서비스 오류로 번지지 않도록 기록만 하고 캐시 미스로 처리합니다.
+    비동기 코드에서는 이벤트 루프가 디스크 I/O나 잠금 대기로 멈추지 않도록 aget/aset/adelete를 사용합니다.
+    """
+
+    def __init__(self, backend, namespace: str, ttl_s: float, max_entries: int):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl_s = ttl_s
+        self.max_entries = max_entries
+        self.stats = {"hits": 0, "misses": 0, "sets": 0, "errors": 0}
+
+    def get(self, key: str) -> Optional[Any]:
+        try:
+            data = self.backend.get(self.namespace, key)
+            value = _deserialize(data) if data is not None else None
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"[Cache] '{self.namespace}' 조회 실패: {type(e).__name__} {e}")
+            value = None
+        self.stats["hits" if value is not None else "misses"] += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl_s: Optional[float] = None):
+        try:
+            self.backend.set(self.namespace, key, _serialize(value), ttl_s or self.ttl_s, self.max_entries)
+            self.stats["sets"] += 1
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"[Cache] '{self.namespace}' 저장 실패: {type(e).__name__} {e}")
+
+    def delete(self, key: str):
+        try:
+            self.backend.delete(self.namespace, key)
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"[Cache] '{self.namespace}' 삭제 실패: {type(e).__name__} {e}")
+
+    async def aget(self, key: str) -> Optional[Any]:
+        if getattr(self.backend, "blocking", True):
+            return await asyncio.to_thread(self.get, key)
+        return self.get(key)
+
+    async def aset(self, key: str, value: Any, ttl_s: Optional[float] = None):
+        if getattr(self.backend, "blocking", True):
+            await asyncio.to_thread(self.set, key, value, ttl_s)
+        else:
+            self.set(key, value, ttl_s)
+
+    async def adelete(self, key: str):
+        if getattr(self.backend, "blocking", True):
+            await asyncio.to_thread(self.delete, key)
+        else:
+            self.delete(key)
+
+
+_backend = None
+_caches: Dict[str, NamespaceCache] = {}
+_lock = threading.Lock()
+
+
+def _create_backend():
+    if CACHE_BACKEND == "sqlite":
+        try:
+            return SQLiteBackend(CACHE_SQLITE_PATH)
+        except sqlite3.Error as e:
+            print(f"[Cache] SQLite 캐시를 열 수 없어 메모리 캐시를 사용합니다: {e}")
+    elif CACHE_BACKEND != "memory":
+        raise ValueError(f"알 수 없는 CACHE_BACKEND: {CACHE_BACKEND} (memory | sqlite)")
+    return MemoryLRUBackend()
+
+
+def get_cache(namespace: str) -> NamespaceCache:
+    """
+    네임스페이스 캐시를 반환합니다. 백엔드는 CACHE_BACKEND 설정에 따라 처음 호출될 때 한 번 만듭니다.
+    """
+    global _backend
+    with _lock:
+        if namespace not in _caches:
+            if _backend is None:
+                _backend = _create_backend()
+            ttl_s, max_entries = CACHE_NAMESPACES.get(namespace, CACHE_NAMESPACES["default"])
+            _caches[namespace] = NamespaceCache(_backend, namespace, ttl_s, max_entries)
+        return _caches[namespace]
+
+
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    캐시 백엔드 종류와 네임스페이스별 적중률/항목 수를 반환합니다. (적중률은 현재 워커 기준)
+    """
+    with _lock:
+        caches = dict(_caches)
+    namespaces = {}
+    for namespace, cache in caches.items():
+        lookups = cache.stats["hits"] + cache.stats["misses"]
+        try:
+            entries = cache.backend.count(namespace)
+        except Exception:
+            entries = None
+        namespaces[namespace] = {
+            **cache.stats,
+            "hit_rate": round(cache.stats["hits"] / lookups, 4) if lookups else 0.0,
+            "entries": entries,
+        }
+    return {"backend": _backend.name if _backend else CACHE_BACKEND, "namespaces": namespaces}
@@ -7,4 +7,131 @@ GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
 TAIL_QUESTION_MODEL = os.getenv("TAIL_QUESTION_MODEL", "gemini-2.5-flash-lite")
 
-EVALUATION_MODEL = os.getenv("EVALUATION_MODEL", "gemini-2.5-flash")
\ No newline at end of file
+EVALUATION_MODEL = os.getenv("EVALUATION_MODEL", "gemini-2.5-flash")
+
+# 모델 백엔드 선택 (gemini: 실제 Gemini API, fake: 네트워크 없이 동작하는 로컬 대체 서버)
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "gemini")
+
+# fake 백엔드 응답 특성 (부하 테스트용)
+FAKE_TTFT_MS = float(os.getenv("FAKE_TTFT_MS", "300"))
+FAKE_CHUNK_DELAY_MS = float(os.getenv("FAKE_CHUNK_DELAY_MS", "20"))
+FAKE_TOKENS_PER_SECOND = float(os.getenv("FAKE_TOKENS_PER_SECOND", "150"))
+FAKE_CHUNK_TOKENS = int(os.getenv("FAKE_CHUNK_TOKENS", "8"))
+FAKE_ERROR_RATE = float(os.getenv("FAKE_ERROR_RATE", "0"))
+FAKE_RATE_LIMIT_RATE = float(os.getenv("FAKE_RATE_LIMIT_RATE", "0"))
+
+# 사전 생성 꼬리 질문 사용 조건
+# 답변이 후보 키워드와 이 비율 이상 일치하면 Gemini 호출 없이 바로 반환합니다.
+FOLLOWUP_MATCH_THRESHOLD = float(os.getenv("FOLLOWUP_MATCH_THRESHOLD", "0.6"))
+# 후보가 있을 때 Gemini 응답을 기다리는 최대 시간(초). 초과하거나 실패하면 후보로 대체합니다.
+FOLLOWUP_FALLBACK_TIMEOUT_S = float(os.getenv("FOLLOWUP_FALLBACK_TIMEOUT_S", "5"))
+
+# 고정 프롬프트(채점 기준표, 꼬리 질문 지시문) 컨텍스트 캐싱
+PROMPT_CACHE_ENABLED = os.getenv("PROMPT_CACHE_ENABLED", "true").lower() == "true"
+PROMPT_CACHE_TTL_S = int(os.getenv("PROMPT_CACHE_TTL_S", "3600"))
+# 만료까지 이 시간(초)보다 적게 남으면 TTL을 연장합니다.
+PROMPT_CACHE_REFRESH_MARGIN_S = int(os.getenv("PROMPT_CACHE_REFRESH_MARGIN_S", "300"))
+# 캐시 생성에 실패하면(최소 토큰 수 미달, 권한 문제 등) 이 시간(초) 동안 재시도하지 않습니다.
+PROMPT_CACHE_RETRY_AFTER_S = int(os.getenv("PROMPT_CACHE_RETRY_AFTER_S", "600"))
+# 컨텍스트 캐시 최소 토큰 수: 고정 프롬프트가 이보다 짧으면 생성 요청이 항상 실패하므로 캐시하지 않습니다.
+# (Gemini 2.5 Flash 계열 1024, 2.5 Pro 4096)
+PROMPT_CACHE_MIN_TOKENS = int(os.getenv("PROMPT_CACHE_MIN_TOKENS", "1024"))
+
+# fake 백엔드의 컨텍스트 캐시 동작
+FAKE_CACHE_CREATE_MS = float(os.getenv("FAKE_CACHE_CREATE_MS", "200"))
+FAKE_CACHED_TTFT_RATIO = float(os.getenv("FAKE_CACHED_TTFT_RATIO", "0.4"))
+
+# 꼬리 질문 헤징: 첫 청크가 늦으면 같은 모델(또는 대체 모델)로 두 번째 요청을 보내 먼저 응답한 쪽을 사용합니다.
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "true").lower() == "true"
+# 두 번째 요청을 보낼 모델 (기본: 꼬리 질문 모델과 같은 모델, 빈 값이면 헤징하지 않음)
+# 보통 더 느린 평가 모델로 보내면 기본 요청보다 먼저 응답하는 경우가 드뭅니다.
+TAIL_QUESTION_HEDGE_MODEL = os.getenv("TAIL_QUESTION_HEDGE_MODEL", TAIL_QUESTION_MODEL)
+# TTFT 표본이 부족할 때 사용하는 고정 대기 시간(ms)
+HEDGE_DEADLINE_MS = float(os.getenv("HEDGE_DEADLINE_MS", "1500"))
+# 표본이 충분하면 최근 TTFT의 이 백분위수를 대기 시간으로 사용합니다. (최소 HEDGE_MIN_DEADLINE_MS)
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "95"))
+HEDGE_MIN_DEADLINE_MS = float(os.getenv("HEDGE_MIN_DEADLINE_MS", "300"))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+HEDGE_WINDOW_SIZE = int(os.getenv("HEDGE_WINDOW_SIZE", "200"))
+
+# 엔드포인트별 전체 시간 예산(초). 크롤링 요청과 모델 스트림은 남은 시간만큼만 기다립니다.
+REVIEWS_DEADLINE_S = float(os.getenv("REVIEWS_DEADLINE_S", "15"))
+NEXT_DEADLINE_S = float(os.getenv("NEXT_DEADLINE_S", "10"))
+EVALUATION_DEADLINE_S = float(os.getenv("EVALUATION_DEADLINE_S", "90"))
+
+# 크롤링 사이트별 서킷 브레이커: 연속 실패 횟수와 요청 재개까지의 대기 시간(초)
+CRAWL_BREAKER_FAILURE_THRESHOLD = int(os.getenv("CRAWL_BREAKER_FAILURE_THRESHOLD", "3"))
+CRAWL_BREAKER_RECOVERY_TIMEOUT_S = float(os.getenv("CRAWL_BREAKER_RECOVERY_TIMEOUT_S", "60"))
+
+# 사람인 증분 크롤링: 저장된 후기 지문과 겹치는 페이지에서 멈추고 새 후기만 합칩니다.
+SARAMIN_INCREMENTAL_ENABLED = os.getenv("SARAMIN_INCREMENTAL_ENABLED", "false").lower() == "true"
+SARAMIN_MAX_PAGES = int(os.getenv("SARAMIN_MAX_PAGES", "30"))
+REVIEW_STORE_DIR = os.getenv("REVIEW_STORE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'reviews'))
+
+# HTML 파싱 프로세스 풀: 크롤링 파싱을 별도 프로세스에서 실행 (크기 0이면 CPU 코어 수)
+PARSE_POOL_ENABLED = os.getenv("PARSE_POOL_ENABLED", "false").lower() == "true"
+PARSE_POOL_SIZE = int(os.getenv("PARSE_POOL_SIZE", "0"))
+PARSE_POOL_MAX_TASKS = int(os.getenv("PARSE_POOL_MAX_TASKS", "100"))
+
+# 공유 캐시: memory(워커별 LRU) 또는 sqlite(WAL 모드 파일을 여러 워커가 공유)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "sqlite").lower()
+CACHE_SQLITE_PATH = os.getenv("CACHE_SQLITE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'cache.sqlite3'))
+CACHE_COMPRESS_MIN_BYTES = int(os.getenv("CACHE_COMPRESS_MIN_BYTES", "512"))
+# sqlite: 네임스페이스마다 이 횟수만큼 저장할 때 한 번씩 만료/초과 항목을 정리합니다. (저장마다 정리하지 않음)
+CACHE_SQLITE_EVICT_EVERY = int(os.getenv("CACHE_SQLITE_EVICT_EVERY", "100"))
+CACHE_CRAWL_TTL_S = float(os.getenv("CACHE_CRAWL_TTL_S", "600"))
+CACHE_TAIL_QUESTION_TTL_S = float(os.getenv("CACHE_TAIL_QUESTION_TTL_S", "3600"))
+CACHE_EVALUATION_TTL_S = float(os.getenv("CACHE_EVALUATION_TTL_S", "86400"))
+
+# 네임스페이스별 (TTL(초), 최대 항목 수)
+CACHE_NAMESPACES = {
+    "default": (3600, 1000),
+    # 회사별 통합 크롤링 결과
+    "crawl": (CACHE_CRAWL_TTL_S, 100),
+    # /api/interview-reviews 응답 본문 (직렬화된 JSON과 gzip/br 압축본)
+    "crawl_body": (CACHE_CRAWL_TTL_S, 300),
+    # URL별 ETag/Last-Modified, 후기 영역 해시, 파싱 결과 (조건부 요청용)
+    "crawl_pages": (7 * 86400, 500),
+    # 서킷 브레이커가 열렸을 때 반환할 사이트별 마지막 성공 결과
+    "crawl_last_good": (7 * 86400, 200),
+    "tail_question": (CACHE_TAIL_QUESTION_TTL_S, 5000),
+    "evaluation": (CACHE_EVALUATION_TTL_S, 1000),
+    # 비동기 평가 작업 상태 (EVALUATION_JOB_TTL_S 후 삭제)
+    "evaluation_jobs": (float(os.getenv("EVALUATION_JOB_TTL_S", "3600")), 10000),
+    # 배치 평가의 항목별 성공 결과 (같은 batch_id로 다시 요청하면 이어서 진행)
+    "evaluation_batches": (float(os.getenv("BATCH_EVALUATION_TTL_S", "86400")), 100000),
+}
+
+# 시작 시 모델 워밍업: true면 고정 프롬프트 컨텍스트 캐시 생성이 끝날 때까지 기다려 첫 요청 전에 API 연결을 엽니다.
+# (false여도 캐시는 시작 시 백그라운드에서 만듭니다)
+MODEL_WARMUP_ENABLED = os.getenv("MODEL_WARMUP_ENABLED", "false").lower() == "true"
+
+# 응답 압축: 이 크기(bytes) 이상인 JSON 응답을 gzip 또는 br(brotli 설치 시)로 압축
+RESPONSE_COMPRESS_MIN_BYTES = int(os.getenv("RESPONSE_COMPRESS_MIN_BYTES", "1024"))
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "6"))
+RESPONSE_BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "5"))
+
+# 면접 질문 검색 색인 스냅샷 경로 (빠른 시작용)
+SEARCH_INDEX_PATH = os.getenv("SEARCH_INDEX_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'search_index.json.gz'))
+# 색인이 바뀐 뒤 스냅샷을 저장하기까지 기다리는 시간(초): 그 사이의 변경은 한 번의 저장으로 합칩니다.
+SEARCH_INDEX_SAVE_DELAY_S = float(os.getenv("SEARCH_INDEX_SAVE_DELAY_S", "5"))
+
+# 연습 질문 추천용 TF-IDF 색인 디렉토리 (scripts/build_recommend_index.py로 미리 생성)
+RECOMMEND_INDEX_DIR = os.getenv("RECOMMEND_INDEX_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'recommend_index'))
+
+# 비동기 평가 작업: 동시에 실행할 평가 수, 대기열 크기, 콜백 요청 제한 시간(초)과 재시도 횟수
+EVALUATION_WORKERS = int(os.getenv("EVALUATION_WORKERS", "4"))
+EVALUATION_QUEUE_SIZE = int(os.getenv("EVALUATION_QUEUE_SIZE", "100"))
+EVALUATION_CALLBACK_TIMEOUT_S = float(os.getenv("EVALUATION_CALLBACK_TIMEOUT_S", "10"))
+EVALUATION_CALLBACK_RETRIES = int(os.getenv("EVALUATION_CALLBACK_RETRIES", "3"))
+# 콜백을 보낼 수 있는 호스트 목록 (쉼표 구분). 비어 있으면 공인 IP로 해석되는 https 주소만 허용하고,
+# 지정하면 목록의 호스트로만 보냅니다. (내부 서비스로 콜백을 받아야 할 때 사용)
+EVALUATION_CALLBACK_ALLOWED_HOSTS = {
+    host.strip().lower() for host in os.getenv("EVALUATION_CALLBACK_ALLOWED_HOSTS", "").split(",") if host.strip()
+}
+
+# 배치 평가: 배치당 동시에 실행할 평가 수, 모든 배치가 공유하는 Gemini 분당 요청 수(RPM), 항목별 재시도 횟수, 요청당 최대 항목 수
+BATCH_EVALUATION_CONCURRENCY = int(os.getenv("BATCH_EVALUATION_CONCURRENCY", "8"))
+BATCH_EVALUATION_RPM = float(os.getenv("BATCH_EVALUATION_RPM", "60"))
+BATCH_EVALUATION_MAX_RETRIES = int(os.getenv("BATCH_EVALUATION_MAX_RETRIES", "4"))
+BATCH_EVALUATION_MAX_ITEMS = int(os.getenv("BATCH_EVALUATION_MAX_ITEMS", "1000"))
@@ -0,0 +1,30 @@
+import time
+from typing import Optional
+
+
+class DeadlineExceeded(Exception):
+    """
+    요청에 할당된 시간 예산을 모두 사용했을 때 발생하는 예외입니다.
+    """
+
+
+class Deadline:
+    """
+    엔드포인트별 시간 예산입니다. 생성 시점부터 timeout_s 뒤에 만료되며,
+    하위 호출(크롤링 요청, 모델 스트림)은 remaining()만큼만 기다리도록 전달받습니다.
+    """
+
+    def __init__(self, timeout_s: float):
+        self.timeout_s = timeout_s
+        self.expires_at = time.monotonic() + timeout_s
+
+    def remaining(self, cap: Optional[float] = None) -> float:
+        """
+        남은 시간(초)을 반환합니다. cap이 주어지면 그보다 길게 반환하지 않습니다.
+        """
+        remaining = max(self.expires_at - time.monotonic(), 0.0)
+        return min(remaining, cap) if cap is not None else remaining
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
@@ -0,0 +1,65 @@
+import asyncio
+import random
+import time
+from typing import Any, Awaitable, Callable, Optional
+
+
+class AsyncRateLimiter:
+    """
+    분당 요청 수(RPM)를 넘지 않도록 요청 시작 시점을 일정 간격으로 배분하는 비동기 리미터입니다.
+    429(Rate Limit) 응답을 받으면 penalize()로 모든 요청을 잠시 멈춰 쿼터 회복을 기다립니다.
+    """
+
+    def __init__(self, requests_per_minute: float):
+        self.interval = 60.0 / requests_per_minute if requests_per_minute > 0 else 0.0
+        self._next_time = 0.0
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            now = time.monotonic()
+            start_at = max(now, self._next_time)
+            self._next_time = start_at + self.interval
+        wait = start_at - now
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def penalize(self, delay_s: float):
+        self._next_time = max(self._next_time, time.monotonic() + delay_s)
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """
+    Gemini의 ResourceExhausted(429) 계열 오류인지 판별합니다.
+    """
+    return type(error).__name__ in ("ResourceExhausted", "TooManyRequests") or "429" in str(error)
+
+
+async def retry_with_backoff(
+    func: Callable[[], Awaitable[Any]],
+    max_retries: int = 4,
+    base_delay_s: float = 1.0,
+    max_delay_s: float = 60.0,
+    limiter: Optional[AsyncRateLimiter] = None,
+    on_retry: Optional[Callable[[int, Exception, float], None]] = None,
+) -> Any:
+    """
+    func를 실행하고 실패하면 지수 백오프(full jitter)로 재시도합니다.
+    limiter가 주어지면 매 시도 전에 속도 제한을 따르고, 429 오류 시 리미터 전체를 지연시킵니다.
+    """
+    for attempt in range(max_retries + 1):
+        if limiter:
+            await limiter.acquire()
+        try:
+            return await func()
+        except Exception as e:
+            if attempt == max_retries:
+                raise
+            delay = random.uniform(0, min(max_delay_s, base_delay_s * (2 ** attempt)))
+            if limiter and is_rate_limit_error(e):
+                # 429는 쿼터 문제이므로 다른 요청도 함께 늦춥니다.
+                delay = max(delay, base_delay_s * (2 ** attempt))
+                limiter.penalize(delay)
+            if on_retry:
+                on_retry(attempt + 1, e, delay)
+            await asyncio.sleep(delay)
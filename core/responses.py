@@ -0,0 +1,111 @@
+import gzip
+import json
+from typing import Any, Callable, Optional, Tuple
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from core.config import RESPONSE_COMPRESS_MIN_BYTES, RESPONSE_GZIP_LEVEL, RESPONSE_BROTLI_QUALITY
+
+# 선택 의존성: 설치되어 있으면 더 빠른 JSON 인코더와 brotli 압축을 사용합니다.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def dumps_json(content: Any) -> bytes:
+    """
+    응답 본문을 공백 없는 UTF-8 JSON bytes로 직렬화합니다. (orjson이 있으면 orjson 사용)
+    """
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Accept-Encoding 헤더에서 사용할 압축 방식을 고릅니다. br(설치된 경우) > gzip 순으로 선호하며, q=0은 제외합니다.
+    """
+    accepted = {}
+    for part in accept_encoding.split(','):
+        token, _, params = part.strip().partition(';')
+        q = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        if token:
+            accepted[token.lower()] = q
+
+    def allowed(encoding: str) -> bool:
+        return accepted.get(encoding, accepted.get('*', 0.0)) > 0
+
+    if brotli is not None and allowed('br'):
+        return 'br'
+    if allowed('gzip'):
+        return 'gzip'
+    return None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == 'br':
+        return brotli.compress(body, quality=RESPONSE_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL)
+
+
+def _response(body: bytes, encoding: Optional[str], status_code: int = 200) -> Response:
+    headers = {"Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+
+def json_response(request: Request, content: Any, status_code: int = 200) -> Response:
+    """
+    content를 직렬화하고, 크기가 RESPONSE_COMPRESS_MIN_BYTES 이상이면 클라이언트가 지원하는 방식으로 압축해 반환합니다.
+    """
+    body = dumps_json(content)
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    if encoding and len(body) >= RESPONSE_COMPRESS_MIN_BYTES:
+        return _response(compress(body, encoding), encoding, status_code)
+    return _response(body, None, status_code)
+
+
+def cached_json_response(request: Request, cache, key: str, produce: Callable[[], Tuple[Any, bool]]) -> Response:
+    """
+    직렬화된 본문(identity)과 압축된 본문(gzip, br)을 캐시에 함께 저장해, 반복 요청에서는 직렬화와 압축을 모두 건너뜁니다.
+
+    Args:
+        request: 요청 (Accept-Encoding 확인용)
+        cache: 본문을 저장할 core.cache 네임스페이스 캐시
+        key: 응답을 구분하는 캐시 키
+        produce: 캐시에 없을 때 (응답 내용, 캐시 가능 여부)를 반환하는 함수. HTTPException을 발생시킬 수 있습니다.
+    """
+    encoding = negotiate_encoding(request.headers.get("accept-encoding", ""))
+    if encoding:
+        compressed = cache.get(f"{key}:{encoding}")
+        if compressed is not None:
+            return _response(compressed, encoding)
+
+    cacheable = True
+    body = cache.get(f"{key}:identity")
+    if body is None:
+        content, cacheable = produce()
+        body = dumps_json(content)
+        if cacheable:
+            cache.set(f"{key}:identity", body)
+
+    if encoding and len(body) >= RESPONSE_COMPRESS_MIN_BYTES:
+        compressed = compress(body, encoding)
+        if cacheable:
+            cache.set(f"{key}:{encoding}", compressed)
+        return _response(compressed, encoding)
+    return _response(body, None)
@@ -0,0 +1,85 @@
+import threading
+import time
+from typing import Dict, Any
+
+
+class CircuitBreaker:
+    """
+    크롤링 대상 사이트별 서킷 브레이커
+
+    - closed: 정상 상태. 연속 실패가 failure_threshold에 도달하면 open으로 전환합니다.
+    - open: 요청을 보내지 않고 즉시 실패(또는 캐시 반환) 처리합니다. recovery_timeout_s가 지나면 half_open으로 전환합니다.
+    - half_open: 시험 요청 하나만 허용합니다. 성공하면 closed, 실패하면 다시 open으로 전환합니다.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 3, recovery_timeout_s: float = 60.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout_s = recovery_timeout_s
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._total_failures = 0
+        self._total_rejected = 0
+        self._last_error = None
+
+    def allow_request(self) -> bool:
+        """
+        지금 요청을 보내도 되는지 반환합니다. half_open 상태에서는 시험 요청 하나만 허용합니다.
+        """
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.recovery_timeout_s:
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+
+            if self._state == self.CLOSED:
+                return True
+            if self._state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+
+            self._total_rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self, error: str = None):
+        with self._lock:
+            self._consecutive_failures += 1
+            self._total_failures += 1
+            self._last_error = error
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                if self._state != self.OPEN:
+                    print(f"[CircuitBreaker] '{self.name}' 연속 실패 {self._consecutive_failures}회로 요청을 {self.recovery_timeout_s}초 동안 중단합니다: {error}")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        현재 상태를 메트릭/헬스체크 응답용 dict로 반환합니다.
+        """
+        with self._lock:
+            state = self._state
+            retry_in = 0.0
+            if state == self.OPEN:
+                retry_in = max(self.recovery_timeout_s - (time.monotonic() - self._opened_at), 0.0)
+            return {
+                "state": state,
+                "consecutive_failures": self._consecutive_failures,
+                "total_failures": self._total_failures,
+                "total_rejected": self._total_rejected,
+                "retry_in_s": round(retry_in, 1),
+                "last_error": self._last_error,
+            }
@@ -1,22 +1,76 @@
-from typing import Dict, Optional
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+import sys
+from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 
 try:
     # main.py에서 import할 때
     from crawler.job import crawl_interview_reviews as crawl_jobkorea, get_company_url
-    from crawler.saramin import crawl_saramin_reviews, get_saramin_url
+    from crawler.saramin import crawl_saramin_reviews, crawl_saramin_reviews_incremental, get_saramin_url
+    from crawler.circuit_breaker import CircuitBreaker
+    from crawler.parse_pool import configure_parse_pool
 except ImportError:
-    # crawler 디렉토리에서 직접 실행할 때
+    # crawler 디렉토리에서 직접 실행할 때 (core 패키지를 찾을 수 있도록 프로젝트 루트를 추가)
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
     from job import crawl_interview_reviews as crawl_jobkorea, get_company_url
-    from saramin import crawl_saramin_reviews, get_saramin_url
+    from saramin import crawl_saramin_reviews, crawl_saramin_reviews_incremental, get_saramin_url
+    from circuit_breaker import CircuitBreaker
+    from parse_pool import configure_parse_pool
 
+from core.cache import get_cache
+from core.config import (
+    CRAWL_BREAKER_FAILURE_THRESHOLD, CRAWL_BREAKER_RECOVERY_TIMEOUT_S,
+    SARAMIN_INCREMENTAL_ENABLED, SARAMIN_MAX_PAGES, REVIEW_STORE_DIR,
+    PARSE_POOL_ENABLED, PARSE_POOL_SIZE, PARSE_POOL_MAX_TASKS
+)
 
-def crawl_all_reviews(company_name: str) -> Dict:
+
+# deadline이 주어지지 않았을 때 사이트별 요청 제한 시간(초)
+DEFAULT_CRAWL_TIMEOUT_S = 10
+
+configure_parse_pool(PARSE_POOL_ENABLED, PARSE_POOL_SIZE, PARSE_POOL_MAX_TASKS)
+
+SOURCE_LABELS = {
+    "jobkorea": "잡코리아",
+    "saramin": "사람인",
+}
+
+# 사이트별 서킷 브레이커: 장애 중인 사이트를 기다리느라 스레드와 응답 시간이 묶이지 않도록 합니다.
+_breakers = {
+    source: CircuitBreaker(source, CRAWL_BREAKER_FAILURE_THRESHOLD, CRAWL_BREAKER_RECOVERY_TIMEOUT_S)
+    for source in SOURCE_LABELS
+}
+
+# 회사별 통합 결과와, 브레이커가 열려 있을 때 대신 반환할 (사이트, URL)별 마지막 성공 결과
+# (여러 워커가 함께 쓰도록 공유 캐시에 저장합니다)
+_crawl_cache = get_cache("crawl")
+_last_good_cache = get_cache("crawl_last_good")
+
+
+def crawl_saramin(company_url: str, timeout: float) -> Dict:
+    """
+    설정에 따라 사람인 1페이지만 크롤링하거나, 저장된 후기 집합에 새 후기만 합치는 증분 크롤링을 수행합니다.
+    """
+    if SARAMIN_INCREMENTAL_ENABLED:
+        return crawl_saramin_reviews_incremental(company_url, timeout, SARAMIN_MAX_PAGES, REVIEW_STORE_DIR)
+    return crawl_saramin_reviews(company_url, timeout)
+
+
+def get_breaker_states() -> Dict[str, Dict]:
+    """
+    사이트별 서킷 브레이커 상태를 반환합니다. (메트릭/헬스체크용)
+    """
+    return {source: breaker.snapshot() for source, breaker in _breakers.items()}
+
+
+def crawl_all_reviews(company_name: str, deadline=None) -> Dict:
     """
     잡코리아와 사람인에서 면접 후기를 동시에 크롤링하는 함수
 
     Args:
         company_name: 기업 이름 (영어 키: naver, kakao, line, coupang, baemin)
+        deadline: 시간 예산 (core.deadline.Deadline). 제한 시간 안에 응답하지 않은 사이트는
+            errors에 기록하고, 나머지 사이트의 결과만 반환합니다.
 
     Returns:
         dict: 통합 크롤링 결과
@@ -25,8 +79,14 @@ def crawl_all_reviews(company_name: str) -> Dict:
             - total_reviews: 총 면접 후기 개수
             - jobkorea_count: 잡코리아 후기 개수
             - saramin_count: 사람인 후기 개수
-            - error: 에러 메시지 (있을 경우)
+            - errors: 에러 메시지 리스트 (있을 경우)
+            - stale_sources: 서킷 브레이커 또는 증분 크롤링 중단으로 이전 결과를 대신 반환한 사이트 (있을 경우)
+            - backfill_sources: 이전 후기를 아직 모으는 중이라 일부 후기만 반환한 사이트 (있을 경우)
     """
+    # 최근에 두 사이트 모두 성공한 결과가 있으면 다시 크롤링하지 않습니다.
+    cached = _crawl_cache.get(company_name)
+    if cached:
+        return cached
 
     company_name_result = None
     jobkorea_count = 0
@@ -38,36 +98,79 @@ def crawl_all_reviews(company_name: str) -> Dict:
     saramin_url = get_saramin_url(company_name)
 
     # 병렬 크롤링 실행
-    jobkorea_result = None
-    saramin_result = None
-
-    with ThreadPoolExecutor(max_workers=2) as executor:
-        futures = {}
+    def remaining_timeout() -> float:
+        # requests는 0 이하의 timeout을 허용하지 않으므로 최소값을 둡니다.
+        return max(deadline.remaining(), 0.001) if deadline else DEFAULT_CRAWL_TIMEOUT_S
 
-        # 잡코리아 크롤링 시작
-        if jobkorea_url:
-            futures['jobkorea'] = executor.submit(crawl_jobkorea, jobkorea_url)
+    def collect(source: str, url: str, future):
+        label = SOURCE_LABELS[source]
+        try:
+            result = future.result(timeout=remaining_timeout())
+        except FutureTimeoutError:
+            error = "제한 시간 내에 응답하지 않았습니다"
+        except Exception as e:
+            error = str(e)
         else:
-            errors.append("잡코리아: URL을 찾을 수 없습니다")
+            if "error" in result:
+                _breakers[source].record_failure(result["error"])
+            elif result.get("stale"):
+                # 증분 크롤링이 끝까지 확인하지 못해 저장된 후기를 반환한 경우: 결과는 쓰되 실패로 기록하고
+                # 마지막 성공 결과/통합 결과 캐시에는 남기지 않습니다. (errors가 있으면 통합 결과를 캐시하지 않음)
+                _breakers[source].record_failure(result["stale_reason"])
+                errors.append(f"{label}: {result['stale_reason']} (저장된 후기를 반환합니다)")
+                stale_sources.append(source)
+            else:
+                _breakers[source].record_success()
+                _last_good_cache.set(f"{source}:{url}", result)
+                if result.get("backfill_pending"):
+                    # 이전 후기를 모으는 중이면 다음 요청에서 이어서 모으도록 통합 결과를 캐시하지 않습니다.
+                    backfill_sources.append(source)
+            return result
 
-        # 사람인 크롤링 시작
-        if saramin_url:
-            futures['saramin'] = executor.submit(crawl_saramin_reviews, saramin_url)
-        else:
-            errors.append("사람인: URL을 찾을 수 없습니다")
+        _breakers[source].record_failure(error)
+        errors.append(f"{label}: {error}")
+        return None
+
+    def rejected(source: str, url: str):
+        # 브레이커가 열려 있으면 요청하지 않고, 마지막 성공 결과가 있으면 그것을 반환합니다.
+        label = SOURCE_LABELS[source]
+        cached = _last_good_cache.get(f"{source}:{url}")
+        if cached:
+            errors.append(f"{label}: 사이트 장애로 요청을 일시 중단하여 마지막으로 수집한 결과를 반환합니다")
+            stale_sources.append(source)
+            return cached
+        errors.append(f"{label}: 사이트 장애로 요청을 일시 중단했습니다")
+        return None
+
+    stale_sources = []
+    backfill_sources = []
+    urls = {"jobkorea": jobkorea_url, "saramin": saramin_url}
+    crawl_functions = {"jobkorea": crawl_jobkorea, "saramin": crawl_saramin}
+    results = {}
+
+    # 제한 시간을 넘긴 요청을 기다리지 않도록 with 문 대신 shutdown(wait=False)로 정리합니다.
+    # (남은 스레드도 requests의 timeout 이후 종료됩니다)
+    executor = ThreadPoolExecutor(max_workers=2)
+    try:
+        futures = {}
+
+        # 크롤링 시작 (잡코리아, 사람인)
+        for source, url in urls.items():
+            if not url:
+                errors.append(f"{SOURCE_LABELS[source]}: URL을 찾을 수 없습니다")
+            elif _breakers[source].allow_request():
+                futures[source] = executor.submit(crawl_functions[source], url, remaining_timeout())
+            else:
+                results[source] = rejected(source, url)
 
         # 결과 수집 (순서 보장을 위해 직접 접근)
-        if 'jobkorea' in futures:
-            try:
-                jobkorea_result = futures['jobkorea'].result()
-            except Exception as e:
-                errors.append(f"잡코리아: {str(e)}")
-
-        if 'saramin' in futures:
-            try:
-                saramin_result = futures['saramin'].result()
-            except Exception as e:
-                errors.append(f"사람인: {str(e)}")
+        for source, future in futures.items():
+            results[source] = collect(source, urls[source], future)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    jobkorea_result = results.get("jobkorea")
+    saramin_result = results.get("saramin")
 
     # 결과 병합 (순서 유지: 잡코리아 먼저, 사람인 다음)
     all_reviews = []
@@ -103,10 +206,96 @@ def crawl_all_reviews(company_name: str) -> Dict:
 
     if errors:
         result["errors"] = errors
+    if stale_sources:
+        result["stale_sources"] = stale_sources
+    if backfill_sources:
+        result["backfill_sources"] = backfill_sources
+    if not errors and not backfill_sources:
+        _crawl_cache.set(company_name, result)
 
     return result
 
 
+REVIEW_FIELDS = ("questions", "info", "qna_pairs")
+
+
+def _project_review(review: Dict, source: str, fields) -> Dict:
+    """
+    후기에서 요청한 필드만 남깁니다.
+        - questions: 원본 항목 리스트 그대로
+        - info: 면접 질문을 제외한 항목 (면접 유형, 난이도, 결과 등)의 question/answer
+        - qna_pairs: 모든 면접 질문/답변을 한 리스트로 펼친 것
+    """
+    projected = {"source": source}
+    items = review.get("questions", [])
+    if "questions" in fields:
+        projected["questions"] = items
+    if "info" in fields:
+        projected["info"] = [item for item in items if "qna_pairs" not in item]
+    if "qna_pairs" in fields:
+        projected["qna_pairs"] = [pair for item in items for pair in item.get("qna_pairs", [])]
+    return projected
+
+
+def select_reviews(
+    result: Dict,
+    source: Optional[str] = None,
+    offset: int = 0,
+    limit: Optional[int] = None,
+    fields: Optional[List[str]] = None
+) -> Dict:
+    """
+    통합 크롤링 결과에서 사이트 필터, 페이지 구간, 필드 선택을 적용한 결과를 반환합니다. (다시 크롤링하지 않음)
+    통합 결과는 잡코리아 후기가 먼저 jobkorea_count개, 그 뒤에 사람인 후기가 오므로 개수로 사이트를 구분합니다.
+
+    Args:
+        result: crawl_all_reviews 결과
+        source: 'jobkorea' 또는 'saramin' (없으면 전체)
+        offset: 건너뛸 후기 수
+        limit: 반환할 최대 후기 수 (없으면 끝까지)
+        fields: 남길 후기 필드 (REVIEW_FIELDS 중 일부, 없으면 원본 그대로)
+
+    Returns:
+        dict: result와 같은 형식에 다음 항목 추가
+            - offset, limit: 요청한 구간
+            - next_offset: 다음 페이지 offset (마지막 페이지면 None)
+            - total_reviews: 필터 적용 후 전체 후기 개수
+
+    Raises:
+        ValueError: 지원하지 않는 필드가 있을 때
+    """
+    unknown = [field for field in fields or [] if field not in REVIEW_FIELDS]
+    if unknown:
+        raise ValueError(f"지원하지 않는 필드입니다: {', '.join(unknown)} (지원: {', '.join(REVIEW_FIELDS)})")
+
+    reviews = result.get("reviews", [])
+    jobkorea_count = result.get("jobkorea_count", 0)
+    sources = {
+        "jobkorea": (0, jobkorea_count),
+        "saramin": (jobkorea_count, len(reviews)),
+    }
+    start, end = sources[source] if source else (0, len(reviews))
+
+    page_start = min(start + offset, end)
+    page_end = min(page_start + limit, end) if limit is not None else end
+    page = reviews[page_start:page_end]
+    if fields:
+        page = [
+            _project_review(review, "jobkorea" if page_start + i < jobkorea_count else "saramin", fields)
+            for i, review in enumerate(page)
+        ]
+
+    selected = {key: value for key, value in result.items() if key != "reviews"}
+    selected.update({
+        "reviews": page,
+        "total_reviews": end - start,
+        "offset": offset,
+        "limit": limit,
+        "next_offset": page_end - start if page_end < end else None,
+    })
+    return selected
+
+
 def get_combined_url(company_name: str) -> Optional[Dict[str, str]]:
     """
     기업 이름으로 잡코리아와 사람인 URL을 찾는 함수
@@ -2,12 +2,22 @@ import requests
 from bs4 import BeautifulSoup
 from typing import Dict, Optional
 
-def crawl_interview_reviews(company_url: str) -> Dict:
+try:
+    from crawler.revalidation import fetch_and_parse
+except ImportError:
+    from revalidation import fetch_and_parse
+
+# 요청 제한 시간(초): 호출자가 timeout을 넘기지 않아도 요청이 무한정 대기하지 않도록 합니다.
+DEFAULT_TIMEOUT_S = 10
+
+
+def crawl_interview_reviews(company_url: str, timeout: float = DEFAULT_TIMEOUT_S) -> Dict:
     """
     잡코리아에서 면접 후기를 크롤링하는 함수
 
     Args:
         company_url: 회사별 URL
+        timeout: 요청 제한 시간(초)
 
     Returns:
         dict: 크롤링 결과
@@ -24,9 +34,8 @@ def crawl_interview_reviews(company_url: str) -> Dict:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(URL, headers=headers)
-        response.raise_for_status()
-        html_content = response.text
+        # 이전 응답과 후기 영역이 같으면 파싱을 건너뛰고 이전 결과를 재사용합니다.
+        return fetch_and_parse(URL, headers, timeout, parse_interview_reviews_html, section_marker='qnaLists')
     except requests.exceptions.RequestException as e:
         return {
             "error": f"웹사이트 요청 중 오류 발생: {str(e)}",
@@ -34,6 +43,17 @@ def crawl_interview_reviews(company_url: str) -> Dict:
             "reviews": []
         }
 
+
+def parse_interview_reviews_html(html_content: str) -> Dict:
+    """
+    잡코리아 면접 후기 페이지 HTML을 파싱하는 함수
+
+    Args:
+        html_content: 페이지 HTML
+
+    Returns:
+        dict: 크롤링 결과 (company_name, reviews, total_reviews)
+    """
     # HTML 파싱
     soup = BeautifulSoup(html_content, 'html.parser')
 
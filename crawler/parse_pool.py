@@ -0,0 +1,78 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+# HTML 파싱(BeautifulSoup)은 순수 파이썬 CPU 작업이므로, 활성화하면 별도 프로세스 풀에서 실행해
+# 면접 API를 처리하는 프로세스의 GIL을 점유하지 않도록 합니다. 비활성화 상태에서는 호출한 스레드에서 바로 파싱합니다.
+_settings = {
+    "enabled": False,
+    "size": None,
+    "max_tasks_per_child": None,
+}
+_pool: Optional[ProcessPoolExecutor] = None
+_lock = threading.Lock()
+
+
+def configure_parse_pool(enabled: bool, size: Optional[int] = None, max_tasks_per_child: Optional[int] = None):
+    """
+    파싱 프로세스 풀 설정을 적용합니다. 풀은 첫 파싱 요청 시 생성됩니다.
+
+    Args:
+        enabled: 프로세스 풀 사용 여부
+        size: 파서 프로세스 수 (None 또는 0이면 CPU 코어 수)
+        max_tasks_per_child: 프로세스를 새로 띄우기 전까지 처리할 파싱 작업 수 (메모리 누수 방지)
+    """
+    shutdown_parse_pool()
+    _settings.update(enabled=enabled, size=size or None, max_tasks_per_child=max_tasks_per_child or None)
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _lock:
+        if _pool is None:
+            size = _settings["size"] or os.cpu_count() or 1
+            # fork는 스레드가 있는 프로세스에서 안전하지 않고 max_tasks_per_child와 함께 쓸 수 없으므로 spawn을 사용합니다.
+            _pool = ProcessPoolExecutor(
+                max_workers=size,
+                mp_context=multiprocessing.get_context('spawn'),
+                max_tasks_per_child=_settings["max_tasks_per_child"]
+            )
+            print(f"HTML 파싱 프로세스 풀 시작: {size}개 프로세스")
+        return _pool
+
+
+def parse_html(parse_fn: Callable[[str], Dict], html_content: str) -> Dict:
+    """
+    parse_fn(html_content)를 프로세스 풀(활성화 시) 또는 현재 스레드에서 실행합니다.
+    parse_fn은 다른 프로세스로 전달할 수 있도록 모듈 최상위 함수여야 합니다.
+    """
+    if not _settings["enabled"]:
+        return parse_fn(html_content)
+
+    global _pool
+    pool = _get_pool()
+    try:
+        return pool.submit(parse_fn, html_content).result()
+    except BrokenProcessPool as e:
+        # 파서 프로세스가 비정상 종료되면 깨진 풀을 정리하고 다음 요청에서 다시 만들며, 이번 요청은 직접 파싱합니다.
+        # (다른 스레드가 이미 새 풀로 바꿨다면 그 풀은 건드리지 않습니다)
+        print(f"HTML 파싱 프로세스 풀 오류, 현재 프로세스에서 파싱합니다: {e}")
+        with _lock:
+            if _pool is pool:
+                _pool = None
+        pool.shutdown(wait=False, cancel_futures=True)
+        return parse_fn(html_content)
+
+
+def shutdown_parse_pool():
+    """
+    파싱 프로세스 풀을 종료합니다. (앱 종료 시 호출)
+    """
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,150 @@
+import hashlib
+import re
+import threading
+from typing import Callable, Dict, Optional
+
+import requests
+
+try:
+    from crawler.parse_pool import parse_html
+except ImportError:
+    from parse_pool import parse_html
+
+from core.cache import get_cache
+
+# URL별 검증 정보와 마지막 파싱 결과는 공유 캐시의 crawl_pages 네임스페이스에 저장합니다.
+# - etag / last_modified: 다음 요청에 If-None-Match / If-Modified-Since로 보낼 응답 헤더
+# - content_hash: 후기 영역 HTML의 해시
+# - result: 그 HTML을 파싱한 결과
+_lock = threading.Lock()
+
+_stats = {
+    "requests": 0,
+    "not_modified": 0,
+    "unchanged_content": 0,
+    "parsed": 0,
+}
+
+# 후기 내용과 무관하게 요청마다 바뀌는 스크립트/스타일 블록은 해시에서 제외합니다.
+_VOLATILE_BLOCK_PATTERN = re.compile(r'<(script|style)\b.*?</\1>', re.DOTALL | re.IGNORECASE)
+_TAG_PATTERN = re.compile(r'<(/?)([a-zA-Z][\w-]*)[^>]*?(/?)>')
+
+
+def _element_end(html: str, opening: re.Match) -> int:
+    """
+    opening 태그로 시작하는 요소가 끝나는 위치(닫는 태그 다음)를 반환합니다. 같은 이름의 태그 중첩을 셉니다.
+    닫는 태그가 없으면 문서 끝을 반환합니다.
+    """
+    name = opening.group(2).lower()
+    if opening.group(3):
+        return opening.end()
+    depth = 1
+    for tag in _TAG_PATTERN.finditer(html, opening.end()):
+        if tag.group(2).lower() != name or tag.group(3):
+            continue
+        depth += -1 if tag.group(1) else 1
+        if depth == 0:
+            return tag.end()
+    return len(html)
+
+
+def _marked_sections(html: str, section_marker: str) -> str:
+    """
+    태그 속성에 section_marker가 들어 있는 요소(예: class="box_review")를 모두 찾아 요소 전체를 이어 붙여 반환합니다.
+    후기 목록 뒤의 푸터, 광고, CSRF 토큰 등은 포함하지 않습니다. 찾지 못하면 빈 문자열을 반환합니다.
+    """
+    sections = []
+    position = 0
+    while (found := html.find(section_marker, position)) >= 0:
+        opening = _TAG_PATTERN.match(html, max(html.rfind('<', 0, found), 0))
+        if not opening or opening.group(1) or opening.end() <= found:
+            # 태그 속성이 아니라 본문 텍스트에 나온 경우
+            position = found + len(section_marker)
+            continue
+        end = _element_end(html, opening)
+        sections.append(html[opening.start():end])
+        position = end
+    return ''.join(sections)
+
+
+def _section_hash(html: str, section_marker: Optional[str]) -> str:
+    """
+    section_marker가 붙은 요소(후기 영역)만으로 해시를 계산합니다. 마커를 찾지 못하면 문서 전체를 사용합니다.
+    """
+    # 스크립트 안의 태그 문자열이 요소 경계 계산에 섞이지 않도록 먼저 제거합니다.
+    html = _VOLATILE_BLOCK_PATTERN.sub('', html)
+    section = (_marked_sections(html, section_marker) if section_marker else '') or html
+    return hashlib.sha256(section.encode('utf-8')).hexdigest()
+
+
+def fetch_and_parse(
+    url: str,
+    headers: Dict[str, str],
+    timeout: float,
+    parse_fn: Callable[[str], Dict],
+    section_marker: Optional[str] = None
+) -> Dict:
+    """
+    조건부 요청으로 페이지를 받아 파싱합니다.
+    304 응답이거나 후기 영역의 해시가 이전과 같으면 BeautifulSoup 파싱을 건너뛰고 이전 결과를 반환합니다.
+
+    Args:
+        url: 요청 URL
+        headers: 기본 요청 헤더
+        timeout: 요청 제한 시간(초)
+        parse_fn: HTML을 크롤링 결과 dict로 바꾸는 함수 (파싱 프로세스 풀로 전달되므로 모듈 최상위 함수)
+        section_marker: 후기 영역 요소의 속성에 들어 있는 문자열 (예: 클래스 이름 'qnaLists')
+
+    Returns:
+        dict: parse_fn의 결과
+
+    Raises:
+        requests.exceptions.RequestException: 요청 실패 시
+    """
+    pages = get_cache("crawl_pages")
+    entry = pages.get(url)
+    with _lock:
+        _stats["requests"] += 1
+
+    request_headers = dict(headers)
+    if entry:
+        if entry.get("etag"):
+            request_headers['If-None-Match'] = entry["etag"]
+        if entry.get("last_modified"):
+            request_headers['If-Modified-Since'] = entry["last_modified"]
+
+    response = requests.get(url, headers=request_headers, timeout=timeout)
+
+    if response.status_code == 304 and entry:
+        with _lock:
+            _stats["not_modified"] += 1
+        return dict(entry["result"])
+
+    response.raise_for_status()
+    html_content = response.text
+    content_hash = _section_hash(html_content, section_marker)
+
+    if entry and entry["content_hash"] == content_hash:
+        result = entry["result"]
+        with _lock:
+            _stats["unchanged_content"] += 1
+    else:
+        result = parse_html(parse_fn, html_content)
+        with _lock:
+            _stats["parsed"] += 1
+
+    pages.set(url, {
+        "etag": response.headers.get('ETag'),
+        "last_modified": response.headers.get('Last-Modified'),
+        "content_hash": content_hash,
+        "result": result,
+    })
+    return dict(result)
+
+
+def get_revalidation_stats() -> Dict[str, int]:
+    """
+    조건부 요청 결과 통계를 반환합니다. (304 응답 수, 내용이 같아 파싱을 건너뛴 수, 실제 파싱 수)
+    """
+    with _lock:
+        return dict(_stats)
@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+# 기본 저장 위치: 프로젝트 루트의 data/reviews
+DEFAULT_STORE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'reviews')
+
+
+def _normalize(text: str) -> str:
+    return re.sub(r'\s+', ' ', text or '').strip()
+
+
+def review_fingerprint(review: Dict) -> str:
+    """
+    면접 후기의 questions 내용으로 안정적인 지문을 계산합니다.
+    공백 차이는 무시하므로, 같은 후기를 다시 크롤링하면 같은 지문이 나옵니다.
+    """
+    parts = []
+    for item in review.get("questions", []):
+        parts.append(_normalize(item.get("question")))
+        parts.append(_normalize(item.get("answer")))
+        for pair in item.get("qna_pairs", []):
+            parts.append(_normalize(pair.get("question")))
+            parts.append(_normalize(pair.get("answer")))
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+def _store_path(store_dir: str, source: str, url: str) -> str:
+    key = hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(store_dir, f"{source}_{key}.json")
+
+
+def load_reviews(source: str, url: str, store_dir: str = DEFAULT_STORE_DIR) -> Optional[Dict]:
+    """
+    저장된 후기 집합을 불러옵니다. 없거나 읽을 수 없으면 None을 반환합니다.
+
+    Returns:
+        dict: {"url", "company_name", "reviews", "updated_at", "resume_page"} 또는 None
+            (resume_page: 이전 후기를 아직 다 모으지 못했을 때 다음에 이어서 확인할 페이지, 다 모았으면 None)
+    """
+    path = _store_path(store_dir, source, url)
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"저장된 후기 '{path}'를 읽는 중 오류 발생: {e}")
+        return None
+
+
+def save_reviews(
+    source: str,
+    url: str,
+    company_name: str,
+    reviews: List[Dict],
+    store_dir: str = DEFAULT_STORE_DIR,
+    resume_page: Optional[int] = None
+):
+    """
+    후기 집합을 저장합니다. 쓰는 도중 중단되어도 기존 파일이 깨지지 않도록 임시 파일을 교체하며,
+    같은 회사를 여러 스레드나 워커 프로세스가 동시에 저장해도 섞이지 않도록 임시 파일은 저장할 때마다 새 이름으로 만듭니다.
+    """
+    os.makedirs(store_dir, exist_ok=True)
+    path = _store_path(store_dir, source, url)
+    payload = {
+        "url": url,
+        "company_name": company_name,
+        "reviews": reviews,
+        "updated_at": time.time(),
+        "resume_page": resume_page,
+    }
+    with tempfile.NamedTemporaryFile(
+        'w', encoding='utf-8', dir=store_dir, prefix=f".{os.path.basename(path)}.", suffix=".tmp", delete=False
+    ) as f:
+        tmp_path = f.name
+        try:
+            json.dump(payload, f, ensure_ascii=False)
+        except BaseException:
+            f.close()
+            os.remove(tmp_path)
+            raise
+    os.replace(tmp_path, path)
@@ -1,13 +1,30 @@
+import time
 import requests
 from bs4 import BeautifulSoup
 from typing import Dict, Optional
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
-def crawl_saramin_reviews(company_url: str) -> Dict:
+try:
+    from crawler.revalidation import fetch_and_parse
+    from crawler.review_store import DEFAULT_STORE_DIR, review_fingerprint, load_reviews, save_reviews
+except ImportError:
+    from revalidation import fetch_and_parse
+    from review_store import DEFAULT_STORE_DIR, review_fingerprint, load_reviews, save_reviews
+
+# 요청 제한 시간(초): 호출자가 timeout을 넘기지 않아도 요청이 무한정 대기하지 않도록 합니다.
+DEFAULT_TIMEOUT_S = 10
+
+# 증분 크롤링 시 한 번에 확인할 최대 페이지 수 (첫 크롤링에서 전체 이력을 받을 때의 상한)
+DEFAULT_MAX_PAGES = 30
+
+
+def crawl_saramin_reviews(company_url: str, timeout: float = DEFAULT_TIMEOUT_S) -> Dict:
     """
     사람인에서 면접 후기를 크롤링하는 함수
 
     Args:
         company_url: 회사별 URL
+        timeout: 요청 제한 시간(초)
 
     Returns:
         dict: 크롤링 결과
@@ -24,9 +41,8 @@ def crawl_saramin_reviews(company_url: str) -> Dict:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(URL, headers=headers)
-        response.raise_for_status()
-        html_content = response.text
+        # 이전 응답과 후기 영역이 같으면 파싱을 건너뛰고 이전 결과를 재사용합니다.
+        return fetch_and_parse(URL, headers, timeout, parse_saramin_reviews_html, section_marker='box_review')
     except requests.exceptions.RequestException as e:
         return {
             "error": f"웹사이트 요청 중 오류 발생: {str(e)}",
@@ -34,6 +50,17 @@ def crawl_saramin_reviews(company_url: str) -> Dict:
             "reviews": []
         }
 
+
+def parse_saramin_reviews_html(html_content: str) -> Dict:
+    """
+    사람인 면접 후기 페이지 HTML을 파싱하는 함수
+
+    Args:
+        html_content: 페이지 HTML
+
+    Returns:
+        dict: 크롤링 결과 (company_name, reviews, total_reviews)
+    """
     # HTML 파싱
     soup = BeautifulSoup(html_content, 'html.parser')
 
@@ -116,6 +143,146 @@ def crawl_saramin_reviews(company_url: str) -> Dict:
     }
 
 
+def get_page_url(company_url: str, page: int) -> str:
+    """
+    회사 URL의 page 파라미터를 바꾼 URL을 반환합니다.
+    """
+    parsed = urlparse(company_url)
+    query = parse_qs(parsed.query, keep_blank_values=True)
+    query['page'] = [str(page)]
+    return urlunparse(parsed._replace(query=urlencode(query, doseq=True)))
+
+
+def crawl_saramin_reviews_incremental(
+    company_url: str,
+    timeout: float = DEFAULT_TIMEOUT_S,
+    max_pages: int = DEFAULT_MAX_PAGES,
+    store_dir: str = DEFAULT_STORE_DIR
+) -> Dict:
+    """
+    사람인 면접 후기를 증분 크롤링하는 함수
+
+    사람인 URL은 등록순(orderby=registration)으로 최신 후기가 먼저 나오므로, 1페이지부터 차례로 확인하다가
+    모든 후기가 이미 저장된 지문과 같은 페이지(또는 빈 페이지)를 만나면 멈추고 새 후기만 저장된 집합 앞에 합칩니다.
+    이 구간에서 요청이 실패하거나 시간이 부족하면, 확인하지 못한 페이지가 다음 크롤링에서 누락되지 않도록 저장하지 않고
+    지금까지 모은 후기에 stale 표시를 붙여 반환합니다. (호출하는 쪽은 이를 사이트 실패로 처리해야 합니다)
+
+    이전 후기를 아직 다 모으지 못한 회사(처음 크롤링하는 회사 포함)는 남은 시간 동안 resume_page부터 이전 후기를 이어서 모으고,
+    모은 만큼 다음에 이어서 확인할 페이지와 함께 저장한 뒤 backfill_pending 표시를 붙여 반환합니다. (사이트 실패가 아님)
+    따라서 한 번의 제한 시간 안에 모든 페이지를 받을 수 없는 회사도 요청이 반복되며 결국 끝까지 모입니다.
+    처음 크롤링하는 회사인데 1페이지도 받지 못하면 error를 반환합니다.
+    (새 후기가 앞에 추가되면 이전 후기는 뒤 페이지로 밀리기만 하므로, 이어서 확인해도 빠지는 후기는 없습니다)
+
+    Args:
+        company_url: 회사별 URL
+        timeout: 전체 크롤링 제한 시간(초). 각 페이지 요청은 남은 시간만큼만 기다립니다.
+        max_pages: 확인할 최대 페이지 수
+        store_dir: 후기 집합을 저장할 디렉토리
+
+    Returns:
+        dict: 크롤링 결과 (crawl_saramin_reviews 결과에 다음 항목 추가)
+            - new_reviews: 이번에 새로 발견한 후기 개수 (이어서 모은 이전 후기 포함)
+            - pages_fetched: 요청한 페이지 수
+            - stale: 끝까지 확인하지 못해 최신이 아닐 수 있을 때 True (있을 경우)
+            - stale_reason: 끝까지 확인하지 못한 이유 (stale일 때)
+            - backfill_pending: 이전 후기를 이어서 모으는 중이라 아직 일부만 있을 때 True (있을 경우)
+    """
+    expires_at = time.monotonic() + timeout
+    stored = load_reviews("saramin", company_url, store_dir)
+    stored_reviews = stored.get("reviews", []) if stored else []
+    # 저장된 집합이 없으면 1페이지부터, 이전 형식(resume_page 없음)이면 이미 다 모은 것으로 봅니다.
+    resume_page = stored.get("resume_page") if stored else 1
+    known = {review_fingerprint(review) for review in stored_reviews}
+
+    company_name = stored.get("company_name") if stored else None
+    new_reviews = []
+    older_reviews = []
+    pages_fetched = 0
+    stale_reason = None
+
+    def fetch(page: int) -> Optional[Dict]:
+        nonlocal pages_fetched, company_name, stale_reason
+        remaining = expires_at - time.monotonic()
+        if remaining <= 0:
+            stale_reason = f"제한 시간 내에 {page}페이지까지 확인하지 못했습니다"
+            return None
+        page_result = crawl_saramin_reviews(get_page_url(company_url, page), remaining)
+        pages_fetched += 1
+        if "error" in page_result:
+            stale_reason = f"{page}페이지 요청 실패: {page_result['error']}"
+            return None
+        if page_result.get("company_name") not in (None, "정보 없음"):
+            company_name = page_result["company_name"]
+        return page_result
+
+    def take_unseen(page_reviews) -> list:
+        unseen = []
+        for review in page_reviews:
+            fingerprint = review_fingerprint(review)
+            if fingerprint not in known:
+                known.add(fingerprint)
+                unseen.append(review)
+        return unseen
+
+    # 1. 최신 후기: 저장된 후기에 도달할 때까지 1페이지부터 확인합니다.
+    if stored:
+        for page in range(1, max_pages + 1):
+            page_result = fetch(page)
+            if page_result is None:
+                return _stale_result(company_name, stored_reviews, pages_fetched, stale_reason)
+            page_reviews = page_result.get("reviews", [])
+            unseen = take_unseen(page_reviews)
+            new_reviews.extend(unseen)
+            # 빈 페이지는 이력의 끝, 모두 아는 후기인 페이지는 이전 크롤링 지점에 도달한 것입니다.
+            if not page_reviews or not unseen:
+                break
+
+    # 2. 이전 후기: 아직 다 모으지 못했으면 resume_page부터 빈 페이지(이력의 끝)까지 이어서 모읍니다.
+    # 새 후기 때문에 밀려 온 후기는 이미 아는 후기이므로, 모두 아는 후기인 페이지를 만나도 멈추지 않습니다.
+    previous_resume_page = resume_page
+    while resume_page is not None and resume_page <= max_pages:
+        page_result = fetch(resume_page)
+        if page_result is None:
+            break
+        page_reviews = page_result.get("reviews", [])
+        older_reviews.extend(take_unseen(page_reviews))
+        resume_page = resume_page + 1 if page_reviews else None
+    if resume_page is not None and resume_page > max_pages:
+        resume_page = None
+
+    if not stored and resume_page == previous_resume_page:
+        # 처음 크롤링하는 회사인데 한 페이지도 받지 못했습니다.
+        return {"error": stale_reason}
+
+    reviews = new_reviews + stored_reviews + older_reviews
+    if new_reviews or older_reviews or not stored or resume_page != previous_resume_page:
+        save_reviews("saramin", company_url, company_name or "정보 없음", reviews, store_dir, resume_page)
+
+    result = {
+        "company_name": company_name or "정보 없음",
+        "reviews": reviews,
+        "total_reviews": len(reviews),
+        "new_reviews": len(new_reviews) + len(older_reviews),
+        "pages_fetched": pages_fetched
+    }
+    if resume_page is not None:
+        # 최신 후기는 확인했고 이전 후기를 모으는 중이므로 사이트 실패로 보지 않습니다.
+        result["backfill_pending"] = True
+    return result
+
+
+def _stale_result(company_name: Optional[str], reviews: list, pages_fetched: int, stale_reason: str) -> Dict:
+    return {
+        "company_name": company_name or "정보 없음",
+        "reviews": reviews,
+        "total_reviews": len(reviews),
+        "new_reviews": 0,
+        "pages_fetched": pages_fetched,
+        "stale": True,
+        "stale_reason": stale_reason,
+    }
+
+
 # 기업 이름 -> URL 매핑 (영어 키 사용)
 SARAMIN_URL_MAP = {
     "naver": "https://www.saramin.co.kr/zf_user/interview-review?my=0&page=1&csn=&group_cd=&orderby=registration&career_cd=&job_category=2&company_nm=%EB%84%A4%EC%9D%B4%EB%B2%84",
@@ -1,13 +1,83 @@
-from fastapi import FastAPI, HTTPException
-from crawler.combined import crawl_all_reviews, get_combined_url
+import time
+
+# import부터 준비 완료까지 걸린 시간을 측정하기 위해 다른 모듈보다 먼저 기록합니다.
+_IMPORT_STARTED_AT = time.monotonic()
+
+import asyncio
+from contextlib import asynccontextmanager
+
+from typing import Literal, Optional
+
+from fastapi import FastAPI, HTTPException, Query, Request
+from crawler.combined import crawl_all_reviews, get_breaker_states, get_combined_url, select_reviews, REVIEW_FIELDS
+from crawler.revalidation import get_revalidation_stats
+from crawler.parse_pool import shutdown_parse_pool
+from core.cache import get_cache, get_cache_stats
+from core.config import REVIEWS_DEADLINE_S, MODEL_WARMUP_ENABLED
+from core.deadline import Deadline
+from core.responses import cached_json_response
 from api import interview
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import JSONResponse, RedirectResponse
+from services.batch_evaluation import get_batch_evaluation_stats
+from services.evaluation_jobs import start_evaluation_workers, stop_evaluation_workers, get_evaluation_job_stats
+from services.followup_cache import ensure_followups_loaded
+from services.gemini_service import warm_up_models
+from services.hedging import get_hedge_stats
+from services.initial_questions import ensure_questions_loaded, is_questions_loaded
+from services.model_backend import get_backend, is_backend_ready
+from services.search_index import load_search_index, flush_search_index, index_company_reviews, search, get_search_stats
+
+# 시작 시 백그라운드 초기화 상태 (/readyz에서 사용)
+_startup = {
+    "bank_loaded": False,
+    "models_ready": False,
+    "error": None,
+    "ready_after_s": None,
+}
+
+
+async def _initialize():
+    """
+    질문 뱅크/사전 생성 꼬리 질문 로드와 모델 백엔드 초기화를 백그라운드에서 수행합니다.
+    서버는 이 작업을 기다리지 않고 바로 요청을 받으며, 그 사이에 들어온 요청은 필요한 것을 직접 로드합니다.
+    """
+    try:
+        # 스냅샷을 먼저 불러와야 질문 뱅크 로드 시 바뀐 내용만 다시 색인합니다.
+        await asyncio.to_thread(load_search_index)
+        await asyncio.to_thread(ensure_questions_loaded)
+        await asyncio.to_thread(ensure_followups_loaded)
+        _startup["bank_loaded"] = True
+
+        await warm_up_models(open_connection=MODEL_WARMUP_ENABLED)
+        _startup["models_ready"] = True
+
+        _startup["ready_after_s"] = round(time.monotonic() - _IMPORT_STARTED_AT, 3)
+        print(f"서버 준비 완료: import 후 {_startup['ready_after_s']}초")
+    except Exception as e:
+        _startup["error"] = f"{type(e).__name__}: {e}"
+        print(f"[Startup] 초기화 실패: {_startup['error']}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    init_task = asyncio.create_task(_initialize())
+    start_evaluation_workers()
+    yield
+    init_task.cancel()
+    await stop_evaluation_workers()
+    # 종료 시 파싱 프로세스 풀과 남은 컨텍스트 캐시를 정리하고, 저장을 기다리던 검색 색인을 기록합니다.
+    shutdown_parse_pool()
+    await asyncio.to_thread(flush_search_index)
+    if is_backend_ready():
+        await asyncio.to_thread(get_backend().prefix_cache.close)
+
 
 app = FastAPI(
     title="CS Interview Assistant API",
     description="CS 면접 꼬리 질문 생성 및 평가를 제공하는 API입니다.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 origins = ["*"]
@@ -27,21 +97,91 @@ async def root_redirect():
     return RedirectResponse(url="/docs")
 
 
+@app.get("/healthz", include_in_schema=False)
+def healthz():
+    """
+    프로세스가 요청을 처리할 수 있는지만 확인하는 liveness 엔드포인트입니다. (외부 호출 없음)
+    """
+    return {"status": "ok"}
+
+
+@app.get("/readyz", include_in_schema=False)
+def readyz():
+    """
+    질문 뱅크와 모델이 준비되었는지 확인하는 readiness 엔드포인트입니다.
+    준비 전이거나 초기화에 실패하면 503을 반환합니다. 크롤링 사이트 상태는 참고용으로만 포함합니다.
+    """
+    bank_loaded = _startup["bank_loaded"] or is_questions_loaded()
+    models_ready = _startup["models_ready"] or is_backend_ready()
+    ready = bank_loaded and models_ready and _startup["error"] is None
+    body = {
+        "status": "ready" if ready else "starting",
+        "bank_loaded": bank_loaded,
+        "models_ready": models_ready,
+        "error": _startup["error"],
+        "ready_after_s": _startup["ready_after_s"],
+        "circuit_breakers": {source: state["state"] for source, state in get_breaker_states().items()},
+    }
+    return JSONResponse(status_code=200 if ready else 503, content=body)
+
+
+@app.get("/metrics")
+def get_metrics():
+    """
+    서비스 내부 성능 지표를 반환하는 API
+
+    Returns:
+        dict: 성능 지표
+            - hedging: 꼬리 질문 헤징 발생률, 승리 통계, 모델별 최근 TTFT
+            - prompt_cache: 고정 프롬프트 컨텍스트 캐시 통계
+            - circuit_breakers: 크롤링 사이트별 서킷 브레이커 상태
+            - crawl_revalidation: 재크롤링 시 조건부 요청/내용 해시로 파싱을 건너뛴 통계
+            - cache: 공유 캐시 백엔드와 네임스페이스별 적중률
+            - search_index: 검색 색인 문서/토큰 수
+            - evaluation_jobs: 비동기 평가 작업 처리 통계와 대기열 길이
+            - batch_evaluation: 배치 평가 항목 처리/재시도/이어하기 통계
+    """
+    return {
+        "hedging": get_hedge_stats(),
+        "prompt_cache": get_backend().prefix_cache.stats,
+        "circuit_breakers": get_breaker_states(),
+        "crawl_revalidation": get_revalidation_stats(),
+        "cache": get_cache_stats(),
+        "search_index": get_search_stats(),
+        "evaluation_jobs": get_evaluation_job_stats(),
+        "batch_evaluation": get_batch_evaluation_stats(),
+    }
+
+
 @app.get("/api/interview-reviews")
-def get_interview_reviews(company_name: str):
+def get_interview_reviews(
+    company_name: str,
+    request: Request,
+    source: Optional[Literal["jobkorea", "saramin"]] = None,
+    offset: int = Query(0, ge=0),
+    limit: Optional[int] = Query(None, ge=1, le=500),
+    fields: Optional[str] = None
+):
     """
     기업 이름으로 잡코리아와 사람인에서 면접 후기를 크롤링하는 API
+    응답 본문은 직렬화/압축된 상태로 크롤링 캐시와 함께 저장되어, 반복 요청에서는 다시 직렬화하지 않습니다.
+    페이지/사이트/필드 선택은 캐시된 크롤링 결과에 적용하므로 다시 크롤링하지 않습니다.
 
     Args:
         company_name: 기업 이름 (naver, kakao, line, coupang, baemin)
+        source: 사이트 필터 (jobkorea, saramin)
+        offset: 건너뛸 후기 수
+        limit: 반환할 최대 후기 수
+        fields: 후기에서 남길 필드 (쉼표 구분: questions, info, qna_pairs)
 
     Returns:
         dict: 통합 크롤링 결과
             - company_name: 회사명
             - reviews: 면접 후기 리스트 (잡코리아 먼저, 사람인 다음)
-            - total_reviews: 총 면접 후기 개수
+            - total_reviews: 총 면접 후기 개수 (사이트 필터 적용 후)
             - jobkorea_count: 잡코리아 후기 개수
             - saramin_count: 사람인 후기 개수
+            - offset, limit, next_offset: 페이지 정보 (source/offset/limit/fields 중 하나라도 지정한 경우)
     """
     # URL 확인
     urls = get_combined_url(company_name)
@@ -51,14 +191,58 @@ def get_interview_reviews(company_name: str):
             detail=f"'{company_name}' 기업을 찾을 수 없습니다. 지원하는 기업: naver, kakao, line, coupang, baemin"
         )
 
-    # 통합 크롤링 실행
-    result = crawl_all_reviews(company_name)
+    field_list = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    unknown_fields = [field for field in field_list or [] if field not in REVIEW_FIELDS]
+    if unknown_fields:
+        raise HTTPException(
+            status_code=400,
+            detail=f"지원하지 않는 필드입니다: {', '.join(unknown_fields)} (지원: {', '.join(REVIEW_FIELDS)})"
+        )
+    selection = source is not None or offset > 0 or limit is not None or field_list is not None
 
-    # 완전 실패 시 에러 처리 (두 사이트 모두 실패)
-    if result["total_reviews"] == 0 and "errors" in result:
-        raise HTTPException(status_code=500, detail=result["errors"])
+    def crawl():
+        # 통합 크롤링 실행 (제한 시간을 넘긴 사이트는 errors에 기록되고 나머지 결과만 반환)
+        result = crawl_all_reviews(company_name, deadline=Deadline(REVIEWS_DEADLINE_S))
 
-    return result
+        # 완전 실패 시 에러 처리 (두 사이트 모두 실패)
+        if result["total_reviews"] == 0 and "errors" in result:
+            raise HTTPException(status_code=500, detail=result["errors"])
+
+        # 일부 사이트가 실패한 결과는 본문 캐시와 검색 색인에 반영하지 않습니다.
+        cacheable = "errors" not in result
+        if cacheable:
+            index_company_reviews(company_name, result)
+        if selection:
+            result = select_reviews(result, source, offset, limit, field_list)
+        return result, cacheable
+
+    # 요청 조건마다 본문이 다르므로 조건을 캐시 키에 포함합니다.
+    cache_key = company_name
+    if selection:
+        cache_key += f"?source={source or ''}&offset={offset}&limit={limit or ''}&fields={','.join(field_list or [])}"
+    return cached_json_response(request, get_cache("crawl_body"), cache_key, crawl)
+
+@app.get("/api/search")
+def search_questions(
+    q: str = Query(..., min_length=1, max_length=200),
+    kind: Optional[Literal["bank", "review"]] = None,
+    limit: int = Query(10, ge=1, le=50)
+):
+    """
+    질문 뱅크와 크롤링한 면접 후기의 질문을 키워드로 검색하는 API
+    평가 리포트의 improvement_keywords처럼 여러 키워드를 공백이나 쉼표로 이어 검색할 수 있습니다.
+
+    Args:
+        q: 검색어
+        kind: 검색 대상 (bank: 질문 뱅크, review: 면접 후기, 없으면 전체)
+        limit: 반환할 최대 결과 수
+
+    Returns:
+        dict: 검색 결과
+            - query: 검색어
+            - results: BM25 점수 순 결과 (text, kind, score, category 또는 company/source)
+    """
+    return {"query": q, "results": search(q, limit, kind)}
 
 app.include_router(interview.router)
 
@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import List, Literal
+from pydantic import BaseModel, Field, HttpUrl
+from typing import List, Literal, Optional
 
 EXAMPLE_PERFORMANCE = {
     "time_to_first_token_ms": 150.52,
@@ -93,4 +93,44 @@ class StructuredEvaluationReport(BaseModel):
 class InterviewEvaluationResponse(BaseModel):
     interviewType: str = Field(..., example="Operating System")
     evaluation_report: StructuredEvaluationReport = Field(..., example=EXAMPLE_STRUCTURED_REPORT)
-    # performance: PerformanceMetrics = Field(..., example=EXAMPLE_PERFORMANCE)
\ No newline at end of file
+    # performance: PerformanceMetrics = Field(..., example=EXAMPLE_PERFORMANCE)
+
+class RecommendationRequest(BaseModel):
+    keywords: List[str] = Field(default_factory=list, example=["임계 구역(Critical Section)", "스핀락(Spinlock)"])
+    evaluation_report: Optional[StructuredEvaluationReport] = Field(None, description="평가 리포트를 넘기면 improvement_keywords를 키워드로 사용합니다.")
+    conversation: List[Message] = Field(default_factory=list, description="이미 받은 질문은 추천에서 제외합니다.")
+    top_k: int = Field(3, ge=1, le=10, example=3)
+
+class RecommendedQuestion(BaseModel):
+    question: str = Field(..., example="임계 구역(Critical Section)의 동시성 문제를 해결하기 위해 사용되는 동기화 기법들을 설명해주세요.")
+    score: float = Field(..., example=0.3899)
+    keyword: str = Field(..., example="임계 구역(Critical Section)")
+
+class CategoryRecommendation(BaseModel):
+    category: str = Field(..., example="Operating System")
+    questions: List[RecommendedQuestion]
+
+class RecommendationResponse(BaseModel):
+    keywords: List[str] = Field(..., example=["임계 구역(Critical Section)", "스핀락(Spinlock)"])
+    recommendations: List[CategoryRecommendation]
+
+class EvaluationJobRequest(InterviewEvaluationRequest):
+    callback_url: Optional[HttpUrl] = Field(None, description="평가가 끝나면 작업 상태를 POST로 받을 URL")
+
+class EvaluationJobResponse(BaseModel):
+    job_id: str = Field(..., example="3f1c2a9e8b7d4c6e9a0b1c2d3e4f5a6b")
+    status: Literal["queued", "running", "succeeded", "failed"] = Field(..., example="queued")
+    created_at: float = Field(..., example=1760000000.0)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[InterviewEvaluationResponse] = None
+    error: Optional[str] = None
+    callback_status: Optional[Literal["delivered", "failed"]] = None
+
+class BatchEvaluationItem(InterviewEvaluationRequest):
+    id: str = Field(..., example="interview-0001", description="배치 안에서 항목을 구분하는 ID (결과 줄에 그대로 포함됩니다)")
+
+class BatchEvaluationRequest(BaseModel):
+    batch_id: Optional[str] = Field(None, example="rubric-v2-cohort-10", description="지정하면 같은 batch_id로 다시 요청할 때 id와 내용이 같은 성공 항목은 평가하지 않고 저장된 결과를 반환합니다.")
+    items: List[BatchEvaluationItem] = Field(..., min_length=1)
+    concurrency: Optional[int] = Field(None, ge=1, description="동시에 실행할 평가 수 (BATCH_EVALUATION_CONCURRENCY 이하)")
@@ -0,0 +1,141 @@
+"""
+면접 대화 일괄 평가 스크립트
+
+JSONL 파일(한 줄에 {"id", "interviewType", "conversation": [{"role", "content"}, ...]})의 대화를 evaluate_conversation으로 평가하고,
+끝나는 순서대로 결과를 출력 파일에 NDJSON으로 한 줄씩 추가합니다. (서버의 POST /interview/evaluation/batch와 같은 형식)
+
+출력 파일에 이미 성공(succeeded)으로 기록된 항목은 건너뛰므로, 중단된 배치는 같은 명령으로 다시 실행하면 이어서 진행합니다.
+건너뛰는 기준은 id와 content_hash(interviewType + conversation 해시)이므로, 같은 id라도 내용이 바뀐 항목은 다시 평가합니다.
+실패한 항목은 다시 실행할 때 재시도하며, 같은 id가 여러 줄이면 마지막 줄이 최신 결과입니다.
+평가 기준을 바꿔 처음부터 다시 채점하려면 --reset을 사용합니다.
+
+    python scripts/batch_evaluate.py interviews.jsonl -o results.jsonl
+    python scripts/batch_evaluate.py interviews.jsonl -o results.jsonl --concurrency 16 --rpm 300
+    python scripts/batch_evaluate.py interviews.jsonl -o results.jsonl --reset
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Dict, Iterator
+
+from tqdm import tqdm
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, '..'))
+
+from core.config import BATCH_EVALUATION_CONCURRENCY, BATCH_EVALUATION_RPM, BATCH_EVALUATION_MAX_RETRIES  # noqa: E402
+from core.rate_limit import AsyncRateLimiter  # noqa: E402
+from models.interview_models import BatchEvaluationItem  # noqa: E402
+from services.batch_evaluation import content_hash, evaluate_batch  # noqa: E402
+
+
+def load_completed(output_path: str) -> Dict[str, str]:
+    """
+    출력 파일에서 이미 성공한 항목의 {id: content_hash}를 읽습니다. 중단되며 잘린 마지막 줄은 무시합니다.
+    content_hash가 없는 이전 형식의 줄은 내용을 확인할 수 없으므로 완료로 보지 않습니다.
+    """
+    completed = {}
+    if not os.path.exists(output_path):
+        return completed
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("status") == "succeeded" and record.get("content_hash"):
+                completed[str(record["id"])] = record["content_hash"]
+    return completed
+
+
+def read_items(input_path: str, completed: Dict[str, str], invalid: list) -> Iterator[BatchEvaluationItem]:
+    """
+    입력 JSONL을 한 줄씩 읽어 평가할 항목을 내보냅니다. id가 없으면 줄 번호를 id로 사용합니다.
+    completed에 id와 content_hash가 모두 같게 기록된 항목은 건너뜁니다.
+    형식이 잘못된 줄은 invalid에 (줄 번호, 오류)로 모으고 건너뜁니다.
+    """
+    with open(input_path, 'r', encoding='utf-8') as f:
+        for line_no, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                record["id"] = str(record.get("id", line_no))
+                item = BatchEvaluationItem(**record)
+            except Exception as e:
+                invalid.append((line_no, f"{type(e).__name__}: {e}"))
+                continue
+            if completed.get(item.id) != content_hash(item):
+                yield item
+
+
+def _ends_with_newline(path: str) -> bool:
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def count_pending(input_path: str, completed: Dict[str, str]) -> int:
+    return sum(1 for _ in read_items(input_path, completed, []))
+
+
+async def run(args):
+    completed = load_completed(args.output)
+    total = count_pending(args.input, completed)
+    print(f"이미 완료: {len(completed)}개, 평가할 항목: {total}개 (동시 {args.concurrency}개, {args.rpm:g} RPM)")
+    if not total:
+        return
+
+    invalid = []
+    summary = {"succeeded": 0, "failed": 0}
+    limiter = AsyncRateLimiter(args.rpm)
+    start = time.perf_counter()
+
+    with open(args.output, 'a', encoding='utf-8') as out, tqdm(total=total, desc="평가 중") as pbar:
+        if out.tell() and not _ends_with_newline(args.output):
+            # 이전 실행이 줄 중간에 중단되었으면 잘린 줄과 이어지지 않도록 줄을 바꿉니다.
+            out.write("\n")
+        async for line in evaluate_batch(
+            read_items(args.input, completed, invalid),
+            concurrency=args.concurrency, limiter=limiter, max_retries=args.max_retries
+        ):
+            # 중간에 중단되어도 끝난 항목은 남도록 한 줄씩 바로 기록합니다.
+            out.write(json.dumps(line, ensure_ascii=False) + "\n")
+            out.flush()
+            summary[line["status"]] += 1
+            if line["status"] == "failed":
+                tqdm.write(f"[실패] {line['id']}: {line['error']}")
+            pbar.update(1)
+
+    elapsed = time.perf_counter() - start
+    print("=" * 50)
+    print(f"성공: {summary['succeeded']}개, 실패: {summary['failed']}개, 소요 시간: {elapsed:.1f}초 -> '{args.output}'")
+    for line_no, error in invalid:
+        print(f"  [형식 오류] {args.input}:{line_no} {error}")
+    if summary["failed"]:
+        print("실패한 항목은 같은 명령으로 다시 실행하면 재시도합니다.")
+    print("=" * 50)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="면접 대화 일괄 평가 (JSONL 입력, NDJSON 출력, 이어하기 지원)")
+    parser.add_argument("input", help="평가할 대화 JSONL 파일")
+    parser.add_argument("-o", "--output", required=True, help="결과를 추가할 NDJSON 파일")
+    parser.add_argument("--concurrency", type=int, default=BATCH_EVALUATION_CONCURRENCY, help="동시에 실행할 평가 수")
+    parser.add_argument("--rpm", type=float, default=BATCH_EVALUATION_RPM, help="Gemini 분당 요청 수 제한 (쿼터에 맞춰 지정)")
+    parser.add_argument("--max-retries", type=int, default=BATCH_EVALUATION_MAX_RETRIES, help="항목별 최대 재시도 횟수")
+    parser.add_argument("--reset", action="store_true", help="기존 결과를 지우고 처음부터 평가")
+    args = parser.parse_args()
+
+    if args.reset and os.path.exists(args.output):
+        os.remove(args.output)
+        print(f"기존 결과 '{args.output}'를 삭제했습니다.")
+
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
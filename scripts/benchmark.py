@@ -0,0 +1,200 @@
+"""
+gemini_service / initial_questions CPU 구간 마이크로 벤치마크
+
+네트워크 없이 프롬프트 생성, 마크다운 정제, 평가 리포트 파싱, 질문 뱅크 로드/조회 구간을 측정합니다.
+입력은 실제 data/cs_questions.csv 질문과 2~30턴 한국어 대화로 구성합니다.
+
+    python scripts/benchmark.py                                  # benchmarks/results/latest.json 저장
+    python scripts/benchmark.py --save-baseline                  # 현재 결과를 기준선으로 저장
+    python scripts/benchmark.py --baseline benchmarks/baseline.json --threshold 0.15
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Any
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.join(SCRIPT_DIR, '..')
+sys.path.insert(0, PROJECT_ROOT)
+
+# 벤치마크는 API 키나 네트워크 없이 실행되어야 하므로 fake 백엔드를 사용합니다.
+os.environ.setdefault("MODEL_BACKEND", "fake")
+
+from models.interview_models import Message  # noqa: E402
+from services import gemini_service, initial_questions  # noqa: E402
+
+RESULTS_DIR = os.path.join(PROJECT_ROOT, 'benchmarks', 'results')
+DEFAULT_OUTPUT_PATH = os.path.join(RESULTS_DIR, 'latest.json')
+DEFAULT_BASELINE_PATH = os.path.join(PROJECT_ROOT, 'benchmarks', 'baseline.json')
+
+TURN_SIZES = [2, 10, 30]
+
+SAMPLE_ANSWERS = [
+    "프로세스는 운영체제로부터 독립된 메모리 공간을 할당받는 실행 단위이고, 스레드는 프로세스 내부에서 코드, 데이터, 힙 영역을 공유하며 스택만 따로 가지는 실행 흐름입니다.",
+    "여러 스레드가 공유 자원에 동시에 접근하면 경쟁 상태가 발생할 수 있기 때문에 **뮤텍스**나 **세마포어**를 사용해 임계 구역을 보호해야 합니다.",
+    "인덱스는 보통 B+Tree로 구현되어 리프 노드가 연결 리스트로 이어져 있어 범위 검색에 유리하지만, INSERT/UPDATE 시 인덱스 재정렬 비용이 발생합니다.",
+    "TCP는 3-way handshake로 연결을 수립하고, 슬라이딩 윈도우 기반의 흐름 제어와 혼잡 제어를 통해 신뢰성 있는 전송을 보장합니다.",
+    "가상 메모리는 페이지 테이블을 통해 논리 주소를 물리 주소로 변환하며, TLB는 이 변환 결과를 캐싱해 메모리 접근 횟수를 줄여줍니다.",
+]
+
+
+def build_conversation(questions: List[str], turns: int, rng: random.Random) -> List[Message]:
+    """
+    질문 뱅크의 질문과 예시 답변으로 지정한 턴 수의 대화를 구성합니다.
+    """
+    conversation = []
+    for _ in range(turns):
+        conversation.append(Message(role="assistant", content=rng.choice(questions)))
+        conversation.append(Message(role="user", content=rng.choice(SAMPLE_ANSWERS)))
+    return conversation
+
+
+def build_evaluation_report(turns: int, rng: random.Random) -> str:
+    """
+    EVALUATION_MODEL이 반환하는 형식의 마크다운 평가 리포트를 구성합니다.
+    """
+    scores = [rng.randint(40, 95) for _ in range(turns)]
+    report = "# 최종 종합 평가\n"
+    report += f"**- 종합 점수:** {sum(scores) // turns}\n"
+    report += "**- 종합 피드백:** 운영체제의 **프로세스**와 *스레드* 개념은 탄탄하지만, 동기화 기법의 내부 동작 원리에 대한 설명이 부족합니다.\n"
+    report += "**- 개선 키워드:**\n    - 임계 구역(Critical Section)\n    - 스핀락(Spinlock)\n    - `MVCC`\n"
+    report += "\n---\n## 질문별 상세 평가\n"
+    for i, score in enumerate(scores, 1):
+        report += f"### 턴 {i}: 프로세스와 스레드의 차이 {i}\n"
+        report += f"**- 점수:** {score}\n"
+        report += "**- 피드백:** 정확성은 좋았으나, 내부 원리 설명이 부족하여 **'깊이'** 항목에서 감점되었습니다.\n\n"
+    return report
+
+
+def measure(func: Callable[[], Any], min_time_s: float, repeat: int) -> Dict[str, float]:
+    """
+    한 라운드가 min_time_s 이상 걸리도록 반복 횟수를 정한 뒤, repeat 라운드의 호출당 시간을 측정합니다.
+    """
+    func()  # 워밍업
+
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time_s or number >= 1_000_000:
+            break
+        number *= 2
+
+    per_call_us = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        per_call_us.append((time.perf_counter() - start) / number * 1_000_000)
+
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min_us": round(min(per_call_us), 3),
+        "median_us": round(statistics.median(per_call_us), 3),
+        "mean_us": round(statistics.mean(per_call_us), 3),
+        "stdev_us": round(statistics.stdev(per_call_us), 3) if repeat > 1 else 0.0,
+    }
+
+
+def build_cases() -> Dict[str, Callable[[], Any]]:
+    rng = random.Random(42)
+
+    initial_questions.load_questions_from_csv()
+    questions = [q['question'] for q in initial_questions._questions]
+    categories = sorted({q['category'] for q in initial_questions._questions})
+
+    cases = {
+        "load_questions_from_csv": initial_questions.load_questions_from_csv,
+        "get_random_question[known_category]": lambda: initial_questions.get_random_question(categories[0]),
+        "get_random_question[unknown_category]": lambda: initial_questions.get_random_question("Unknown"),
+    }
+
+    for turns in TURN_SIZES:
+        conversation = build_conversation(questions, turns, rng)
+        report = build_evaluation_report(turns, rng)
+        cases[f"_format_for_tail_question[{turns}_turns]"] = lambda c=conversation: gemini_service._format_for_tail_question(c)
+        cases[f"_format_for_evaluation[{turns}_turns]"] = lambda c=conversation: gemini_service._format_for_evaluation(c)
+        cases[f"_parse_structured_evaluation_report[{turns}_turns]"] = lambda r=report: gemini_service._parse_structured_evaluation_report(r)
+
+    sample_markdown = build_evaluation_report(2, rng).split("\n## 질문별 상세 평가")[0]
+    cases["_strip_markdown[short]"] = lambda: gemini_service._strip_markdown(rng.choice(SAMPLE_ANSWERS))
+    cases["_strip_markdown[report]"] = lambda: gemini_service._strip_markdown(sample_markdown)
+    return cases
+
+
+def compare_with_baseline(results: Dict[str, Dict[str, float]], baseline_path: str, threshold: float) -> List[str]:
+    """
+    기준선 대비 median이 threshold 비율 이상 느려진 벤치마크 목록을 반환합니다.
+    """
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)["results"]
+
+    regressions = []
+    print(f"\n기준선 비교 ('{baseline_path}', 허용 임계값 {threshold:.0%})")
+    for name, current in results.items():
+        if name not in baseline:
+            print(f"  {name:<50} (기준선 없음)")
+            continue
+        base_median = baseline[name]["median_us"]
+        change = (current["median_us"] - base_median) / base_median if base_median > 0 else 0.0
+        marker = "REGRESSION" if change > threshold else "ok"
+        print(f"  {name:<50} {base_median:>12.2f} -> {current['median_us']:>12.2f} us ({change:+.1%}) {marker}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="gemini_service / initial_questions 마이크로 벤치마크")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT_PATH, help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 기준선 JSON 경로")
+    parser.add_argument("--threshold", type=float, default=0.10, help="회귀로 판단할 median 증가 비율 (기본 0.10)")
+    parser.add_argument("--save-baseline", action="store_true", help=f"결과를 '{DEFAULT_BASELINE_PATH}'에도 저장")
+    parser.add_argument("--min-time", type=float, default=0.2, help="라운드당 최소 측정 시간(초)")
+    parser.add_argument("--repeat", type=int, default=5, help="측정 라운드 수")
+    parser.add_argument("--filter", help="이름에 이 문자열이 포함된 벤치마크만 실행")
+    args = parser.parse_args()
+
+    results = {}
+    for name, func in build_cases().items():
+        if args.filter and args.filter not in name:
+            continue
+        results[name] = measure(func, args.min_time, args.repeat)
+        print(f"{name:<50} median {results[name]['median_us']:>12.2f} us  (x{results[name]['number']})")
+
+    payload = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "question_count": len(initial_questions._questions),
+        },
+        "results": results,
+    }
+
+    output_paths = [args.output] + ([DEFAULT_BASELINE_PATH] if args.save_baseline else [])
+    for path in output_paths:
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(payload, f, ensure_ascii=False, indent=2)
+        print(f"결과가 '{path}' 파일에 저장되었습니다.")
+
+    if args.baseline:
+        regressions = compare_with_baseline(results, args.baseline, args.threshold)
+        if regressions:
+            print(f"\n성능 회귀 {len(regressions)}건: {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n성능 회귀 없음")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+연습 질문 추천용 TF-IDF 색인 생성 스크립트
+
+cs_questions.csv로 문자 n-gram TF-IDF 행렬을 만들어 RECOMMEND_INDEX_DIR(기본 data/recommend_index)에 저장합니다.
+서버는 저장된 색인을 mmap으로 열며, 질문 뱅크가 바뀌었으면 시작 시 직접 다시 만듭니다.
+
+    python scripts/build_recommend_index.py
+    python scripts/build_recommend_index.py --query "스핀락" --query "MVCC"     # 생성 후 추천 결과 확인
+"""
+import argparse
+import os
+import sys
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, '..'))
+
+from core.config import RECOMMEND_INDEX_DIR  # noqa: E402
+from services import initial_questions  # noqa: E402
+from services.recommendation import QuestionRecommender, bank_signature, build_index, load_index, save_index  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description="연습 질문 추천 TF-IDF 색인 생성")
+    parser.add_argument("--output-dir", default=RECOMMEND_INDEX_DIR, help="색인을 저장할 디렉토리")
+    parser.add_argument("--query", action="append", default=[], help="생성 후 추천 결과를 확인할 키워드 (여러 번 지정 가능)")
+    parser.add_argument("--top-k", type=int, default=3, help="카테고리별 추천 질문 수")
+    args = parser.parse_args()
+
+    # 질문 뱅크 리스너(서버용 색인 생성)가 실행되지 않도록 CSV만 읽습니다.
+    questions = initial_questions.read_questions_csv()
+
+    start = time.perf_counter()
+    index = build_index(questions)
+    save_index(index, bank_signature(questions), args.output_dir)
+    elapsed = time.perf_counter() - start
+
+    print("=" * 50)
+    print(f"질문 수: {len(index['meta']['questions'])}, n-gram 수: {len(index['meta']['vocabulary'])}, 값 수: {len(index['data'])}")
+    print(f"색인 생성 시간: {elapsed:.2f}초 -> '{args.output_dir}'")
+    print("=" * 50)
+
+    if args.query:
+        recommender = QuestionRecommender(load_index(args.output_dir))
+        start = time.perf_counter()
+        results = recommender.recommend(args.query, args.top_k)
+        print(f"\n추천 ({(time.perf_counter() - start) * 1000:.2f}ms): {', '.join(args.query)}")
+        for result in results:
+            print(f"\n[{result['category']}]")
+            for item in result["questions"]:
+                print(f"  - ({item['score']:.3f}, {item['keyword']}) {item['question']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+"""
+질문 뱅크 유사 중복 검사 스크립트
+
+문자 n-gram MinHash + LSH 밴딩으로 cs_questions.csv 안의 표현만 다른 중복 질문을 찾습니다.
+띄어쓰기/조사 변화가 많은 한국어 문장에도 동작하도록 단어 대신 문자 단위 shingle을 사용하되,
+영문은 문자 bigram이 흔해 서로 다른 질문도 비슷하게 나오므로 단어 안의 문자 trigram을 사용합니다.
+
+    python scripts/dedupe_questions.py                          # 중복 묶음 보고서 출력
+    python scripts/dedupe_questions.py --threshold 0.7 --report-json dup_report.json
+    python scripts/dedupe_questions.py --output data/cs_questions.dedup.csv
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List, Optional, Set, Tuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+QUESTIONS_CSV_PATH = os.path.join(SCRIPT_DIR, '..', 'data', 'cs_questions.csv')
+
+# 질문 뱅크 기준으로 서로 다른 질문 쌍의 최대 유사도는 0.5 안팎, 표현만 바꾼 질문은 0.65 이상입니다.
+DEFAULT_THRESHOLD = 0.6
+DEFAULT_NUM_PERM = 128
+DEFAULT_NGRAM = 2
+LATIN_NGRAM = 3
+
+_MAX_HASH = (1 << 64) - 1
+
+
+def _normalize(text: str) -> str:
+    """
+    공백과 문장 부호를 제거하고 소문자로 바꿔, 표기 차이만 있는 질문이 같은 shingle을 갖도록 합니다.
+    """
+    return re.sub(r'[\s\W_]+', '', text).lower()
+
+
+def _shingles(text: str, ngram: int) -> Set[str]:
+    """
+    영문/숫자 단어는 단어 경계를 포함한 문자 trigram으로, 한글 등 나머지 문자는 띄어쓰기를 무시하고 이어 붙인 문자 n-gram으로 나눕니다.
+    """
+    text = text.lower()
+    shingles = set()
+    for word in re.findall(r'[a-z0-9]+', text):
+        padded = f" {word} "
+        shingles.update(padded[i:i + LATIN_NGRAM] for i in range(len(padded) - LATIN_NGRAM + 1))
+
+    other = re.sub(r'[a-z0-9\s\W_]+', '', text)
+    if len(other) <= ngram:
+        if other:
+            shingles.add(other)
+    else:
+        shingles.update(other[i:i + ngram] for i in range(len(other) - ngram + 1))
+    return shingles
+
+
+def _hash_shingle(shingle: str) -> int:
+    # 내장 hash()는 실행마다 값이 달라지므로 고정된 해시를 사용합니다.
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+def _optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    LSH 후보가 되는 유사도 경계 (1/b)^(1/r)가 threshold에 가장 가까운 (밴드 수, 밴드당 행 수)를 고릅니다.
+    경계가 threshold보다 약간 낮은 쪽을 우선해 놓치는 중복을 줄이고, 후보는 정확한 Jaccard로 다시 검증합니다.
+    """
+    best = (num_perm, 1)
+    best_distance = float('inf')
+    for rows in range(1, num_perm + 1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        boundary = (1 / bands) ** (1 / rows)
+        distance = abs(boundary - threshold) + (0.05 if boundary > threshold else 0)
+        if distance < best_distance:
+            best, best_distance = (bands, rows), distance
+    return best
+
+
+class NearDuplicateIndex:
+    """
+    질문을 하나씩 추가하면서 유사 중복 여부를 검사할 수 있는 MinHash LSH 색인입니다.
+    질문 추가/조회 비용은 색인 크기와 무관하게 거의 일정하므로, 전수 비교(O(n^2)) 없이 뱅크를 키울 수 있습니다.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM, ngram: int = DEFAULT_NGRAM):
+        self.threshold = threshold
+        self.ngram = ngram
+        self.num_perm = num_perm
+        self.bands, self.rows = _optimal_bands(threshold, num_perm)
+        self._buckets: List[Dict[Tuple[int, ...], List[int]]] = [{} for _ in range(self.bands)]
+        self._texts: List[str] = []
+        self._shingle_sets: List[Set[str]] = []
+        self._exact: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __contains__(self, text: str) -> bool:
+        return self.find_duplicate(text) is not None
+
+    def _signature(self, shingles: Set[str]) -> List[int]:
+        """
+        One Permutation Hashing: shingle마다 해시를 한 번만 계산해 num_perm개의 구간 중 하나에 넣고 구간별 최솟값을 취합니다.
+        순열 num_perm개를 모두 적용하는 방식(O(shingle 수 x num_perm))보다 훨씬 빠르며,
+        비어 있는 구간은 오른쪽의 가장 가까운 구간 값을 빌려오는 방식(densification)으로 채웁니다.
+        """
+        signature = [_MAX_HASH] * self.num_perm
+        for shingle in shingles:
+            h = _hash_shingle(shingle)
+            bin_index, value = h % self.num_perm, h // self.num_perm
+            if value < signature[bin_index]:
+                signature[bin_index] = value
+
+        filled = [i for i, value in enumerate(signature) if value != _MAX_HASH]
+        if not filled or len(filled) == self.num_perm:
+            return signature
+
+        densified = list(signature)
+        for i in range(self.num_perm):
+            if signature[i] == _MAX_HASH:
+                offset = 1
+                while signature[(i + offset) % self.num_perm] == _MAX_HASH:
+                    offset += 1
+                # 빌려온 값에 거리를 더해 서로 다른 빈 구간이 우연히 같은 값을 갖지 않도록 합니다.
+                densified[i] = signature[(i + offset) % self.num_perm] + offset * (_MAX_HASH // self.num_perm // self.num_perm)
+        return densified
+
+    def _band_keys(self, signature: List[int]) -> List[Tuple[int, ...]]:
+        return [tuple(signature[i * self.rows:(i + 1) * self.rows]) for i in range(self.bands)]
+
+    def find_duplicate(self, text: str) -> Optional[Tuple[str, float]]:
+        """
+        색인에 text와 유사도(Jaccard)가 threshold 이상인 질문이 있으면 (질문, 유사도)를 반환합니다.
+        """
+        normalized = _normalize(text)
+        if normalized in self._exact:
+            return self._texts[self._exact[normalized]], 1.0
+
+        shingles = _shingles(text, self.ngram)
+        candidates = set()
+        for band, key in enumerate(self._band_keys(self._signature(shingles))):
+            candidates.update(self._buckets[band].get(key, ()))
+
+        best = None
+        for doc_id in candidates:
+            other = self._shingle_sets[doc_id]
+            union = len(shingles | other)
+            similarity = len(shingles & other) / union if union else 0.0
+            if similarity >= self.threshold and (best is None or similarity > best[1]):
+                best = (self._texts[doc_id], similarity)
+        return best
+
+    def add(self, text: str):
+        """
+        질문을 색인에 추가합니다. 중복 여부와 관계없이 추가하므로, 필요하면 먼저 find_duplicate로 확인하세요.
+        """
+        doc_id = len(self._texts)
+        shingles = _shingles(text, self.ngram)
+        self._texts.append(text)
+        self._shingle_sets.append(shingles)
+        self._exact.setdefault(_normalize(text), doc_id)
+        for band, key in enumerate(self._band_keys(self._signature(shingles))):
+            self._buckets[band].setdefault(key, []).append(doc_id)
+
+
+def find_duplicate_groups(rows: List[Dict[str, str]], threshold: float) -> Tuple[List[Dict[str, str]], List[Dict]]:
+    """
+    질문 목록을 순서대로 색인에 넣으며 먼저 등장한 질문을 대표로 남기고, 중복 묶음을 반환합니다.
+
+    Returns:
+        tuple: (중복 제거된 행 목록, 중복 묶음 목록)
+    """
+    index = NearDuplicateIndex(threshold=threshold)
+    kept_rows = []
+    groups: Dict[str, Dict] = {}
+
+    for row in rows:
+        question = row['question'].strip()
+        duplicate = index.find_duplicate(question)
+        if duplicate:
+            original, similarity = duplicate
+            group = groups.setdefault(original, {"kept": original, "duplicates": []})
+            group["duplicates"].append({"question": question, "category": row['category'], "similarity": round(similarity, 3)})
+            continue
+        index.add(question)
+        kept_rows.append(row)
+
+    return kept_rows, list(groups.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="질문 뱅크 유사 중복 검사 / 제거")
+    parser.add_argument("--input", default=QUESTIONS_CSV_PATH, help="검사할 질문 CSV 경로")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="중복으로 판단할 shingle Jaccard 유사도")
+    parser.add_argument("--report-json", help="중복 묶음을 JSON으로 저장할 경로")
+    parser.add_argument("--output", help="중복을 제거한 CSV를 저장할 경로 (입력 파일 경로를 주면 덮어씁니다)")
+    args = parser.parse_args()
+
+    with open(args.input, mode='r', encoding='utf-8') as infile:
+        rows = [row for row in csv.DictReader(infile) if row.get('question', '').strip()]
+
+    kept_rows, groups = find_duplicate_groups(rows, args.threshold)
+    duplicate_count = len(rows) - len(kept_rows)
+
+    print("=" * 50)
+    print(f"전체 질문 수: {len(rows)} / 유사도 임계값: {args.threshold}")
+    print(f"유사 중복 묶음: {len(groups)}개, 중복 질문: {duplicate_count}개")
+    print("=" * 50)
+    for group in sorted(groups, key=lambda g: -len(g["duplicates"])):
+        print(f"\n[유지] {group['kept']}")
+        for duplicate in group["duplicates"]:
+            print(f"  - ({duplicate['similarity']:.2f}) {duplicate['question']}")
+
+    if args.report_json:
+        with open(args.report_json, 'w', encoding='utf-8') as f:
+            json.dump({"threshold": args.threshold, "total": len(rows), "duplicates": duplicate_count, "groups": groups},
+                      f, ensure_ascii=False, indent=2)
+        print(f"\n보고서가 '{args.report_json}' 파일에 저장되었습니다.")
+
+    if args.output:
+        with open(args.output, 'w', newline='', encoding='utf-8') as f_out:
+            writer = csv.writer(f_out)
+            writer.writerow(['category', 'question'])
+            for row in kept_rows:
+                writer.writerow([row['category'], row['question'].strip()])
+        print(f"\n중복을 제거한 질문 {len(kept_rows)}개가 '{args.output}' 파일에 저장되었습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+import os
+import csv
+import json
+import re
+import time
+from typing import Dict, List
+
+import google.generativeai as genai
+from dotenv import load_dotenv
+from tqdm import tqdm
+
+load_dotenv()
+
+API_KEY = os.getenv("GEMINI_API_KEY")
+if not API_KEY:
+    raise ValueError("GEMINI_API_KEY가 .env 파일에 설정되지 않았습니다.")
+genai.configure(api_key=API_KEY)
+
+generation_config = {"temperature": 0.7}
+model = genai.GenerativeModel(
+    model_name=os.getenv("TAIL_QUESTION_MODEL", "gemini-2.5-flash-lite"),
+    generation_config=generation_config
+)
+
+FOLLOWUPS_PER_QUESTION = 5
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+QUESTIONS_CSV_PATH = os.path.join(SCRIPT_DIR, '..', 'data', 'cs_questions.csv')
+OUTPUT_JSON_PATH = os.path.join(SCRIPT_DIR, '..', 'data', 'cs_followups.json')
+
+PROMPT_TEMPLATE = """
+당신은 IT 기업의 숙련된 기술 면접관입니다. 아래 [면접 질문]에 대해 지원자가 답변한 직후 던질 꼬리 질문을 미리 준비하려고 합니다.
+
+[지시사항]
+1. 지원자가 할 법한 대표적인 답변 유형을 **{num_followups}가지** 가정하세요.
+2. 각 답변 유형마다, 그 답변에 등장할 핵심 기술 용어 2~4개와, 그 답변을 더 깊게 파고드는 날카로운 꼬리 질문 하나를 '한글로' 작성하세요.
+3. 핵심 기술 용어는 지원자의 답변에 실제로 등장할 법한 짧은 명사형 용어여야 합니다. (예: "문맥 교환(Context Switching)", "TLB")
+4. 전체 결과를 반드시 아래 [출력 형식]으로만 반환해주세요. 다른 부가적인 설명은 절대 추가하지 마세요.
+
+[면접 질문]
+{question}
+
+[출력 형식]
+1. 키워드: 용어1, 용어2, 용어3 | 질문: 꼬리 질문
+2. 키워드: 용어1, 용어2 | 질문: 꼬리 질문
+...
+"""
+
+FOLLOWUP_LINE_PATTERN = re.compile(r"^\s*\d+\.\s*키워드:\s*(.*?)\s*\|\s*질문:\s*(.+)$", re.MULTILINE)
+
+
+def load_bank_questions() -> List[str]:
+    """
+    질문 뱅크(cs_questions.csv)의 모든 질문을 중복 없이 읽어옵니다.
+    """
+    questions = []
+    seen = set()
+    with open(QUESTIONS_CSV_PATH, mode='r', encoding='utf-8') as infile:
+        reader = csv.DictReader(infile)
+        for row in reader:
+            question = row.get('question', '').strip()
+            if question and question not in seen:
+                seen.add(question)
+                questions.append(question)
+    print(f"질문 뱅크에서 {len(questions)}개의 질문을 로드했습니다.")
+    return questions
+
+
+def load_existing_followups() -> Dict[str, List[Dict]]:
+    """
+    이미 생성된 꼬리 질문 파일을 읽어옵니다. 중단된 실행을 이어서 진행할 때 사용됩니다.
+    """
+    try:
+        with open(OUTPUT_JSON_PATH, mode='r', encoding='utf-8') as infile:
+            followups = json.load(infile)
+        print(f"기존 꼬리 질문 {len(followups)}개 항목을 로드했습니다. 해당 질문은 건너뜁니다.")
+        return followups
+    except FileNotFoundError:
+        print("기존 꼬리 질문 파일이 없어 새로 생성합니다.")
+        return {}
+
+
+def save_followups(followups: Dict[str, List[Dict]]):
+    """
+    임시 파일에 쓴 뒤 교체하여, 중간에 중단되어도 기존 파일이 깨지지 않도록 저장합니다.
+    """
+    tmp_path = OUTPUT_JSON_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f_out:
+        json.dump(followups, f_out, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, OUTPUT_JSON_PATH)
+
+
+def generate_followups_for_question(question: str, num_followups: int) -> str:
+    """
+    질문 하나에 대한 꼬리 질문 후보를 Gemini API로 생성하고 텍스트 응답을 반환합니다.
+    """
+    prompt = PROMPT_TEMPLATE.format(num_followups=num_followups, question=question)
+    try:
+        response = model.generate_content(prompt)
+        return response.text.strip()
+    except Exception as e:
+        print(f"\nGemini API 호출 중 오류 발생: {e}")
+        return ""
+
+
+def parse_followups(text: str) -> List[Dict]:
+    """
+    '키워드: ... | 질문: ...' 형식의 응답을 파싱하여 후보 목록으로 반환합니다.
+    """
+    candidates = []
+    for keywords_text, followup_question in FOLLOWUP_LINE_PATTERN.findall(text):
+        keywords = [keyword.strip().strip('"') for keyword in keywords_text.split(',') if keyword.strip()]
+        followup_question = followup_question.strip()
+        if keywords and followup_question:
+            candidates.append({"keywords": keywords, "question": followup_question})
+    return candidates
+
+
+def main():
+    """
+    메인 실행 함수
+    """
+    print("=" * 50)
+    print("질문 뱅크 꼬리 질문 사전 생성 스크립트")
+    print(f"질문당 생성 목표 꼬리 질문 수: {FOLLOWUPS_PER_QUESTION}")
+    print("=" * 50)
+
+    questions = load_bank_questions()
+    followups = load_existing_followups()
+    pending = [question for question in questions if question not in followups]
+
+    failed_count = 0
+    for index, question in enumerate(tqdm(pending, desc="꼬리 질문 생성 중"), 1):
+        candidates = parse_followups(generate_followups_for_question(question, FOLLOWUPS_PER_QUESTION))
+        if not candidates:
+            failed_count += 1
+            tqdm.write(f"꼬리 질문 생성 실패: {question[:40]}...")
+            continue
+
+        followups[question] = candidates
+        # 10개마다 저장하여 중단되더라도 진행 상황을 보존합니다.
+        if index % 10 == 0:
+            save_followups(followups)
+        time.sleep(1)
+
+    save_followups(followups)
+
+    print("\n" + "=" * 50)
+    print("꼬리 질문 사전 생성이 완료되었습니다!")
+    print(f"이번 실행에서 처리한 질문 수: {len(pending)} (실패 {failed_count})")
+    print(f"현재 꼬리 질문이 준비된 질문 수: {len(followups)} / {len(questions)}")
+    print(f"결과가 '{OUTPUT_JSON_PATH}' 파일에 저장되었습니다.")
+    print("=" * 50)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,23 @@
 import os
+import sys
 import csv
+import json
 import time
 import re
+import asyncio
+import argparse
 from typing import Dict, List, Any, Set
 
 import google.generativeai as genai
 from dotenv import load_dotenv
 from tqdm import tqdm
 
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(SCRIPT_DIR, '..'))
+
+from core.rate_limit import AsyncRateLimiter, retry_with_backoff  # noqa: E402
+from dedupe_questions import NearDuplicateIndex, DEFAULT_THRESHOLD  # noqa: E402
+
 load_dotenv()
 
 API_KEY = os.getenv("GEMINI_API_KEY")
@@ -26,6 +36,13 @@ QUESTIONS_PER_GROUP = 10
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 INPUT_CSV_PATH = os.path.join(SCRIPT_DIR, '..', 'data', '학습컨텐츠데이터-종합 (1).csv')
 OUTPUT_CSV_PATH = os.path.join(SCRIPT_DIR, '..', 'data', 'cs_questions.csv')
+# 완료된 주제 그룹 목록 (중단 후 다시 실행하면 이어서 진행, 모든 그룹을 마치면 삭제)
+CHECKPOINT_PATH = os.path.join(SCRIPT_DIR, '..', 'data', '.generate_questions_checkpoint.json')
+
+# 동시에 처리할 그룹 수, 분당 최대 요청 수(Gemini 쿼터에 맞춰 --rpm으로 조정), 그룹별 최대 재시도 횟수
+DEFAULT_CONCURRENCY = 4
+DEFAULT_REQUESTS_PER_MINUTE = 60
+DEFAULT_MAX_RETRIES = 5
 
 FILTER_KEYWORDS = ["참고 자료", "주요 질문", "정리", "란?"]
 
@@ -75,11 +92,12 @@ def load_and_group_data() -> Dict[str, List[Dict[str, str]]]:
         print(f"데이터 로드 중 오류 발생: {e}")
         return {}
 
-def load_existing_questions(file_path: str) -> Set[str]:
+def load_existing_questions(file_path: str, threshold: float = DEFAULT_THRESHOLD) -> NearDuplicateIndex:
     """
-    기존 CSV 파일에서 모든 질문을 읽어와 중복 검사를 위한 set으로 반환합니다.
+    기존 CSV 파일에서 모든 질문을 읽어와 유사 중복 검사를 위한 MinHash 색인으로 반환합니다.
+    표현만 다른 질문도 threshold 이상 유사하면 중복으로 판단합니다.
     """
-    existing_questions = set()
+    existing_questions = NearDuplicateIndex(threshold=threshold)
     try:
         with open(file_path, mode='r', encoding='utf-8') as infile:
             next(infile) 
@@ -92,27 +110,67 @@ def load_existing_questions(file_path: str) -> Set[str]:
         print("기존 질문 파일이 없어 새로 생성합니다.")
     return existing_questions
 
-def generate_questions_for_group(topics: List[Dict[str, str]], num_questions: int) -> str:
+def load_checkpoint() -> Set[str]:
+    """
+    이전 실행에서 완료된 second_category 목록을 읽어옵니다.
+    """
+    try:
+        with open(CHECKPOINT_PATH, mode='r', encoding='utf-8') as f:
+            completed = set(json.load(f).get("completed", []))
+        print(f"체크포인트에서 완료된 주제 그룹 {len(completed)}개를 확인했습니다. 이어서 진행합니다.")
+        return completed
+    except FileNotFoundError:
+        return set()
+    except (json.JSONDecodeError, OSError) as e:
+        print(f"체크포인트 파일을 읽을 수 없어 처음부터 진행합니다: {e}")
+        return set()
+
+def save_checkpoint(completed: Set[str]):
     """
-    한 그룹의 토픽 데이터를 받아 Gemini API를 호출하고 마크다운 응답을 반환합니다.
+    완료된 second_category 목록을 임시 파일에 쓴 뒤 교체하여 원자적으로 저장합니다.
+    """
+    tmp_path = CHECKPOINT_PATH + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump({"completed": sorted(completed)}, f, ensure_ascii=False, indent=2)
+    os.replace(tmp_path, CHECKPOINT_PATH)
+
+async def generate_questions_for_group(
+    topics: List[Dict[str, str]],
+    num_questions: int,
+    limiter: AsyncRateLimiter,
+    max_retries: int
+) -> str:
+    """
+    한 그룹의 토픽 데이터를 받아 Gemini API를 비동기로 호출하고 마크다운 응답을 반환합니다.
+    실패하면 지수 백오프로 재시도하며, 끝내 실패하면 빈 문자열을 반환합니다.
     """
     topic_titles = "\n".join([f"- {topic['title']}" for topic in topics])
     prompt = PROMPT_TEMPLATE.format(num_questions=num_questions, topic_titles=topic_titles)
+
+    async def call():
+        response = await model.generate_content_async(prompt)
+        text = response.text.strip()
+        if not text:
+            raise ValueError("빈 응답")
+        return text
+
+    def on_retry(attempt: int, error: Exception, delay: float):
+        tqdm.write(f"Gemini API 호출 실패 ({attempt}/{max_retries}회 재시도, {delay:.1f}초 후): {error}")
+
     try:
-        response = model.generate_content(prompt)
-        return response.text.strip()
+        return await retry_with_backoff(call, max_retries=max_retries, limiter=limiter, on_retry=on_retry)
     except Exception as e:
-        print(f"\nGemini API 호출 중 오류 발생: {e}")
+        tqdm.write(f"\nGemini API 호출 중 오류 발생: {e}")
         return ""
 
 def parse_and_save_questions(
     writer: Any,
     markdown_text: str,
     category: str,
-    existing_questions: Set[str]
+    existing_questions: NearDuplicateIndex
 ) -> tuple[int, int]:
     """
-    마크다운 텍스트를 파싱하고, 중복을 검사한 뒤 CSV에 저장합니다.
+    마크다운 텍스트를 파싱하고, 유사 중복을 검사한 뒤 CSV에 저장합니다.
     저장된 질문 수와 중복으로 건너뛴 질문 수를 반환합니다.
     """
     saved_count = 0
@@ -130,25 +188,90 @@ def parse_and_save_questions(
             
     return saved_count, skipped_count
 
+async def run_pipeline(
+    grouped_data: Dict[str, List[Dict[str, str]]],
+    existing_questions: NearDuplicateIndex,
+    completed_groups: Set[str],
+    writer: Any,
+    f_out: Any,
+    args: argparse.Namespace
+) -> Dict[str, int]:
+    """
+    아직 완료되지 않은 주제 그룹들을 제한된 동시성으로 처리합니다.
+    그룹의 질문이 파일에 기록된 직후 체크포인트를 갱신하므로, 중단되더라도 완료된 그룹은 다시 처리하지 않습니다.
+    """
+    pending = [(category, topics) for category, topics in grouped_data.items() if topics and category not in completed_groups]
+    stats = {"api_calls": 0, "added": 0, "skipped": 0, "failed": 0}
+    if not pending:
+        return stats
+
+    limiter = AsyncRateLimiter(args.rpm)
+    semaphore = asyncio.Semaphore(args.concurrency)
+    progress = tqdm(total=len(pending), desc="주제 그룹 처리 중")
+    start_time = time.monotonic()
+
+    async def process(second_category: str, topics: List[Dict[str, str]]):
+        async with semaphore:
+            stats["api_calls"] += 1
+            markdown_response = await generate_questions_for_group(topics, QUESTIONS_PER_GROUP, limiter, args.max_retries)
+
+        if not markdown_response:
+            stats["failed"] += 1
+            tqdm.write(f"'{second_category}' 그룹에 대한 질문 생성에 실패했습니다. 다음 실행에서 다시 시도합니다.")
+        else:
+            # 이벤트 루프는 단일 스레드이므로 CSV 기록과 체크포인트 갱신이 서로 섞이지 않습니다.
+            saved, skipped = parse_and_save_questions(
+                writer, markdown_response, topics[0]['first_category'], existing_questions
+            )
+            f_out.flush()
+            completed_groups.add(second_category)
+            save_checkpoint(completed_groups)
+
+            stats["added"] += saved
+            stats["skipped"] += skipped
+            if skipped > 0:
+                tqdm.write(f"'{second_category}' 그룹에서 중복 질문 {skipped}개를 건너뛰었습니다.")
+
+        elapsed_min = (time.monotonic() - start_time) / 60
+        progress.update(1)
+        progress.set_postfix(groups_per_min=f"{progress.n / elapsed_min:.1f}" if elapsed_min > 0 else "-")
+
+    try:
+        await asyncio.gather(*(process(category, topics) for category, topics in pending))
+    finally:
+        progress.close()
+
+    elapsed_min = (time.monotonic() - start_time) / 60
+    stats["groups_per_min"] = round(len(pending) / elapsed_min, 1) if elapsed_min > 0 else 0
+    return stats
+
 def main():
     """
     메인 실행 함수
     """
+    parser = argparse.ArgumentParser(description="Gemini API를 이용한 면접 질문 자동 생성")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="동시에 처리할 주제 그룹 수")
+    parser.add_argument("--rpm", type=float, default=DEFAULT_REQUESTS_PER_MINUTE, help="분당 최대 API 요청 수")
+    parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES, help="그룹별 최대 재시도 횟수")
+    parser.add_argument("--reset", action="store_true", help="체크포인트를 무시하고 모든 그룹을 다시 처리")
+    parser.add_argument("--similarity-threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="유사 중복으로 판단할 shingle Jaccard 유사도")
+    args = parser.parse_args()
+
     print("=" * 50)
     print("Gemini API를 이용한 면접 질문 자동 생성 스크립트")
     print(f"그룹당 생성 목표 질문 수: {QUESTIONS_PER_GROUP}")
+    print(f"동시 처리 그룹 수: {args.concurrency} / 분당 최대 요청 수: {args.rpm}")
     print("=" * 50)
 
-    existing_questions_set = load_existing_questions(OUTPUT_CSV_PATH)
+    existing_questions_set = load_existing_questions(OUTPUT_CSV_PATH, args.similarity_threshold)
     
     grouped_data = load_and_group_data()
     if not grouped_data:
         print("처리할 데이터가 없습니다. 스크립트를 종료합니다.")
         return
 
-    total_newly_added = 0
-    total_skipped = 0
-    api_call_count = 0
+    completed_groups = set() if args.reset else load_checkpoint()
  
     output_file_exists = os.path.exists(OUTPUT_CSV_PATH)
     if not output_file_exists:
@@ -164,43 +287,28 @@ def main():
     try:
         with open(OUTPUT_CSV_PATH, 'a', newline='', encoding='utf-8') as f_out:
             writer = csv.writer(f_out)
-            
-            for second_category, topics in tqdm(grouped_data.items(), desc="주제 그룹 처리 중"):
-                if not topics:
-                    continue
-                
-                api_call_count += 1
-                first_category = topics[0]['first_category']
-                markdown_response = generate_questions_for_group(topics, QUESTIONS_PER_GROUP)
-
-                if not markdown_response:
-                    tqdm.write(f"'{second_category}' 그룹에 대한 질문 생성에 실패했습니다. (API 응답 없음)")
-                    continue
-                
-                saved, skipped = parse_and_save_questions(
-                    writer, markdown_response, first_category, existing_questions_set
-                )
-                
-                if saved > 0:
-                    total_newly_added += saved
-                if skipped > 0:
-                    total_skipped += skipped
-                    tqdm.write(f"'{second_category}' 그룹에서 중복 질문 {skipped}개를 건너뛰었습니다.")
-
-                time.sleep(1)
+            stats = asyncio.run(run_pipeline(grouped_data, existing_questions_set, completed_groups, writer, f_out, args))
 
     except IOError as e:
         print(f"오류: 출력 파일 '{OUTPUT_CSV_PATH}'에 쓰는 중 문제가 발생했습니다. {e}")
         return
+    except KeyboardInterrupt:
+        print(f"\n중단되었습니다. 완료된 그룹 {len(completed_groups)}개는 체크포인트에 저장되어 다음 실행에서 건너뜁니다.")
+        return
+
+    all_completed = all(category in completed_groups for category, topics in grouped_data.items() if topics)
+    if all_completed and os.path.exists(CHECKPOINT_PATH):
+        os.remove(CHECKPOINT_PATH)
 
     print("\n" + "=" * 50)
-    print("질문 생성이 완료되었습니다!")
-    print(f"총 API 호출 횟수: {api_call_count}")
-    print(f"새롭게 추가된 질문 수: {total_newly_added}")
-    print(f"중복으로 인해 건너뛴 질문 수: {total_skipped}")
+    print("질문 생성이 완료되었습니다!" if all_completed else f"질문 생성이 일부 완료되었습니다. (실패 그룹 {stats['failed']}개는 다시 실행하면 이어서 처리됩니다)")
+    print(f"총 API 호출 횟수: {stats['api_calls']}")
+    print(f"새롭게 추가된 질문 수: {stats['added']}")
+    print(f"중복(유사 중복 포함)으로 인해 건너뛴 질문 수: {stats['skipped']}")
+    print(f"처리 속도: {stats.get('groups_per_min', 0)} groups/min")
     print(f"현재 총 질문 수: {len(existing_questions_set)}")
     print(f"결과가 '{OUTPUT_CSV_PATH}' 파일에 저장되었습니다.")
     print("=" * 50)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,181 @@
+"""
+면접 API 부하 테스트 스크립트
+
+/interview/start -> /interview/next x N -> /interview/evaluation 으로 이어지는 면접 세션을
+목표 동시성으로 반복 실행하고, 엔드포인트별 p50/p95/p99 지연 시간과 처리량을 보고합니다.
+
+실제 Gemini 키 없이 용량 산정을 하려면 fake 백엔드로 서버를 띄운 뒤 실행합니다.
+    MODEL_BACKEND=fake FAKE_TTFT_MS=400 uvicorn main:app --workers 2
+    python scripts/load_test.py --sessions 200 --concurrency 20 --turns 3
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any
+
+import requests
+
+CANNED_ANSWERS = [
+    "프로세스는 독립된 메모리 공간을 할당받는 실행 단위이고, 스레드는 프로세스 내에서 자원을 공유하며 실행되는 흐름입니다.",
+    "여러 스레드가 공유 자원에 동시에 접근하면 경쟁 상태가 발생하므로 뮤텍스나 세마포어로 임계 구역을 보호해야 합니다.",
+    "인덱스는 B+Tree 구조로 저장되어 범위 검색에 유리하지만, 쓰기 작업 시 인덱스 갱신 비용이 추가로 발생합니다.",
+    "TCP는 3-way handshake로 연결을 수립하고 흐름 제어와 혼잡 제어를 통해 신뢰성 있는 전송을 보장합니다.",
+    "가상 메모리는 페이지 단위로 물리 메모리에 매핑되며, 페이지 폴트가 발생하면 디스크에서 해당 페이지를 불러옵니다.",
+]
+
+
+class LoadTestStats:
+    """
+    여러 스레드에서 수집한 엔드포인트별 지연 시간과 오류를 보관합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, Dict[str, int]] = {}
+        self.completed_sessions = 0
+        self.failed_sessions = 0
+
+    def record(self, endpoint: str, latency_s: float, error: str = None):
+        with self._lock:
+            if error:
+                self.errors.setdefault(endpoint, {})
+                self.errors[endpoint][error] = self.errors[endpoint].get(error, 0) + 1
+            else:
+                self.latencies.setdefault(endpoint, []).append(latency_s)
+
+    def finish_session(self, ok: bool):
+        with self._lock:
+            if ok:
+                self.completed_sessions += 1
+            else:
+                self.failed_sessions += 1
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """
+    정렬된 값 목록에서 최근접 순위(nearest-rank) 방식으로 백분위수를 계산합니다.
+    """
+    if not values:
+        return 0.0
+    rank = max(math.ceil(pct / 100 * len(values)), 1)
+    return values[min(rank, len(values)) - 1]
+
+
+def _post(session: requests.Session, stats: LoadTestStats, base_url: str, path: str, payload: Dict[str, Any], timeout: float) -> Dict[str, Any]:
+    start = time.perf_counter()
+    try:
+        response = session.post(f"{base_url}{path}", json=payload, timeout=timeout)
+    except requests.exceptions.RequestException as e:
+        stats.record(path, time.perf_counter() - start, error=type(e).__name__)
+        return None
+    elapsed = time.perf_counter() - start
+
+    if response.status_code != 200:
+        stats.record(path, elapsed, error=f"HTTP {response.status_code}")
+        return None
+    stats.record(path, elapsed)
+    return response.json()
+
+
+def run_session(base_url: str, interview_type: str, turns: int, timeout: float, stats: LoadTestStats):
+    """
+    면접 세션 하나(시작 -> 꼬리 질문 N회 -> 종합 평가)를 실행합니다.
+    """
+    with requests.Session() as session:
+        started = _post(session, stats, base_url, "/interview/start", {"interviewType": interview_type}, timeout)
+        if not started:
+            stats.finish_session(False)
+            return
+
+        messages = [{"role": "assistant", "content": started["response"]}]
+        for _ in range(turns):
+            messages.append({"role": "user", "content": random.choice(CANNED_ANSWERS)})
+            next_question = _post(session, stats, base_url, "/interview/next",
+                                  {"interviewType": interview_type, "messages": messages}, timeout)
+            if not next_question:
+                stats.finish_session(False)
+                return
+            messages.append({"role": "assistant", "content": next_question["response"]})
+
+        messages.append({"role": "user", "content": random.choice(CANNED_ANSWERS)})
+        evaluation = _post(session, stats, base_url, "/interview/evaluation",
+                           {"interviewType": interview_type, "conversation": messages}, timeout)
+        stats.finish_session(evaluation is not None)
+
+
+def build_report(stats: LoadTestStats, elapsed_s: float, args: argparse.Namespace) -> Dict[str, Any]:
+    endpoints = {}
+    for endpoint in sorted(set(stats.latencies) | set(stats.errors)):
+        values = sorted(stats.latencies.get(endpoint, []))
+        endpoints[endpoint] = {
+            "requests": len(values),
+            "errors": stats.errors.get(endpoint, {}),
+            "p50_ms": round(percentile(values, 50) * 1000, 2),
+            "p95_ms": round(percentile(values, 95) * 1000, 2),
+            "p99_ms": round(percentile(values, 99) * 1000, 2),
+            "max_ms": round(values[-1] * 1000, 2) if values else 0.0,
+        }
+
+    total_requests = sum(len(v) for v in stats.latencies.values())
+    return {
+        "base_url": args.base_url,
+        "sessions": args.sessions,
+        "concurrency": args.concurrency,
+        "turns": args.turns,
+        "elapsed_s": round(elapsed_s, 2),
+        "completed_sessions": stats.completed_sessions,
+        "failed_sessions": stats.failed_sessions,
+        "sessions_per_second": round(stats.completed_sessions / elapsed_s, 2) if elapsed_s > 0 else 0,
+        "requests_per_second": round(total_requests / elapsed_s, 2) if elapsed_s > 0 else 0,
+        "endpoints": endpoints,
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print("=" * 70)
+    print(f"세션 {report['completed_sessions']}개 완료 / {report['failed_sessions']}개 실패 "
+          f"(동시성 {report['concurrency']}, 꼬리 질문 {report['turns']}회)")
+    print(f"총 소요 시간: {report['elapsed_s']}s | 처리량: {report['sessions_per_second']} sessions/s, "
+          f"{report['requests_per_second']} req/s")
+    print("-" * 70)
+    print(f"{'endpoint':<24}{'count':>8}{'p50(ms)':>11}{'p95(ms)':>11}{'p99(ms)':>11}{'errors':>8}")
+    for endpoint, data in report["endpoints"].items():
+        error_count = sum(data["errors"].values())
+        print(f"{endpoint:<24}{data['requests']:>8}{data['p50_ms']:>11}{data['p95_ms']:>11}{data['p99_ms']:>11}{error_count:>8}")
+    print("=" * 70)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="면접 API 부하 테스트")
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--sessions", type=int, default=50, help="실행할 총 면접 세션 수")
+    parser.add_argument("--concurrency", type=int, default=10, help="동시에 진행할 세션 수")
+    parser.add_argument("--turns", type=int, default=3, help="세션당 /interview/next 호출 횟수")
+    parser.add_argument("--interview-type", default="Operating System")
+    parser.add_argument("--timeout", type=float, default=120.0, help="요청별 타임아웃(초)")
+    parser.add_argument("--output", help="결과를 저장할 JSON 파일 경로")
+    args = parser.parse_args()
+
+    stats = LoadTestStats()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        for _ in range(args.sessions):
+            executor.submit(run_session, args.base_url, args.interview_type, args.turns, args.timeout, stats)
+    elapsed = time.perf_counter() - start
+
+    report = build_report(stats, elapsed, args)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과가 '{args.output}' 파일에 저장되었습니다.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+# services/batch_evaluation.py
+
+import asyncio
+import hashlib
+import json
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, Optional
+
+from core.cache import get_cache, make_key
+from core.config import (
+    EVALUATION_DEADLINE_S, BATCH_EVALUATION_CONCURRENCY, BATCH_EVALUATION_RPM, BATCH_EVALUATION_MAX_RETRIES
+)
+from core.deadline import Deadline
+from core.rate_limit import AsyncRateLimiter, retry_with_backoff
+from models.interview_models import BatchEvaluationItem
+from services.gemini_service import evaluate_conversation, is_incomplete_report
+
+_stats = {"batches": 0, "items": 0, "succeeded": 0, "failed": 0, "resumed": 0, "retries": 0}
+# 프로세스 안의 모든 배치가 같은 Gemini 쿼터를 쓰므로 리미터 하나를 공유합니다.
+_limiter: Optional[AsyncRateLimiter] = None
+
+
+class IncompleteEvaluation(Exception):
+    """
+    모델 응답을 파싱하지 못해 질문별 평가가 없는 리포트를 받았을 때 발생하는 예외입니다. (재시도 대상)
+    """
+
+
+def get_batch_rate_limiter() -> AsyncRateLimiter:
+    global _limiter
+    if _limiter is None:
+        _limiter = AsyncRateLimiter(BATCH_EVALUATION_RPM)
+    return _limiter
+
+
+def _batches():
+    return get_cache("evaluation_batches")
+
+
+def content_hash(item: BatchEvaluationItem) -> str:
+    """
+    항목의 평가 대상(interviewType + conversation) 해시입니다.
+    이어하기는 id와 이 해시가 모두 같을 때만 이전 결과를 재사용하므로, 같은 id로 내용이 바뀐 항목은 다시 평가합니다.
+    """
+    payload = {
+        "interviewType": item.interviewType,
+        "conversation": [message.model_dump() for message in item.conversation],
+    }
+    return hashlib.sha256(json.dumps(payload, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+async def evaluate_item(
+    item: BatchEvaluationItem,
+    limiter: Optional[AsyncRateLimiter] = None,
+    max_retries: int = BATCH_EVALUATION_MAX_RETRIES,
+    batch_id: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    항목 하나를 평가해 결과 줄(dict)을 반환합니다. 예외를 발생시키지 않고 실패도 결과 줄로 반환합니다.
+    batch_id가 있으면 id와 내용이 같은 항목의 이전 성공 결과를 재사용하고, 새로 성공한 결과를 저장합니다.
+
+    Returns:
+        dict: id, content_hash, status(succeeded | failed), result(성공 시, interviewType과 evaluation_report),
+            error(실패 시), attempts, elapsed_s, resumed(이전 결과를 재사용한 경우)
+    """
+    item_hash = content_hash(item)
+    cache_key = make_key(batch_id, item.id, item_hash) if batch_id else None
+    if cache_key:
+        cached = await _batches().aget(cache_key)
+        if cached:
+            _stats["resumed"] += 1
+            return {**cached, "resumed": True}
+
+    start = time.perf_counter()
+    attempts = 0
+
+    async def attempt():
+        nonlocal attempts
+        attempts += 1
+        # 시도마다 제한 시간을 새로 적용합니다. (대기열/백오프 대기 시간은 포함하지 않음)
+        evaluation_result = await evaluate_conversation(item.conversation, deadline=Deadline(EVALUATION_DEADLINE_S))
+        # 파싱 실패 대체 리포트를 성공으로 저장하면 이어하기에서 다시 평가하지 않으므로 실패로 처리합니다.
+        if is_incomplete_report(evaluation_result["evaluation_report"]):
+            raise IncompleteEvaluation("평가 응답을 파싱하지 못했습니다.")
+        return evaluation_result
+
+    def on_retry(attempt_no: int, error: Exception, delay: float):
+        _stats["retries"] += 1
+        print(f"[BatchEvaluation] {item.id} 재시도 {attempt_no}/{max_retries} ({delay:.1f}초 후): {type(error).__name__} {error}")
+
+    try:
+        evaluation_result = await retry_with_backoff(attempt, max_retries=max_retries, limiter=limiter, on_retry=on_retry)
+        line = {
+            "id": item.id,
+            "content_hash": item_hash,
+            "status": "succeeded",
+            "result": {
+                "interviewType": item.interviewType,
+                "evaluation_report": evaluation_result["evaluation_report"].model_dump(),
+            },
+        }
+        _stats["succeeded"] += 1
+    except Exception as e:
+        line = {"id": item.id, "content_hash": item_hash, "status": "failed", "error": f"{type(e).__name__}: {e}"}
+        _stats["failed"] += 1
+
+    line["attempts"] = attempts
+    line["elapsed_s"] = round(time.perf_counter() - start, 3)
+    if cache_key and line["status"] == "succeeded":
+        await _batches().aset(cache_key, line)
+    return line
+
+
+async def evaluate_batch(
+    items: Iterable[BatchEvaluationItem],
+    concurrency: int = BATCH_EVALUATION_CONCURRENCY,
+    limiter: Optional[AsyncRateLimiter] = None,
+    max_retries: int = BATCH_EVALUATION_MAX_RETRIES,
+    batch_id: Optional[str] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    여러 대화를 동시에 concurrency개씩 평가하고, 끝나는 순서대로 결과 줄을 내보내는 비동기 제너레이터입니다.
+    요청 시작 간격은 limiter(기본: 공유 RPM 리미터)가 정하고, 429 응답을 받으면 리미터 전체가 잠시 멈춥니다.
+
+    items는 필요한 만큼만 꺼내므로 큰 JSONL 파일도 한 번에 읽지 않고 처리할 수 있습니다.
+    소비자가 결과를 읽지 않으면 결과 대기열(concurrency개)이 차서 평가도 멈추고,
+    제너레이터가 중간에 닫히면(클라이언트 연결 종료 등) 진행 중인 평가를 취소합니다.
+    """
+    limiter = limiter or get_batch_rate_limiter()
+    pending = iter(items)
+    results: asyncio.Queue = asyncio.Queue(maxsize=concurrency)
+    _stats["batches"] += 1
+
+    async def worker():
+        try:
+            # 이벤트 루프는 단일 스레드이므로 워커들이 같은 이터레이터를 나눠 써도 안전합니다.
+            for item in pending:
+                _stats["items"] += 1
+                await results.put(await evaluate_item(item, limiter, max_retries, batch_id))
+        except Exception as e:
+            # items를 읽다가 난 오류는 소비자 쪽에서 다시 발생시킵니다.
+            await results.put(e)
+            return
+        await results.put(None)
+
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+    try:
+        running = len(workers)
+        while running:
+            line = await results.get()
+            if line is None:
+                running -= 1
+                continue
+            if isinstance(line, Exception):
+                raise line
+            yield line
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+
+def get_batch_evaluation_stats() -> Dict[str, Any]:
+    return {**_stats, "rpm": BATCH_EVALUATION_RPM}
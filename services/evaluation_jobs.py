@@ -0,0 +1,292 @@
+# services/evaluation_jobs.py
+
+import asyncio
+import ipaddress
+import socket
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from core.cache import get_cache
+from core.config import (
+    EVALUATION_DEADLINE_S, EVALUATION_WORKERS, EVALUATION_QUEUE_SIZE,
+    EVALUATION_CALLBACK_TIMEOUT_S, EVALUATION_CALLBACK_RETRIES, EVALUATION_CALLBACK_ALLOWED_HOSTS
+)
+from core.deadline import Deadline
+from models.interview_models import Message
+from services.gemini_service import evaluate_conversation
+
+
+class JobQueueFull(Exception):
+    """
+    평가 작업 대기열이 가득 차 새 작업을 받을 수 없을 때 발생하는 예외입니다.
+    """
+
+
+class InvalidCallbackUrl(Exception):
+    """
+    callback_url이 허용되지 않는 주소(https가 아님, 내부/사설 IP로 해석됨, 허용 목록에 없음)일 때 발생하는 예외입니다.
+    """
+
+
+# 작업 상태는 공유 캐시(evaluation_jobs 네임스페이스, TTL 후 자동 삭제)에 저장하므로
+# 어느 워커 프로세스로 상태 조회 요청이 가도 같은 결과를 볼 수 있습니다. 대기열은 프로세스마다 따로 둡니다.
+_queue: Optional[asyncio.Queue] = None
+_workers: List[asyncio.Task] = []
+# 워커가 처리 중인 작업 {job_id: callback_url}. 종료할 때 끝내지 못한 작업을 실패로 기록하는 데 사용합니다.
+_in_flight: Dict[str, Optional[str]] = {}
+_stats = {"submitted": 0, "succeeded": 0, "failed": 0, "rejected": 0, "callbacks_failed": 0}
+
+
+def _jobs():
+    return get_cache("evaluation_jobs")
+
+
+async def _update_job(job_id: str, **fields) -> Dict[str, Any]:
+    job = await _jobs().aget(job_id) or {"job_id": job_id}
+    job.update(fields)
+    await _jobs().aset(job_id, job)
+    return job
+
+
+def _is_public_address(address: str) -> bool:
+    ip = ipaddress.ip_address(address.split('%', 1)[0])
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    # is_global은 사설/루프백/링크 로컬/예약 대역을 제외하지만 멀티캐스트는 포함하므로 따로 거릅니다.
+    return ip.is_global and not ip.is_multicast
+
+
+async def _resolve(host: str, port: int) -> List[str]:
+    infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+    return list(dict.fromkeys(info[4][0] for info in infos))
+
+
+async def validate_callback_url(url: str) -> List[str]:
+    """
+    콜백 URL이 서버 내부망을 향하지 않는지 확인하고, 연결해도 되는 IP 주소 목록을 반환합니다. (SSRF 방지)
+    https만 허용하고, EVALUATION_CALLBACK_ALLOWED_HOSTS가 있으면 그 호스트만,
+    없으면 호스트가 해석되는 모든 IP가 공인 주소일 때만 허용합니다.
+
+    Raises:
+        InvalidCallbackUrl: 허용되지 않는 URL일 때
+    """
+    parts = urlsplit(url)
+    host = (parts.hostname or "").lower()
+    if parts.scheme != "https" or not host:
+        raise InvalidCallbackUrl("callback_url은 https 주소만 사용할 수 있습니다.")
+    if EVALUATION_CALLBACK_ALLOWED_HOSTS and host not in EVALUATION_CALLBACK_ALLOWED_HOSTS:
+        raise InvalidCallbackUrl(f"'{host}'은(는) 콜백을 허용하지 않는 호스트입니다.")
+    try:
+        addresses = await _resolve(host, parts.port or 443)
+    except (socket.gaierror, UnicodeError) as e:
+        raise InvalidCallbackUrl(f"'{host}' 주소를 확인할 수 없습니다: {e}")
+    if not EVALUATION_CALLBACK_ALLOWED_HOSTS and not all(_is_public_address(address) for address in addresses):
+        raise InvalidCallbackUrl(f"'{host}'은(는) 내부 또는 사설 주소로 연결되므로 콜백을 보낼 수 없습니다.")
+    return addresses
+
+
+class _PinnedHostAdapter(HTTPAdapter):
+    """
+    URL의 호스트 자리에 검증한 IP를 넣어 보낼 때, TLS 인증서 확인과 SNI는 원래 호스트 이름으로 하도록 하는 어댑터입니다.
+    """
+
+    def __init__(self, hostname: str, **kwargs):
+        self._hostname = hostname
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["server_hostname"] = self._hostname
+        kwargs["assert_hostname"] = self._hostname
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _post_pinned(url: str, address: str, payload: Dict[str, Any]) -> requests.Response:
+    """
+    url로 payload를 POST하되 DNS를 다시 조회하지 않고 검증한 address로만 연결합니다.
+    (검증 후 DNS 응답을 바꿔 내부 주소로 연결시키는 DNS 리바인딩 방지)
+    Host 헤더, SNI, 인증서 확인은 원래 호스트 이름을 사용합니다.
+    """
+    parts = urlsplit(url)
+    ip_host = f"[{address}]" if ':' in address else address
+    netloc = ip_host if parts.port is None else f"{ip_host}:{parts.port}"
+    if parts.username:
+        netloc = parts.netloc.rsplit('@', 1)[0] + '@' + netloc
+    host_header = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+
+    with requests.Session() as session:
+        session.mount("https://", _PinnedHostAdapter(parts.hostname))
+        return session.post(
+            parts._replace(netloc=netloc).geturl(), json=payload, headers={"Host": host_header},
+            timeout=EVALUATION_CALLBACK_TIMEOUT_S, allow_redirects=False
+        )
+
+
+def get_job(job_id: str) -> Optional[Dict[str, Any]]:
+    """
+    작업 상태를 반환합니다. 없거나 TTL이 지나 삭제되었으면 None을 반환합니다.
+
+    Returns:
+        dict: job_id, status(queued | running | succeeded | failed), created_at, started_at, finished_at,
+            result(성공 시), error(실패 시), callback_url, callback_status
+    """
+    return _jobs().get(job_id)
+
+
+async def submit_job(interview_type: str, conversation: List[Message], callback_url: Optional[str] = None) -> Dict[str, Any]:
+    """
+    평가 작업을 대기열에 넣고 바로 작업 정보를 반환합니다.
+
+    Raises:
+        JobQueueFull: 대기열이 가득 찼을 때 (워커가 시작되지 않은 경우 포함)
+    """
+    if _queue is None or _queue.full():
+        _stats["rejected"] += 1
+        raise JobQueueFull("평가 작업 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+
+    job_id = uuid.uuid4().hex
+    job = await _update_job(
+        job_id,
+        status="queued",
+        interviewType=interview_type,
+        created_at=time.time(),
+        callback_url=callback_url,
+    )
+    try:
+        _queue.put_nowait((job_id, interview_type, conversation, callback_url))
+    except asyncio.QueueFull:
+        # 작업 상태를 저장하는 동안 다른 요청이 대기열을 채운 경우
+        await _jobs().adelete(job_id)
+        _stats["rejected"] += 1
+        raise JobQueueFull("평가 작업 대기열이 가득 찼습니다. 잠시 후 다시 시도해주세요.")
+    _stats["submitted"] += 1
+    return job
+
+
+async def _send_callback(job: Dict[str, Any], retries: int = EVALUATION_CALLBACK_RETRIES) -> str:
+    """
+    callback_url로 작업 결과를 POST합니다. 실패하면 지수 백오프로 retries번까지 다시 시도합니다.
+    등록 후 DNS가 바뀌었을 수 있으므로 보내기 전에 주소를 다시 확인하고, 확인한 IP로만 연결하며, 리다이렉트는 따라가지 않습니다.
+    """
+    try:
+        address = (await validate_callback_url(job["callback_url"]))[0]
+    except InvalidCallbackUrl as e:
+        print(f"[EvaluationJob] 콜백 전송 거부 ({job['job_id']}): {e}")
+        _stats["callbacks_failed"] += 1
+        return "failed"
+
+    payload = {key: value for key, value in job.items() if key != "callback_url"}
+    for attempt in range(retries + 1):
+        try:
+            response = await asyncio.to_thread(_post_pinned, job["callback_url"], address, payload)
+            if response.status_code < 400:
+                return "delivered"
+            error = f"HTTP {response.status_code}"
+        except requests.exceptions.RequestException as e:
+            error = str(e)
+        print(f"[EvaluationJob] 콜백 전송 실패 ({attempt + 1}회, {job['job_id']}): {error}")
+        if attempt < retries:
+            await asyncio.sleep(2 ** attempt)
+    _stats["callbacks_failed"] += 1
+    return "failed"
+
+
+async def _run_job(job_id: str, interview_type: str, conversation: List[Message], callback_url: Optional[str]):
+    _in_flight[job_id] = callback_url
+    await _update_job(job_id, status="running", started_at=time.time())
+    try:
+        evaluation_result = await evaluate_conversation(conversation, deadline=Deadline(EVALUATION_DEADLINE_S))
+        job = await _update_job(
+            job_id,
+            status="succeeded",
+            finished_at=time.time(),
+            result={
+                "interviewType": interview_type,
+                "evaluation_report": evaluation_result["evaluation_report"].model_dump(),
+            },
+        )
+        _stats["succeeded"] += 1
+    except Exception as e:
+        job = await _update_job(job_id, status="failed", finished_at=time.time(), error=f"{type(e).__name__}: {e}")
+        _stats["failed"] += 1
+
+    if callback_url:
+        await _update_job(job_id, callback_status=await _send_callback(job))
+    # 취소(서버 종료)되면 여기까지 오지 않으므로 _in_flight에 남아 stop_evaluation_workers가 정리합니다.
+    _in_flight.pop(job_id, None)
+
+
+async def _worker():
+    while True:
+        job_id, interview_type, conversation, callback_url = await _queue.get()
+        try:
+            await _run_job(job_id, interview_type, conversation, callback_url)
+        except Exception as e:
+            print(f"[EvaluationJob] 작업 처리 중 오류 ({job_id}): {type(e).__name__} {e}")
+            _in_flight.pop(job_id, None)
+        finally:
+            _queue.task_done()
+
+
+async def _finish_callback(job: Dict[str, Any]):
+    await _update_job(job["job_id"], callback_status=await _send_callback(job, retries=0))
+
+
+def start_evaluation_workers():
+    """
+    대기열과 워커 EVALUATION_WORKERS개를 시작합니다. (앱 시작 시 lifespan에서 호출)
+    동시에 실행되는 평가 수는 워커 수로, 대기할 수 있는 작업 수는 EVALUATION_QUEUE_SIZE로 제한됩니다.
+    """
+    global _queue
+    if _workers:
+        return
+    _queue = asyncio.Queue(maxsize=EVALUATION_QUEUE_SIZE)
+    _workers.extend(asyncio.create_task(_worker()) for _ in range(EVALUATION_WORKERS))
+
+
+async def stop_evaluation_workers():
+    """
+    워커를 중지합니다. 실행 중이거나 대기 중이던 작업은 실패(서버 종료)로 기록하고,
+    callback_url이 있으면 종료가 늦어지지 않도록 재시도 없이 한 번만 콜백을 보냅니다.
+    """
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+
+    unfinished = dict(_in_flight)
+    _in_flight.clear()
+    while _queue is not None and not _queue.empty():
+        job_id, _, _, callback_url = _queue.get_nowait()
+        _queue.task_done()
+        unfinished[job_id] = callback_url
+
+    callbacks = []
+    for job_id, callback_url in unfinished.items():
+        job = await _jobs().aget(job_id) or {"job_id": job_id}
+        if job.get("status") not in ("succeeded", "failed"):
+            job = await _update_job(job_id, status="failed", finished_at=time.time(), error="서버 종료로 작업이 중단되었습니다.")
+            _stats["failed"] += 1
+        if callback_url and not job.get("callback_status"):
+            callbacks.append(_finish_callback(job))
+    if callbacks:
+        print(f"[EvaluationJob] 종료 전 끝내지 못한 작업 {len(unfinished)}개를 실패로 기록하고 콜백 {len(callbacks)}개를 보냅니다.")
+        try:
+            # 콜백 요청 자체도 EVALUATION_CALLBACK_TIMEOUT_S로 제한되지만, 주소 확인까지 포함해 전체 대기 시간을 묶어 둡니다.
+            await asyncio.wait_for(asyncio.gather(*callbacks), timeout=EVALUATION_CALLBACK_TIMEOUT_S * 2)
+        except asyncio.TimeoutError:
+            print("[EvaluationJob] 종료 전 콜백을 모두 보내지 못했습니다.")
+
+
+
+def get_evaluation_job_stats() -> Dict[str, Any]:
+    return {
+        **_stats,
+        "workers": len(_workers),
+        "queue_depth": _queue.qsize() if _queue else 0,
+        "queue_size": EVALUATION_QUEUE_SIZE,
+    }
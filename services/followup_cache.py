@@ -0,0 +1,104 @@
+import json
+import os
+import re
+import threading
+from typing import Dict, List, Optional
+
+from models.interview_models import Message
+
+# 질문 뱅크의 질문 -> 미리 생성된 꼬리 질문 후보 목록
+# [{"keywords": ["문맥 교환(Context Switching)", ...], "question": "..."}]
+_followups: Dict[str, List[Dict]] = {}
+_loaded = False
+_load_lock = threading.Lock()
+
+FOLLOWUPS_FILE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'cs_followups.json')
+
+
+def _normalize(text: str) -> str:
+    """
+    띄어쓰기와 대소문자 차이를 무시하고 비교할 수 있도록 텍스트를 정규화합니다.
+    """
+    return re.sub(r'\s+', '', text).lower()
+
+
+def _keyword_variants(keyword: str) -> List[str]:
+    """
+    '경쟁 상태(Race Condition)' 같은 키워드를 ['경쟁상태', 'racecondition']처럼 비교용 표기들로 분리합니다.
+    """
+    variants = [_normalize(part) for part in re.split(r'[()/]', keyword)]
+    return [variant for variant in variants if variant]
+
+
+def load_followups_from_json():
+    """
+    data/cs_followups.json 파일에서 미리 생성된 꼬리 질문을 읽어와 _followups에 저장합니다.
+    파일이 없으면 빈 상태로 두며, 이 경우 모든 꼬리 질문은 Gemini로 생성됩니다.
+    """
+    global _loaded
+    followups = {}
+    try:
+        with open(FOLLOWUPS_FILE_PATH, mode='r', encoding='utf-8') as infile:
+            data = json.load(infile)
+        for question, candidates in data.items():
+            followups[question.strip()] = [
+                {
+                    "question": candidate["question"],
+                    "keywords": candidate.get("keywords", []),
+                    "_variants": [_keyword_variants(keyword) for keyword in candidate.get("keywords", [])]
+                }
+                for candidate in candidates
+                if candidate.get("question")
+            ]
+    except FileNotFoundError:
+        print(f"Info: '{FOLLOWUPS_FILE_PATH}' 파일이 없어 사전 생성 꼬리 질문을 사용하지 않습니다.")
+    except Exception as e:
+        print(f"Error loading precomputed follow-ups: {e}")
+
+    _followups.clear()
+    _followups.update(followups)
+    _loaded = True
+
+
+def ensure_followups_loaded():
+    """
+    사전 생성 꼬리 질문이 아직 로드되지 않았으면 로드합니다. (시작 시 백그라운드 로드보다 요청이 먼저 들어온 경우)
+    """
+    if _loaded:
+        return
+    with _load_lock:
+        if not _loaded:
+            load_followups_from_json()
+
+
+def find_precomputed_followup(conversation: List[Message]) -> Optional[Dict]:
+    """
+    마지막 질문이 질문 뱅크의 질문이면, 지원자의 답변과 키워드가 가장 많이 겹치는 사전 생성 꼬리 질문을 반환합니다.
+
+    Returns:
+        dict: 후보 정보 또는 None
+            - question: 꼬리 질문
+            - score: 후보 키워드 중 답변에 등장한 비율 (0.0 ~ 1.0)
+    """
+    ensure_followups_loaded()
+    if not _followups or len(conversation) < 2 or conversation[-1].role != "user":
+        return None
+
+    last_question = next((msg.content for msg in reversed(conversation) if msg.role == "assistant"), None)
+    candidates = _followups.get(last_question.strip()) if last_question else None
+    if not candidates:
+        return None
+
+    answer = _normalize(conversation[-1].content)
+    best = None
+    for candidate in candidates:
+        variants = candidate["_variants"]
+        if variants:
+            matched = sum(1 for options in variants if any(option in answer for option in options))
+            score = matched / len(variants)
+        else:
+            score = 0.0
+        if best is None or score > best["score"]:
+            best = {"question": candidate["question"], "score": score}
+
+    return best
@@ -1,37 +1,94 @@
 # services/gemini_service.py
 
-import google.generativeai as genai
-from core.config import GEMINI_API_KEY, TAIL_QUESTION_MODEL, EVALUATION_MODEL
+from core.config import (
+    TAIL_QUESTION_MODEL, EVALUATION_MODEL, FOLLOWUP_MATCH_THRESHOLD, FOLLOWUP_FALLBACK_TIMEOUT_S,
+    HEDGE_ENABLED, TAIL_QUESTION_HEDGE_MODEL
+)
+from services.model_backend import get_backend
+from services.hedging import hedged_call, hedge_deadline_s, latency_tracker
+from services.followup_cache import find_precomputed_followup
+from services.initial_questions import get_fallback_question
+from core.deadline import Deadline, DeadlineExceeded
+from core.cache import get_cache, make_key
+from google.api_core import exceptions as google_exceptions
 from models.interview_models import Message, StructuredEvaluationReport, TurnEvaluation
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
+import asyncio
 import json
 import re
 import time
 from markdown_it import MarkdownIt
 
-genai.configure(api_key=GEMINI_API_KEY)
-generation_config = {"temperature": 0.7}
-tail_question_model = genai.GenerativeModel(model_name=TAIL_QUESTION_MODEL, generation_config=generation_config)
-evaluation_model = genai.GenerativeModel(model_name=EVALUATION_MODEL, generation_config=generation_config)
 md_parser = MarkdownIt()
 
+# 모델 백엔드(genai 설정, 모델 객체)와 캐시는 import 시점이 아니라 처음 사용할 때 또는 시작 시 warm_up_models()에서 만듭니다.
+# 같은 대화에 대한 재요청(클라이언트 재시도, 다른 워커로 간 요청)은 모델을 다시 호출하지 않고 공유 캐시에서 반환합니다.
+
+
+async def warm_up_models(open_connection: bool = False):
+    """
+    백엔드와 꼬리 질문/평가 모델 객체를 만들고, 고정 프롬프트의 컨텍스트 캐시 생성을 시작합니다.
+    (요청 처리 중에는 캐시 생성을 기다리지 않으므로 시작 시 미리 만들어 둡니다. 최소 토큰 수보다 짧은 프롬프트는 건너뜀)
+    open_connection이 True면 캐시 생성이 끝날 때까지 기다려 첫 요청 전에 API 연결도 열어 두고, False면 백그라운드로 만듭니다.
+    """
+    backend = await asyncio.to_thread(get_backend)
+    for model_name in {TAIL_QUESTION_MODEL, EVALUATION_MODEL, TAIL_QUESTION_HEDGE_MODEL} - {""}:
+        backend.get_model(model_name)
+    prefixes = {
+        (TAIL_QUESTION_MODEL, TAIL_QUESTION_PROMPT_PREFIX),
+        (TAIL_QUESTION_HEDGE_MODEL or TAIL_QUESTION_MODEL, TAIL_QUESTION_PROMPT_PREFIX),
+        (EVALUATION_MODEL, EVALUATION_PROMPT_PREFIX),
+    }
+    for model_name, static_prefix in prefixes:
+        await backend.prepare_cached_model(model_name, static_prefix, wait=open_connection)
+
 # --- 비동기 성능 측정 헬퍼 함수 ---
-async def _generate_content_with_performance_metrics(model, prompt: str) -> Tuple[str, Dict[str, Any]]:
+async def _next_chunk(iterator):
+    try:
+        return await iterator.__anext__()
+    except StopAsyncIteration:
+        return None
+
+async def _open_stream(model, prompt: str, model_name: str = "") -> Dict[str, Any]:
     """
-    비동기 스트리밍 API 호출을 통해 응답을 생성하고, TTFT와 TPS와 같은 성능 지표를 측정합니다.
+    스트리밍 요청을 시작하고 첫 청크가 도착할 때까지만 기다립니다.
+    헤징 시 '첫 청크 도착'으로 승패를 가리기 위해 나머지 수신(_finish_stream)과 분리되어 있습니다.
     """
     start_time = time.time()
-    
     stream = await model.generate_content_async(prompt, stream=True)
-    
+    iterator = stream.__aiter__()
+
+    first_text = ""
     first_chunk_time = None
-    full_response_text = ""
-    
-    async for chunk in stream:
+    while (chunk := await _next_chunk(iterator)) is not None:
         if chunk.text:
-            if first_chunk_time is None:
-                first_chunk_time = time.time()
-            full_response_text += chunk.text
+            first_text = chunk.text
+            first_chunk_time = time.time()
+            break
+
+    return {
+        "model": model,
+        "model_name": model_name,
+        "iterator": iterator,
+        "start_time": start_time,
+        "first_chunk_time": first_chunk_time,
+        "text": first_text,
+    }
+
+async def _finish_stream(started: Dict[str, Any], request_start_time: float = None) -> Tuple[str, Dict[str, Any]]:
+    """
+    _open_stream으로 시작한 스트림의 나머지를 수신하고, TTFT와 TPS와 같은 성능 지표를 측정합니다.
+    request_start_time이 주어지면(헤징 등) 실제 요청 시작 시점 기준으로 TTFT를 계산합니다.
+    """
+    model = started["model"]
+    start_time = request_start_time or started["start_time"]
+    first_chunk_time = started["first_chunk_time"]
+    full_response_text = started["text"]
+
+    if first_chunk_time is not None:
+        while (chunk := await _next_chunk(started["iterator"])) is not None:
+            if chunk.text:
+                full_response_text += chunk.text
 
     end_time = time.time()
 
@@ -59,6 +116,79 @@ async def _generate_content_with_performance_metrics(model, prompt: str) -> Tupl
     
     return full_response_text, performance
 
+async def _generate_content_with_performance_metrics(model, prompt: str) -> Tuple[str, Dict[str, Any]]:
+    """
+    비동기 스트리밍 API 호출을 통해 응답을 생성하고, TTFT와 TPS와 같은 성능 지표를 측정합니다.
+    """
+    return await _finish_stream(await _open_stream(model, prompt))
+
+async def _resolve_static_prefix_model(model_name: str, static_prefix: str, dynamic_suffix: str) -> Tuple[Any, str, bool]:
+    """
+    고정 프롬프트가 컨텍스트 캐시에 올라가 있으면 (캐시된 모델, 면접별 내용, True)를,
+    캐시를 쓸 수 없으면 (일반 모델, 전체 프롬프트, False)를 반환합니다.
+    """
+    backend = get_backend()
+    cached_model = await backend.get_cached_model(model_name, static_prefix)
+    if cached_model is not None:
+        return cached_model, dynamic_suffix, True
+    return backend.get_model(model_name), static_prefix + dynamic_suffix, False
+
+async def _open_resolved(
+    model_name: str, static_prefix: str, dynamic_suffix: str, resolved: Tuple[Any, str, bool]
+) -> Dict[str, Any]:
+    model, prompt, cached = resolved
+    if cached:
+        try:
+            return await _open_stream(model, prompt, model_name)
+        except google_exceptions.NotFound as e:
+            # 서버 측에서 캐시가 만료/삭제된 경우: 캐시 항목을 버리고 전체 프롬프트로 다시 요청합니다.
+            print(f"[PromptCache] 캐시를 찾을 수 없어 전체 프롬프트로 재요청합니다 ({model_name}): {e}")
+            get_backend().prefix_cache.invalidate(model_name, static_prefix)
+            model, prompt = get_backend().get_model(model_name), static_prefix + dynamic_suffix
+    return await _open_stream(model, prompt, model_name)
+
+async def _open_with_static_prefix(model_name: str, static_prefix: str, dynamic_suffix: str) -> Dict[str, Any]:
+    """
+    고정 프롬프트가 컨텍스트 캐시에 올라가 있으면 면접별 내용만 전송하고,
+    캐시를 쓸 수 없으면 전체 프롬프트를 전송하여 스트림을 시작합니다.
+    """
+    resolved = await _resolve_static_prefix_model(model_name, static_prefix, dynamic_suffix)
+    return await _open_resolved(model_name, static_prefix, dynamic_suffix, resolved)
+
+async def _generate_with_static_prefix(
+    model_name: str,
+    static_prefix: str,
+    dynamic_suffix: str,
+    hedge_model_name: Optional[str] = None
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    고정 프롬프트 캐시를 활용해 응답을 생성합니다.
+    hedge_model_name이 주어지면 첫 청크가 헤징 대기 시간 안에 오지 않을 때 같은(또는 대체) 모델로 두 번째 요청을 보내고,
+    먼저 첫 청크를 받은 스트림을 사용합니다. (나머지 요청은 취소)
+    """
+    request_start_time = time.time()
+
+    if HEDGE_ENABLED and hedge_model_name:
+        # 캐시 조회는 모델 지연과 무관하므로, 헤징 대기 시간은 기본 요청을 보내는 시점부터 잽니다.
+        resolved = await _resolve_static_prefix_model(model_name, static_prefix, dynamic_suffix)
+        label, started = await hedged_call(
+            lambda: _open_resolved(model_name, static_prefix, dynamic_suffix, resolved),
+            lambda: _open_with_static_prefix(hedge_model_name, static_prefix, dynamic_suffix),
+            hedge_deadline_s(model_name),
+            # 헤지가 이겨 취소된 기본 요청의 TTFT는 적어도 취소 시점까지 기다린 시간이므로 하한값으로 기록합니다.
+            # 기록하지 않으면 느린 요청만 표본에서 빠져 백분위수와 헤징 대기 시간이 점점 줄어듭니다.
+            on_primary_cancelled=lambda elapsed_s: latency_tracker.record(model_name, elapsed_s * 1000)
+        )
+    else:
+        label, started = "primary", await _open_with_static_prefix(model_name, static_prefix, dynamic_suffix)
+
+    # 헤징 대기 시간은 기본 요청의 지연으로 정하므로, 기본 요청이 첫 청크를 받았을 때만 실제 TTFT를 기록합니다.
+    # (경주에서 이긴 헤지 요청의 TTFT는 빠른 쪽으로 치우쳐 있어 기록하지 않음)
+    if label == "primary" and started["first_chunk_time"]:
+        latency_tracker.record(model_name, (started["first_chunk_time"] - started["start_time"]) * 1000)
+
+    return await _finish_stream(started, request_start_time)
+
 def _strip_markdown(text: str) -> str:
     """
     Markdown 텍스트를 렌더링한 후 HTML 태그를 제거하여 순수 텍스트만 반환합니다.
@@ -67,39 +197,85 @@ def _strip_markdown(text: str) -> str:
     plain_text = re.sub('<[^<]+?>', '', html)
     return re.sub(r'\n{2,}', '\n', plain_text).strip()
 
-async def generate_tail_question(conversation: List[Message]) -> Dict[str, Any]:
-    """
-    이전 대화 내용을 바탕으로 다음 꼬리 질문을 비동기로 생성하고 성능을 측정합니다.
-    """
-    prompt = """
+# 꼬리 질문 프롬프트의 고정 지시문 (컨텍스트 캐시 대상)
+TAIL_QUESTION_PROMPT_PREFIX = """
     당신은 IT 기업의 숙련된 기술 면접관입니다.
     아래 대화는 지원자와의 CS 기술 면접 내용입니다.
     지원자의 마지막 답변을 바탕으로, 그의 지식을 더 깊게 파고들 수 있는 날카로운 꼬리 질문을 '한글로' 그리고 '하나만' 생성해 주세요.
     질문은 간결하고 명확해야 합니다. 다른 부가적인 설명 없이 질문 내용만 반환해주세요.
+"""
 
+def _format_tail_question_suffix(conversation: List[Message]) -> str:
+    """
+    꼬리 질문 프롬프트 중 면접마다 달라지는 대화 내용 부분을 만듭니다.
+    """
+    return """
     [대화 내용]
     {chat_history}
     """.format(chat_history="\n".join([f"{msg.role}: {msg.content}" for msg in conversation]))
 
-    response_text, performance = await _generate_content_with_performance_metrics(tail_question_model, prompt)
+def _format_for_tail_question(conversation: List[Message]) -> str:
+    """
+    대화 기록을 기반으로 꼬리 질문 생성 프롬프트 전체(고정 지시문 + 대화 내용)를 만듭니다.
+    """
+    return TAIL_QUESTION_PROMPT_PREFIX + _format_tail_question_suffix(conversation)
+
+async def generate_tail_question(conversation: List[Message], deadline: Optional[Deadline] = None) -> Dict[str, Any]:
+    """
+    이전 대화 내용을 바탕으로 다음 꼬리 질문을 비동기로 생성하고 성능을 측정합니다.
+    deadline 안에 생성하지 못하면 사전 생성 질문 또는 질문 뱅크의 질문으로 대체합니다.
+    """
+    precomputed = find_precomputed_followup(conversation)
+    if precomputed and precomputed["score"] >= FOLLOWUP_MATCH_THRESHOLD:
+        return {"response": precomputed["question"], "performance": _precomputed_performance(precomputed["question"])}
+
+    cache_key = make_key(TAIL_QUESTION_MODEL, TAIL_QUESTION_PROMPT_PREFIX, _format_tail_question_suffix(conversation))
+    cached = await get_cache("tail_question").aget(cache_key)
+    if cached:
+        return {"response": cached, "performance": _precomputed_performance(cached)}
+
+    timeout = deadline.remaining() if deadline else None
+    if precomputed:
+        # 대체할 후보가 있으면 Gemini가 느리거나 실패할 때 사전 생성 질문을 반환합니다.
+        timeout = min(timeout, FOLLOWUP_FALLBACK_TIMEOUT_S) if timeout is not None else FOLLOWUP_FALLBACK_TIMEOUT_S
+
+    generation = _generate_with_static_prefix(
+        TAIL_QUESTION_MODEL, TAIL_QUESTION_PROMPT_PREFIX, _format_tail_question_suffix(conversation),
+        hedge_model_name=TAIL_QUESTION_HEDGE_MODEL
+    )
+    try:
+        response_text, performance = await asyncio.wait_for(generation, timeout=timeout)
+    except Exception as e:
+        if precomputed:
+            print(f"[Fallback] 꼬리 질문 생성 실패로 사전 생성 질문을 사용합니다: {type(e).__name__} {e}")
+            return {"response": precomputed["question"], "performance": _precomputed_performance(precomputed["question"])}
+
+        fallback = get_fallback_question([msg.content for msg in conversation if msg.role == "assistant"])
+        if isinstance(e, asyncio.TimeoutError) and fallback:
+            print("[Fallback] 꼬리 질문 생성이 제한 시간을 넘겨 질문 뱅크의 질문을 사용합니다.")
+            return {"response": fallback, "performance": _precomputed_performance(fallback)}
+        if isinstance(e, asyncio.TimeoutError):
+            raise DeadlineExceeded("꼬리 질문 생성 제한 시간을 초과했습니다.") from e
+        raise
+
     cleaned_response = _strip_markdown(response_text)
+    await get_cache("tail_question").aset(cache_key, cleaned_response)
     return {"response": cleaned_response, "performance": performance}
 
-def _format_for_evaluation(conversation: List[Message]) -> str:
+def _precomputed_performance(text: str) -> Dict[str, Any]:
     """
-    대화 기록을 기반으로 평가 프롬프트를 생성합니다.
-    (수정사항) 점수 산정의 객관성을 높이기 위해 '채점 기준표(Rubric)'를 프롬프트에 포함시켰습니다.
+    사전 생성 질문이나 캐시된 질문을 반환할 때 사용하는 성능 지표입니다. (모델 호출이 없으므로 생성 시간은 0)
     """
-    interview_record = ""
-    dialogue = [msg for msg in conversation if msg.role in ["assistant", "user"]]
-    turn = 1
-    for i in range(0, len(dialogue), 2):
-        if i + 1 < len(dialogue):
-            question, answer = dialogue[i].content, dialogue[i+1].content
-            interview_record += f"### 턴 {turn}\n**[질문]**\n{question}\n\n**[답변]**\n{answer}\n---\n\n"
-            turn += 1
+    return {
+        "time_to_first_token_ms": 0.0,
+        "total_generation_time_s": 0.0,
+        "tokens_per_second": 0.0,
+        "total_tokens": len(text) // 2
+    }
 
-    return f"""
+# 평가 프롬프트의 고정 부분: 채점 기준표, 키워드 추출 규칙, 출력 형식 (컨텍스트 캐시 대상)
+# 면접 기록은 캐시할 수 있도록 이 뒤에 붙입니다.
+EVALUATION_PROMPT_PREFIX = """
     당신은 구글, 아마존 수준의 기준을 가진 엄격한 'AI 기술 면접관'입니다.
     당신은 매우 깐깐하고 비판적인 시니어 엔지니어입니다. 지원자의 답변이 완벽하지 않다면 80점 이상을 쉽게 주지 마십시오.
     지원자의 답변을 분석하여 평가 리포트를 작성해야 합니다.
@@ -128,12 +304,9 @@ def _format_for_evaluation(conversation: List[Message]) -> str:
        - 10점: 두괄식으로 명확하고 간결하게 답변함.
        - 5점: 답변이 장황하거나 핵심을 비껴감.
 
-    ---
-    # [면접 기록]
-    {interview_record}
     ---
     # [지시사항]
-    위 [채점 기준표]를 적용하여 각 턴의 점수를 계산하고, 이를 종합하여 아래 형식으로 출력하십시오.
+    프롬프트 마지막의 [면접 기록]에 위 [채점 기준표]를 적용하여 각 턴의 점수를 계산하고, 이를 종합하여 아래 형식으로 출력하십시오.
     
     ## 중요: [개선 키워드] 추출 규칙 (검색 연동용)
     이 키워드들은 버튼으로 만들어져, 클릭 시 **'구글 검색'이나 '기술 블로그'로 바로 연결**됩니다.
@@ -163,7 +336,35 @@ def _format_for_evaluation(conversation: List[Message]) -> str:
     **- 피드백:** (어떤 항목에서 감점되었는지 구체적으로 언급. 예: "정확성은 좋았으나, 내부 원리 설명이 부족하여 '깊이' 항목에서 감점되었습니다.")
 
     (이후 턴 계속...)
+"""
+
+def _format_evaluation_suffix(conversation: List[Message]) -> str:
+    """
+    평가 프롬프트 중 면접마다 달라지는 면접 기록 부분을 만듭니다.
     """
+    interview_record = ""
+    dialogue = [msg for msg in conversation if msg.role in ["assistant", "user"]]
+    turn = 1
+    for i in range(0, len(dialogue), 2):
+        if i + 1 < len(dialogue):
+            question, answer = dialogue[i].content, dialogue[i+1].content
+            interview_record += f"### 턴 {turn}\n**[질문]**\n{question}\n\n**[답변]**\n{answer}\n---\n\n"
+            turn += 1
+
+    return f"""
+    ---
+    # [면접 기록]
+    {interview_record}
+    ---
+    위 [면접 기록]을 평가하여 [출력 형식]에 맞춰 리포트를 작성하십시오.
+    """
+
+def _format_for_evaluation(conversation: List[Message]) -> str:
+    """
+    대화 기록을 기반으로 평가 프롬프트 전체(고정 채점 기준 + 면접 기록)를 생성합니다.
+    (수정사항) 점수 산정의 객관성을 높이기 위해 '채점 기준표(Rubric)'를 프롬프트에 포함시켰습니다.
+    """
+    return EVALUATION_PROMPT_PREFIX + _format_evaluation_suffix(conversation)
 
 def _parse_structured_evaluation_report(report_text: str) -> StructuredEvaluationReport:
     """
@@ -246,14 +447,34 @@ def _parse_structured_evaluation_report(report_text: str) -> StructuredEvaluatio
             turn_evaluations=[]
         )
 
-async def evaluate_conversation(conversation: List[Message]) -> Dict[str, Any]:
+def is_incomplete_report(report: StructuredEvaluationReport) -> bool:
+    """
+    파싱에 실패해 질문별 평가가 없는 리포트(파싱 실패 시 반환하는 대체 리포트 포함)인지 반환합니다.
+    재시도하면 달라질 수 있으므로 캐시하거나 완료된 평가로 저장하지 않습니다.
+    """
+    return not report.turn_evaluations
+
+async def evaluate_conversation(conversation: List[Message], deadline: Optional[Deadline] = None) -> Dict[str, Any]:
     """
     전체 대화 내용을 바탕으로 면접을 평가합니다.
     LLM이 생성한 요약 질문 대신, 대화 기록(conversation)에 있는 '원본 질문'을 사용하여
     리포트의 정확성을 보장합니다.
+    deadline 안에 평가를 마치지 못하면 DeadlineExceeded를 발생시킵니다.
     """
-    prompt = _format_for_evaluation(conversation)
-    markdown_response, performance = await _generate_content_with_performance_metrics(evaluation_model, prompt)
+    evaluation_suffix = _format_evaluation_suffix(conversation)
+    # 평가 기준(프롬프트)을 바꾸면 이전 평가를 재사용하지 않도록 고정 프롬프트도 키에 포함합니다.
+    cache_key = make_key(EVALUATION_MODEL, EVALUATION_PROMPT_PREFIX, evaluation_suffix)
+    cached = await get_cache("evaluation").aget(cache_key)
+    if cached:
+        return {"evaluation_report": StructuredEvaluationReport(**cached)}
+
+    generation = _generate_with_static_prefix(
+        EVALUATION_MODEL, EVALUATION_PROMPT_PREFIX, evaluation_suffix
+    )
+    try:
+        markdown_response, performance = await asyncio.wait_for(generation, timeout=deadline.remaining() if deadline else None)
+    except asyncio.TimeoutError as e:
+        raise DeadlineExceeded("면접 평가 제한 시간을 초과했습니다.") from e
     
     structured_report = _parse_structured_evaluation_report(markdown_response.strip())
 
@@ -269,6 +490,9 @@ async def evaluate_conversation(conversation: List[Message]) -> Dict[str, Any]:
             # LLM이 요약한 question을 버리고, 원본 텍스트로 덮어쓰기
             turn_eval.question = assistant_questions[i]
 
+    # 파싱에 실패한 리포트는 재시도하면 달라질 수 있으므로 캐시하지 않습니다.
+    if not is_incomplete_report(structured_report):
+        await get_cache("evaluation").aset(cache_key, structured_report.model_dump())
     return {
         "evaluation_report": structured_report,
         # "performance": performance 
@@ -0,0 +1,122 @@
+# services/hedging.py
+
+import asyncio
+import math
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from core.config import HEDGE_DEADLINE_MS, HEDGE_MIN_DEADLINE_MS, HEDGE_PERCENTILE, HEDGE_MIN_SAMPLES, HEDGE_WINDOW_SIZE
+
+
+class LatencyTracker:
+    """
+    모델별 최근 TTFT(ms) 표본을 고정 크기 창으로 보관하고 백분위수를 계산합니다.
+    """
+
+    def __init__(self, window_size: int = HEDGE_WINDOW_SIZE):
+        self.window_size = window_size
+        self._samples: Dict[str, Deque[float]] = {}
+
+    def record(self, model_name: str, ttft_ms: float):
+        self._samples.setdefault(model_name, deque(maxlen=self.window_size)).append(ttft_ms)
+
+    def percentile(self, model_name: str, pct: float) -> float:
+        samples = sorted(self._samples.get(model_name, ()))
+        if not samples:
+            return 0.0
+        rank = max(math.ceil(pct / 100 * len(samples)), 1)
+        return samples[min(rank, len(samples)) - 1]
+
+    def sample_count(self, model_name: str) -> int:
+        return len(self._samples.get(model_name, ()))
+
+
+latency_tracker = LatencyTracker()
+
+_stats = {
+    "requests": 0,
+    "hedged": 0,
+    "primary_wins": 0,
+    "hedge_wins": 0,
+    "failures": 0,
+}
+
+
+def hedge_deadline_s(model_name: str) -> float:
+    """
+    두 번째 요청을 보내기 전까지 첫 청크를 기다릴 시간(초)을 반환합니다.
+    표본이 충분하면 최근 TTFT의 HEDGE_PERCENTILE 백분위수(최소 HEDGE_MIN_DEADLINE_MS),
+    부족하면 고정값 HEDGE_DEADLINE_MS를 사용합니다.
+    """
+    if latency_tracker.sample_count(model_name) < HEDGE_MIN_SAMPLES:
+        return HEDGE_DEADLINE_MS / 1000
+    return max(latency_tracker.percentile(model_name, HEDGE_PERCENTILE), HEDGE_MIN_DEADLINE_MS) / 1000
+
+
+async def hedged_call(
+    primary: Callable[[], Awaitable[Any]],
+    hedge: Callable[[], Awaitable[Any]],
+    deadline_s: float,
+    on_primary_cancelled: Optional[Callable[[float], None]] = None
+) -> Tuple[str, Any]:
+    """
+    primary를 먼저 시작하고, deadline_s 안에 끝나지 않거나 그 전에 실패하면 hedge를 추가로 시작합니다.
+    먼저 성공한 쪽의 결과를 ("primary" | "hedge", 결과)로 반환하고 나머지 요청은 취소합니다.
+    둘 다 실패하면 primary의 예외를 다시 발생시킵니다.
+
+    on_primary_cancelled가 주어지면, 아직 응답하지 않은 primary를 취소할 때 그때까지 기다린 시간(초)을 넘깁니다.
+    (primary의 실제 지연은 이보다 길므로 하한값으로 기록하는 데 사용합니다)
+    """
+    _stats["requests"] += 1
+    primary_started = time.monotonic()
+    tasks = {asyncio.ensure_future(primary()): "primary"}
+    try:
+        done, _ = await asyncio.wait(tasks.keys(), timeout=deadline_s)
+        primary_task = next(iter(tasks))
+        if done and primary_task.exception() is None:
+            _stats["primary_wins"] += 1
+            return "primary", primary_task.result()
+
+        _stats["hedged"] += 1
+        tasks[asyncio.ensure_future(hedge())] = "hedge"
+
+        pending = set(tasks.keys()) - done
+        errors = {tasks[task]: task.exception() for task in done}
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    label = tasks[task]
+                    _stats["primary_wins" if label == "primary" else "hedge_wins"] += 1
+                    if label == "hedge" and on_primary_cancelled and "primary" not in errors:
+                        on_primary_cancelled(time.monotonic() - primary_started)
+                    return label, task.result()
+                errors[tasks[task]] = task.exception()
+
+        _stats["failures"] += 1
+        raise errors.get("primary") or errors["hedge"]
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
+def get_hedge_stats() -> Dict[str, Any]:
+    """
+    헤징 발생률과 승리 통계, 모델별 최근 TTFT 백분위수를 반환합니다.
+    """
+    requests = _stats["requests"]
+    return {
+        **_stats,
+        "hedge_rate": round(_stats["hedged"] / requests, 4) if requests else 0.0,
+        "ttft_ms": {
+            model_name: {
+                "samples": latency_tracker.sample_count(model_name),
+                "p50": round(latency_tracker.percentile(model_name, 50), 2),
+                f"p{HEDGE_PERCENTILE:g}": round(latency_tracker.percentile(model_name, HEDGE_PERCENTILE), 2),
+                "hedge_deadline_ms": round(hedge_deadline_s(model_name) * 1000, 2),
+            }
+            for model_name in latency_tracker._samples
+        },
+    }
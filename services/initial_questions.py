@@ -1,38 +1,89 @@
 import csv
 import random
 import os
+import threading
+from typing import Callable, Dict, List, Optional
 
 _questions = []
+_loaded = False
+_load_lock = threading.Lock()
+_listeners: List[Callable[[List[Dict]], None]] = []
 
-def load_questions_from_csv():
+def read_questions_csv() -> List[Dict]:
     """
-    프로젝트의 data/cs_questions.csv 파일에서 질문을 읽어와 _questions 리스트에 저장합니다.
-    서버 시작 시 자동으로 한 번만 호출됩니다.
+    프로젝트의 data/cs_questions.csv 파일에서 질문 목록을 읽어 반환합니다. (질문 뱅크와 리스너에는 반영하지 않음)
+    파일이 없거나 비어 있으면 안내 문구를 담은 'N/A' 카테고리 질문 하나를 반환합니다.
     """
     file_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'cs_questions.csv')
 
+    questions = []
     try:
         with open(file_path, mode='r', encoding='utf-8') as infile:
             reader = csv.DictReader(infile)
             for row in reader:
                 if 'category' in row and 'question' in row:
-                    _questions.append({'category': row['category'], 'question': row['question']})
-        if not _questions:
+                    questions.append({'category': row['category'], 'question': row['question']})
+        if not questions:
             print(f"Warning: '{file_path}' 파일이 비어있거나 'category', 'question' 컬럼을 포함하고 있지 않습니다.")
-            _questions.append({'category': 'N/A', 'question': "등록된 질문이 없습니다. data/cs_questions.csv 파일을 확인해주세요."})
+            questions.append({'category': 'N/A', 'question': "등록된 질문이 없습니다. data/cs_questions.csv 파일을 확인해주세요."})
 
     except FileNotFoundError:
         print(f"Error: '{file_path}' 파일을 찾을 수 없습니다. 질문 기능을 사용할 수 없습니다.")
-        _questions.append({'category': 'N/A', 'question': "질문 파일을 찾을 수 없습니다. 관리자에게 문의하세요."})
+        questions.append({'category': 'N/A', 'question': "질문 파일을 찾을 수 없습니다. 관리자에게 문의하세요."})
     except Exception as e:
         print(f"Error loading questions from CSV: {e}")
-        _questions.append({'category': 'N/A', 'question': "질문을 불러오는 중 오류가 발생했습니다."})
+        questions.append({'category': 'N/A', 'question': "질문을 불러오는 중 오류가 발생했습니다."})
+
+    return questions
+
+
+def load_questions_from_csv():
+    """
+    프로젝트의 data/cs_questions.csv 파일에서 질문을 읽어와 _questions 리스트에 저장합니다.
+    서버 시작 시 lifespan에서 백그라운드로 호출됩니다.
+    """
+    global _loaded
+    # 읽는 도중의 목록이 다른 요청에 보이지 않도록 새 목록을 만든 뒤 한 번에 교체합니다.
+    questions = read_questions_csv()
+    _questions[:] = questions
+    _loaded = True
+    for listener in _listeners:
+        try:
+            listener(_questions)
+        except Exception as e:
+            print(f"Error notifying question bank listener: {e}")
+
+
+def add_questions_listener(listener: Callable[[List[Dict]], None]):
+    """
+    질문 목록을 (다시) 불러올 때마다 호출할 함수를 등록합니다. (검색 색인 갱신 등)
+    이미 불러온 상태라면 등록 즉시 한 번 호출합니다.
+    """
+    _listeners.append(listener)
+    if _loaded:
+        listener(_questions)
+
+
+def ensure_questions_loaded():
+    """
+    질문 목록이 아직 로드되지 않았으면 로드합니다. (시작 시 백그라운드 로드보다 요청이 먼저 들어온 경우)
+    """
+    if _loaded:
+        return
+    with _load_lock:
+        if not _loaded:
+            load_questions_from_csv()
+
+
+def is_questions_loaded() -> bool:
+    return _loaded
 
 
 def get_random_question(interviewType: str) -> str:
     """
     메모리에 로드된 질문 목록(_questions)에서 주어진 interviewType에 맞는 질문을 무작위로 선택하여 반환합니다.
     """
+    ensure_questions_loaded()
     if not _questions:
         return "선택할 수 있는 질문이 없습니다."
 
@@ -49,4 +100,15 @@ def get_random_question(interviewType: str) -> str:
 
     return "선택할 수 있는 질문이 없습니다."
 
-load_questions_from_csv()
\ No newline at end of file
+def get_fallback_question(asked_questions: List[str]) -> Optional[str]:
+    """
+    꼬리 질문을 제한 시간 안에 만들지 못했을 때 대신 사용할 질문을 반환합니다.
+    첫 질문과 같은 카테고리에서 아직 묻지 않은 질문을 무작위로 선택합니다.
+    """
+    ensure_questions_loaded()
+    asked = {question.strip() for question in asked_questions}
+    first_question = asked_questions[0].strip() if asked_questions else None
+    category = next((q['category'] for q in _questions if q['question'].strip() == first_question), None)
+
+    candidates = [q['question'] for q in _questions if q['category'] == category and q['question'].strip() not in asked]
+    return random.choice(candidates) if candidates else None
@@ -0,0 +1,383 @@
+# services/model_backend.py
+
+import asyncio
+import datetime
+import hashlib
+import random
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import google.generativeai as genai
+from google.api_core import exceptions as google_exceptions
+
+from core.config import (
+    GEMINI_API_KEY, MODEL_BACKEND,
+    FAKE_TTFT_MS, FAKE_CHUNK_DELAY_MS, FAKE_TOKENS_PER_SECOND, FAKE_CHUNK_TOKENS,
+    FAKE_ERROR_RATE, FAKE_RATE_LIMIT_RATE, FAKE_CACHE_CREATE_MS, FAKE_CACHED_TTFT_RATIO,
+    PROMPT_CACHE_ENABLED, PROMPT_CACHE_TTL_S, PROMPT_CACHE_REFRESH_MARGIN_S, PROMPT_CACHE_RETRY_AFTER_S,
+    PROMPT_CACHE_MIN_TOKENS
+)
+
+generation_config = {"temperature": 0.7}
+
+FAKE_TAIL_QUESTIONS = [
+    "그렇다면 컨텍스트 스위칭 과정에서 프로세스와 스레드의 비용 차이는 구체적으로 어디에서 발생하나요?",
+    "말씀하신 방식에서 교착 상태(Deadlock)가 발생할 수 있는 조건과 이를 예방하는 방법을 설명해주세요.",
+    "해당 개념이 실제 서비스에서 성능 병목이 되었던 사례를 가정하고, 어떻게 개선할 수 있을지 설명해주세요.",
+    "그 동작을 캐시 관점에서 보면 어떤 트레이드오프가 있는지 설명해주세요.",
+]
+
+FAKE_KEYWORDS = ["임계 구역(Critical Section)", "스핀락(Spinlock)", "모니터(Monitor)", "MVCC", "가상 메모리 페이징"]
+
+
+class _FakeChunk:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _FakeTokenCount:
+    def __init__(self, total_tokens: int):
+        self.total_tokens = total_tokens
+
+
+class _FakeCachedContent:
+    def __init__(self, model_name: str, prefix: str, ttl_s: int):
+        self.model_name = model_name
+        self.prefix = prefix
+        self.expire_time = time.time() + ttl_s
+
+
+class FakeGenerativeModel:
+    """
+    genai.GenerativeModel과 같은 인터페이스로 미리 정해진 응답을 스트리밍하는 로컬 대체 모델입니다.
+    TTFT, 청크 간 지연, 토큰 생성 속도, 오류/429 발생 비율을 환경 변수로 조절합니다.
+    cached_content가 주어지면 컨텍스트 캐시를 사용하는 모델처럼 TTFT가 FAKE_CACHED_TTFT_RATIO만큼 줄어듭니다.
+    """
+
+    def __init__(self, model_name: str, cached_content: Optional[_FakeCachedContent] = None):
+        self.model_name = model_name
+        self.cached_content = cached_content
+
+    async def generate_content_async(self, prompt: str, stream: bool = False):
+        if self.cached_content:
+            if time.time() >= self.cached_content.expire_time:
+                raise google_exceptions.NotFound("fake backend: cached content expired")
+            prompt = self.cached_content.prefix + prompt
+
+        roll = random.random()
+        if roll < FAKE_RATE_LIMIT_RATE:
+            raise google_exceptions.ResourceExhausted("fake backend: 429 Resource has been exhausted")
+        if roll < FAKE_RATE_LIMIT_RATE + FAKE_ERROR_RATE:
+            raise google_exceptions.InternalServerError("fake backend: 500 injected error")
+
+        text = _render_fake_response(prompt)
+        return self._stream(text)
+
+    async def _stream(self, text: str):
+        ttft_ms = FAKE_TTFT_MS * (FAKE_CACHED_TTFT_RATIO if self.cached_content else 1.0)
+        await asyncio.sleep(ttft_ms / 1000)
+
+        # 기존 토큰 수 추정 방식(len // 2)과 맞추기 위해 2글자를 1토큰으로 간주합니다.
+        chunk_chars = max(FAKE_CHUNK_TOKENS * 2, 1)
+        per_chunk_delay = max(FAKE_CHUNK_DELAY_MS / 1000, FAKE_CHUNK_TOKENS / FAKE_TOKENS_PER_SECOND if FAKE_TOKENS_PER_SECOND > 0 else 0)
+
+        for i in range(0, len(text), chunk_chars):
+            if i > 0:
+                await asyncio.sleep(per_chunk_delay)
+            yield _FakeChunk(text[i:i + chunk_chars])
+
+    async def count_tokens_async(self, text: str) -> _FakeTokenCount:
+        return _FakeTokenCount(len(text) // 2)
+
+
+def _render_fake_response(prompt: str) -> str:
+    """
+    프롬프트 종류(꼬리 질문 / 종합 평가)에 맞춰 파싱 가능한 응답을 만들어 반환합니다.
+    """
+    if "[면접 기록]" not in prompt:
+        return random.choice(FAKE_TAIL_QUESTIONS)
+
+    turn_count = max(len(re.findall(r"### 턴 \d+\n", prompt)), 1)
+    scores = [random.randint(50, 95) for _ in range(turn_count)]
+    keywords = random.sample(FAKE_KEYWORDS, 3)
+
+    report = "# 최종 종합 평가\n"
+    report += f"**- 종합 점수:** {sum(scores) // len(scores)}\n"
+    report += "**- 종합 피드백:** 핵심 개념은 정확하게 이해하고 있으나, 내부 동작 원리에 대한 설명이 부족합니다. 실제 적용 사례를 함께 언급하면 좋겠습니다.\n"
+    report += "**- 개선 키워드:**\n"
+    report += "".join(f"    - {keyword}\n" for keyword in keywords)
+    report += "\n---\n## 질문별 상세 평가\n"
+    for i, score in enumerate(scores, 1):
+        report += f"### 턴 {i}: 질문 요약 {i}\n"
+        report += f"**- 점수:** {score}\n"
+        report += "**- 피드백:** 정확성은 좋았으나, 내부 원리 설명이 부족하여 '깊이' 항목에서 감점되었습니다.\n\n"
+    return report
+
+
+class PrefixCacheManager:
+    """
+    (모델 이름, 고정 프롬프트) 단위로 컨텍스트 캐시의 생성, TTL 연장, 재생성을 관리합니다.
+    모델 이름이 바뀌면 다른 키가 되므로 새 캐시가 만들어지고, 이전 캐시는 더 이상 연장되지 않아 TTL 후 만료됩니다.
+    실제 캐시 생성/연장/삭제와 토큰 수 계산은 백엔드가 넘겨준 동기 함수로 수행하며, 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+
+    캐시 생성/연장은 시작 시 warm-up에서 수행하고, 요청 처리 중에는 기다리지 않고 백그라운드 작업으로 넘깁니다.
+    고정 프롬프트가 모델의 컨텍스트 캐시 최소 토큰 수(PROMPT_CACHE_MIN_TOKENS)보다 짧으면 생성을 시도하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        create_fn: Callable[[str, str, int], Tuple[Any, Any]],
+        refresh_fn: Callable[[Any, int], None],
+        delete_fn: Callable[[Any], None],
+        count_fn: Callable[[str, str], int],
+        min_tokens: int = PROMPT_CACHE_MIN_TOKENS
+    ):
+        self._create_fn = create_fn
+        self._refresh_fn = refresh_fn
+        self._delete_fn = delete_fn
+        self._count_fn = count_fn
+        self.min_tokens = min_tokens
+        self._entries: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._retry_after: Dict[Tuple[str, str], float] = {}
+        self._token_counts: Dict[Tuple[str, str], int] = {}
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+        self._tasks: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.stats = {"hits": 0, "creates": 0, "refreshes": 0, "failures": 0, "invalidations": 0, "too_short": 0}
+
+    @staticmethod
+    def _key(model_name: str, static_prefix: str) -> Tuple[str, str]:
+        return model_name, hashlib.sha256(static_prefix.encode('utf-8')).hexdigest()
+
+    def _too_short(self, key: Tuple[str, str]) -> bool:
+        token_count = self._token_counts.get(key)
+        return token_count is not None and token_count < self.min_tokens
+
+    async def get_model(self, model_name: str, static_prefix: str):
+        """
+        요청 처리 중에 고정 프롬프트가 캐시된 모델을 반환합니다. 지금 쓸 수 있는 캐시가 없으면 None을 반환하며,
+        캐시가 없거나 곧 만료되면 생성/연장을 백그라운드로 예약하고 기다리지 않습니다.
+        """
+        key = self._key(model_name, static_prefix)
+        entry = self._entries.get(key)
+        now = time.time()
+        if entry and now < entry["expire_at"]:
+            if now >= entry["expire_at"] - PROMPT_CACHE_REFRESH_MARGIN_S:
+                self.schedule(model_name, static_prefix)
+            self.stats["hits"] += 1
+            return entry["model"]
+
+        self.schedule(model_name, static_prefix)
+        return None
+
+    def schedule(self, model_name: str, static_prefix: str):
+        """
+        ensure()를 백그라운드 작업으로 실행합니다. 이미 실행 중이거나, 짧아서 캐시할 수 없거나, 생성 실패 후 대기 중이면 무시합니다.
+        """
+        key = self._key(model_name, static_prefix)
+        if self._too_short(key) or time.time() < self._retry_after.get(key, 0):
+            return
+        task = self._tasks.get(key)
+        if task is None or task.done():
+            self._tasks[key] = asyncio.create_task(self.ensure(model_name, static_prefix))
+
+    async def ensure(self, model_name: str, static_prefix: str):
+        """
+        캐시를 만들거나 TTL을 연장하고 캐시된 모델을 반환합니다. 캐시를 사용할 수 없으면 None을 반환합니다.
+        처음 호출될 때 고정 프롬프트의 토큰 수를 세어, 최소 토큰 수보다 짧으면 이후로는 생성을 시도하지 않습니다.
+        """
+        key = self._key(model_name, static_prefix)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if key not in self._token_counts:
+                try:
+                    self._token_counts[key] = await asyncio.to_thread(self._count_fn, model_name, static_prefix)
+                except Exception as e:
+                    # 토큰 수를 셀 수 없으면 2글자를 1토큰으로 추정합니다.
+                    self._token_counts[key] = len(static_prefix) // 2
+                    print(f"[PromptCache] 토큰 수 계산 실패, 약 {self._token_counts[key]}토큰으로 추정합니다 ({model_name}): {e}")
+                if self._too_short(key):
+                    self.stats["too_short"] += 1
+                    print(f"[PromptCache] 고정 프롬프트가 {self._token_counts[key]}토큰으로 최소 {self.min_tokens}토큰보다 짧아 캐시하지 않습니다 ({model_name})")
+            if self._too_short(key) or time.time() < self._retry_after.get(key, 0):
+                return None
+
+            now = time.time()
+            entry = self._entries.get(key)
+
+            if entry and now < entry["expire_at"] - PROMPT_CACHE_REFRESH_MARGIN_S:
+                return entry["model"]
+
+            if entry and now < entry["expire_at"]:
+                try:
+                    await asyncio.to_thread(self._refresh_fn, entry["handle"], PROMPT_CACHE_TTL_S)
+                    entry["expire_at"] = time.time() + PROMPT_CACHE_TTL_S
+                    self.stats["refreshes"] += 1
+                    return entry["model"]
+                except Exception as e:
+                    print(f"[PromptCache] TTL 연장 실패, 캐시를 다시 생성합니다 ({model_name}): {e}")
+                    self._entries.pop(key, None)
+
+            try:
+                handle, model = await asyncio.to_thread(self._create_fn, model_name, static_prefix, PROMPT_CACHE_TTL_S)
+            except Exception as e:
+                self.stats["failures"] += 1
+                self._retry_after[key] = time.time() + PROMPT_CACHE_RETRY_AFTER_S
+                print(f"[PromptCache] 캐시 생성 실패, {PROMPT_CACHE_RETRY_AFTER_S}초 동안 캐시 없이 요청합니다 ({model_name}): {e}")
+                return None
+
+            self._entries[key] = {"handle": handle, "model": model, "expire_at": time.time() + PROMPT_CACHE_TTL_S}
+            self.stats["creates"] += 1
+            return model
+
+    def invalidate(self, model_name: str, static_prefix: str):
+        """
+        서버 측에서 캐시가 사라진 경우(만료, 삭제 등) 항목을 제거해 다음 요청에서 다시 생성되도록 합니다.
+        """
+        if self._entries.pop(self._key(model_name, static_prefix), None):
+            self.stats["invalidations"] += 1
+
+    def close(self):
+        """
+        관리 중인 캐시를 모두 삭제합니다. 서버 종료 시 남은 TTL 동안의 저장 비용을 줄이기 위해 호출합니다.
+        """
+        for entry in self._entries.values():
+            try:
+                self._delete_fn(entry["handle"])
+            except Exception as e:
+                print(f"[PromptCache] 캐시 삭제 실패: {e}")
+        self._entries.clear()
+
+
+class GeminiBackend:
+    """
+    실제 Gemini API를 사용하는 백엔드입니다.
+    """
+
+    def __init__(self):
+        genai.configure(api_key=GEMINI_API_KEY)
+        self._models: Dict[str, genai.GenerativeModel] = {}
+        self.prefix_cache = PrefixCacheManager(self._create_cache, self._refresh_cache, self._delete_cache, self._count_tokens)
+
+    def get_model(self, model_name: str):
+        if model_name not in self._models:
+            self._models[model_name] = genai.GenerativeModel(model_name=model_name, generation_config=generation_config)
+        return self._models[model_name]
+
+    async def get_cached_model(self, model_name: str, static_prefix: str):
+        """
+        static_prefix를 시스템 지시문으로 캐시한 모델을 반환합니다. 캐시를 쓸 수 없으면 None을 반환합니다.
+        """
+        if not PROMPT_CACHE_ENABLED:
+            return None
+        return await self.prefix_cache.get_model(model_name, static_prefix)
+
+    async def prepare_cached_model(self, model_name: str, static_prefix: str, wait: bool = True):
+        """
+        시작 시 static_prefix의 컨텍스트 캐시를 만듭니다. wait가 False면 기다리지 않고 백그라운드로 만듭니다.
+        """
+        if not PROMPT_CACHE_ENABLED:
+            return
+        if wait:
+            await self.prefix_cache.ensure(model_name, static_prefix)
+        else:
+            self.prefix_cache.schedule(model_name, static_prefix)
+
+    def _count_tokens(self, model_name: str, static_prefix: str) -> int:
+        return self.get_model(model_name).count_tokens(static_prefix).total_tokens
+
+    @staticmethod
+    def _create_cache(model_name: str, static_prefix: str, ttl_s: int):
+        cached_content = genai.caching.CachedContent.create(
+            model=model_name if model_name.startswith("models/") else f"models/{model_name}",
+            display_name=f"chat-ai-prefix-{hashlib.sha256(static_prefix.encode('utf-8')).hexdigest()[:12]}",
+            system_instruction=static_prefix,
+            ttl=datetime.timedelta(seconds=ttl_s),
+        )
+        model = genai.GenerativeModel.from_cached_content(cached_content=cached_content, generation_config=generation_config)
+        return cached_content, model
+
+    @staticmethod
+    def _refresh_cache(cached_content, ttl_s: int):
+        cached_content.update(ttl=datetime.timedelta(seconds=ttl_s))
+
+    @staticmethod
+    def _delete_cache(cached_content):
+        cached_content.delete()
+
+
+class FakeBackend:
+    """
+    네트워크와 API 키 없이 동작하는 부하 테스트용 백엔드입니다.
+    컨텍스트 캐시도 생성 지연(FAKE_CACHE_CREATE_MS)과 TTL 만료를 흉내 냅니다.
+    """
+
+    def __init__(self):
+        self._models: Dict[str, FakeGenerativeModel] = {}
+        self.prefix_cache = PrefixCacheManager(self._create_cache, self._refresh_cache, self._delete_cache, self._count_tokens)
+
+    def get_model(self, model_name: str):
+        if model_name not in self._models:
+            self._models[model_name] = FakeGenerativeModel(model_name)
+        return self._models[model_name]
+
+    async def get_cached_model(self, model_name: str, static_prefix: str):
+        if not PROMPT_CACHE_ENABLED:
+            return None
+        return await self.prefix_cache.get_model(model_name, static_prefix)
+
+    async def prepare_cached_model(self, model_name: str, static_prefix: str, wait: bool = True):
+        if not PROMPT_CACHE_ENABLED:
+            return
+        if wait:
+            await self.prefix_cache.ensure(model_name, static_prefix)
+        else:
+            self.prefix_cache.schedule(model_name, static_prefix)
+
+    @staticmethod
+    def _count_tokens(model_name: str, static_prefix: str) -> int:
+        # 기존 토큰 수 추정 방식(len // 2)과 같게 계산합니다.
+        return len(static_prefix) // 2
+
+    @staticmethod
+    def _create_cache(model_name: str, static_prefix: str, ttl_s: int):
+        time.sleep(FAKE_CACHE_CREATE_MS / 1000)
+        cached_content = _FakeCachedContent(model_name, static_prefix, ttl_s)
+        return cached_content, FakeGenerativeModel(model_name, cached_content=cached_content)
+
+    @staticmethod
+    def _refresh_cache(cached_content: _FakeCachedContent, ttl_s: int):
+        cached_content.expire_time = time.time() + ttl_s
+
+    @staticmethod
+    def _delete_cache(cached_content: _FakeCachedContent):
+        cached_content.expire_time = 0
+
+
+_BACKENDS = {
+    "gemini": GeminiBackend,
+    "fake": FakeBackend,
+}
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_backend():
+    """
+    MODEL_BACKEND 환경 변수에 지정된 백엔드 인스턴스를 반환합니다.
+    시작 시 백그라운드 초기화와 첫 요청이 겹쳐도 인스턴스가 하나만 만들어지도록 잠금을 사용합니다.
+    """
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if MODEL_BACKEND not in _BACKENDS:
+                    raise ValueError(f"지원하지 않는 MODEL_BACKEND 값입니다: '{MODEL_BACKEND}' (지원: {', '.join(_BACKENDS)})")
+                _backend = _BACKENDS[MODEL_BACKEND]()
+    return _backend
+
+
+def is_backend_ready() -> bool:
+    return _backend is not None
@@ -0,0 +1,352 @@
+# services/recommendation.py
+
+import hashlib
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.config import RECOMMEND_INDEX_DIR
+from services.initial_questions import add_questions_listener, ensure_questions_loaded
+
+# 문자 n-gram 범위: bigram은 짧은 키워드(예: 'DB', '락'), trigram은 더 구체적인 표현을 맞춥니다.
+NGRAM_RANGE = (2, 3)
+
+_META_FILE = "meta.json"
+_ARRAY_FILES = ("indptr", "indices", "data")
+
+
+def _char_ngrams(text: str) -> List[str]:
+    grams = []
+    for word in re.findall(r'[0-9a-z가-힣]+', text.lower()):
+        if len(word) < NGRAM_RANGE[0]:
+            grams.append(word)
+            continue
+        for n in range(NGRAM_RANGE[0], NGRAM_RANGE[1] + 1):
+            grams.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return grams
+
+
+def _term_weights(text: str) -> Dict[str, float]:
+    # 긴 질문에서 반복되는 n-gram이 점수를 독차지하지 않도록 로그 스케일 TF를 사용합니다.
+    counts: Dict[str, int] = {}
+    for gram in _char_ngrams(text):
+        counts[gram] = counts.get(gram, 0) + 1
+    return {gram: 1 + math.log(count) for gram, count in counts.items()}
+
+
+def bank_signature(questions: List[Dict]) -> str:
+    return hashlib.sha1(json.dumps(
+        [[q["category"], q["question"]] for q in questions], ensure_ascii=False
+    ).encode('utf-8')).hexdigest()
+
+
+def build_index(questions: List[Dict]) -> Dict:
+    """
+    질문 뱅크로 TF-IDF(문자 n-gram) 행렬을 만듭니다.
+    키워드 질의는 n-gram 몇 개만 포함하므로, n-gram(열)별로 (질문 번호, 가중치)를 모은 CSC 형식으로 저장합니다.
+    질문은 카테고리 순으로 정렬해 카테고리마다 연속된 구간이 되도록 합니다.
+
+    Returns:
+        dict: {"indptr", "indices", "data"} NumPy 배열과 meta(어휘, idf, 질문, 카테고리 구간)
+    """
+    questions = sorted(
+        (q for q in questions if q.get("category") != "N/A" and q.get("question", "").strip()),
+        key=lambda q: q["category"]
+    )
+    doc_weights = [_term_weights(q["question"]) for q in questions]
+
+    vocabulary: Dict[str, int] = {}
+    doc_freq: List[int] = []
+    for weights in doc_weights:
+        for gram in weights:
+            if gram not in vocabulary:
+                vocabulary[gram] = len(vocabulary)
+                doc_freq.append(0)
+            doc_freq[vocabulary[gram]] += 1
+
+    n_docs = len(questions)
+    idf = np.log((1 + n_docs) / (1 + np.asarray(doc_freq, dtype=np.float32))) + 1
+
+    columns: List[List] = [[] for _ in vocabulary]
+    for doc_id, weights in enumerate(doc_weights):
+        values = {gram: weight * idf[vocabulary[gram]] for gram, weight in weights.items()}
+        norm = math.sqrt(sum(value * value for value in values.values())) or 1.0
+        for gram, value in values.items():
+            columns[vocabulary[gram]].append((doc_id, value / norm))
+
+    indptr = np.zeros(len(vocabulary) + 1, dtype=np.int64)
+    indptr[1:] = np.cumsum([len(column) for column in columns])
+    indices = np.fromiter((doc_id for column in columns for doc_id, _ in column), dtype=np.int32, count=int(indptr[-1]))
+    data = np.fromiter((value for column in columns for _, value in column), dtype=np.float32, count=int(indptr[-1]))
+
+    categories = []
+    for doc_id, q in enumerate(questions):
+        if not categories or categories[-1]["name"] != q["category"]:
+            categories.append({"name": q["category"], "start": doc_id, "end": doc_id})
+        categories[-1]["end"] = doc_id + 1
+
+    return {
+        "indptr": indptr,
+        "indices": indices,
+        "data": data,
+        "meta": {
+            "ngram_range": list(NGRAM_RANGE),
+            "vocabulary": vocabulary,
+            "idf": idf.tolist(),
+            "questions": [q["question"] for q in questions],
+            "categories": categories,
+        },
+    }
+
+
+def _array_file(name: str, signature: str) -> str:
+    return f"{name}.{signature[:16]}.npy"
+
+
+def _write_atomic(path: str, write):
+    # 임시 파일에 다 쓴 뒤 교체하므로, 읽는 쪽은 이전 파일이나 완성된 새 파일만 보게 됩니다.
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp.")
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def save_index(index: Dict, signature: str, directory: str = RECOMMEND_INDEX_DIR):
+    """
+    배열은 mmap으로 바로 열 수 있도록 .npy 파일로, 어휘와 질문은 meta.json으로 저장합니다.
+    배열 파일 이름에 뱅크 서명을 붙이고 meta.json을 마지막에 교체하므로, 여러 워커가 동시에 저장하거나
+    저장 도중 다른 워커가 읽어도 서로 맞지 않는 파일 조합이나 덜 쓴 파일을 읽지 않습니다.
+    """
+    os.makedirs(directory, exist_ok=True)
+    arrays = {name: _array_file(name, signature) for name in _ARRAY_FILES}
+    for name, filename in arrays.items():
+        _write_atomic(os.path.join(directory, filename), lambda f, name=name: np.save(f, index[name]))
+    meta = json.dumps({**index["meta"], "signature": signature, "arrays": arrays}, ensure_ascii=False).encode('utf-8')
+    _write_atomic(os.path.join(directory, _META_FILE), lambda f: f.write(meta))
+
+    # 이전 뱅크로 만든 배열 파일을 정리합니다. (이미 mmap으로 열린 파일은 닫힐 때까지 그대로 읽을 수 있습니다)
+    current = set(arrays.values())
+    for filename in os.listdir(directory):
+        if filename.endswith(".npy") and filename not in current:
+            try:
+                os.remove(os.path.join(directory, filename))
+            except OSError:
+                pass
+
+
+def load_index(directory: str = RECOMMEND_INDEX_DIR) -> Optional[Dict]:
+    """
+    저장된 색인을 mmap으로 엽니다. 배열은 필요한 부분만 디스크에서 읽으므로 뱅크가 커져도 시작 시간과 메모리가 거의 늘지 않습니다.
+    파일이 없거나 손상되는 등 어떤 이유로든 열 수 없으면 None을 반환하며, 호출하는 쪽은 색인을 다시 만듭니다.
+    """
+    try:
+        with open(os.path.join(directory, _META_FILE), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get("ngram_range") != list(NGRAM_RANGE):
+            return None
+        arrays = {
+            name: np.load(os.path.join(directory, meta["arrays"][name]), mmap_mode='r')
+            for name in _ARRAY_FILES
+        }
+        if len(arrays["indptr"]) != len(meta["vocabulary"]) + 1 or len(arrays["indices"]) != len(arrays["data"]):
+            raise ValueError("배열 크기가 메타 정보와 맞지 않습니다")
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        print(f"추천 색인을 여는 중 오류 발생, 다시 만듭니다: {type(e).__name__} {e}")
+        return None
+    return {**arrays, "meta": meta}
+
+
+class QuestionRecommender:
+    """
+    TF-IDF 코사인 유사도로 키워드에 맞는 질문 뱅크 질문을 카테고리별로 추천합니다.
+    """
+
+    def __init__(self, index: Dict):
+        self.indptr = index["indptr"]
+        self.indices = index["indices"]
+        self.data = index["data"]
+        meta = index["meta"]
+        self.vocabulary: Dict[str, int] = meta["vocabulary"]
+        self.idf = np.asarray(meta["idf"], dtype=np.float32)
+        self.questions: List[str] = meta["questions"]
+        self.categories: List[Dict] = meta["categories"]
+        self.signature: Optional[str] = meta.get("signature")
+
+    def _query_terms(self, text: str):
+        values = {}
+        for gram, weight in _term_weights(text).items():
+            column = self.vocabulary.get(gram)
+            if column is not None:
+                values[column] = weight * float(self.idf[column])
+        norm = math.sqrt(sum(value * value for value in values.values())) or 1.0
+        return [(column, value / norm) for column, value in values.items()]
+
+    def score(self, queries: List[str]) -> np.ndarray:
+        """
+        질의 여러 개의 코사인 유사도를 한 번에 계산합니다.
+        질의에 포함된 n-gram 열만 모아 (질의, 질문) 위치에 가중치를 더하므로, 비용은 뱅크 크기가 아니라 해당 열의 항목 수에 비례합니다.
+
+        Returns:
+            np.ndarray: (질의 수, 질문 수) 유사도 행렬
+        """
+        n_docs = len(self.questions)
+        rows, columns, weights = [], [], []
+        for row, query in enumerate(queries):
+            for column, weight in self._query_terms(query):
+                rows.append(row)
+                columns.append(column)
+                weights.append(weight)
+        if not columns:
+            return np.zeros((len(queries), n_docs), dtype=np.float32)
+
+        starts = self.indptr[columns]
+        lengths = self.indptr[np.asarray(columns) + 1] - starts
+        total = int(lengths.sum())
+        # 각 열 구간 [start, start + length)의 위치를 한 번에 만듭니다.
+        offsets = np.repeat(starts - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths) + np.arange(total)
+        doc_ids = self.indices[offsets]
+        values = self.data[offsets] * np.repeat(np.asarray(weights, dtype=np.float32), lengths)
+        flat = np.repeat(np.asarray(rows, dtype=np.int64), lengths) * n_docs + doc_ids
+        scores = np.bincount(flat, weights=values, minlength=len(queries) * n_docs)
+        return scores.reshape(len(queries), n_docs).astype(np.float32)
+
+    def recommend(self, keywords: List[str], top_k: int = 3, exclude: Optional[List[str]] = None) -> List[Dict]:
+        """
+        키워드별 유사도 중 가장 높은 값을 질문 점수로 삼아, 카테고리마다 상위 top_k개 질문을 반환합니다.
+
+        Returns:
+            list: [{"category", "questions": [{"question", "score", "keyword"}]}] (최고 점수가 높은 카테고리 순)
+        """
+        keywords = [keyword for keyword in keywords if keyword and keyword.strip()]
+        if not keywords or not self.questions:
+            return []
+
+        scores = self.score(keywords)
+        best_keyword = scores.argmax(axis=0)
+        best_scores = scores.max(axis=0)
+        excluded = {question.strip() for question in exclude or []}
+
+        results = []
+        for category in self.categories:
+            start, end = category["start"], category["end"]
+            segment = best_scores[start:end]
+            k = min(top_k + len(excluded), end - start)
+            # 카테고리 구간에서 상위 k개만 부분 정렬합니다.
+            candidates = np.argpartition(-segment, k - 1)[:k] if k < end - start else np.arange(end - start)
+            candidates = candidates[np.argsort(-segment[candidates])]
+
+            picked = []
+            for offset in candidates:
+                doc_id = start + int(offset)
+                if segment[offset] <= 0 or self.questions[doc_id].strip() in excluded:
+                    continue
+                picked.append({
+                    "question": self.questions[doc_id],
+                    "score": round(float(segment[offset]), 4),
+                    "keyword": keywords[int(best_keyword[doc_id])],
+                })
+                if len(picked) == top_k:
+                    break
+            if picked:
+                results.append({"category": category["name"], "questions": picked})
+
+        results.sort(key=lambda result: -result["questions"][0]["score"])
+        return results
+
+
+_recommender: Optional[QuestionRecommender] = None
+_lock = threading.Lock()
+
+# 색인 생성은 오래 걸리므로(뱅크 크기에 비례) 백그라운드 스레드 하나에서 수행합니다.
+# 생성 중에 뱅크가 다시 바뀌면 마지막 뱅크만 남겨 두었다가 이어서 만듭니다.
+_build_lock = threading.Lock()
+_pending_build: Optional[tuple] = None
+_builder: Optional[threading.Thread] = None
+
+
+def _set_recommender(index: Dict):
+    global _recommender
+    recommender = QuestionRecommender(index)
+    with _lock:
+        _recommender = recommender
+
+
+def _build_pending():
+    global _pending_build, _builder
+    while True:
+        with _build_lock:
+            if _pending_build is None:
+                _builder = None
+                return
+            questions, signature = _pending_build
+            _pending_build = None
+
+        try:
+            index = build_index(questions)
+            try:
+                save_index(index, signature)
+                index = load_index() or index
+            except OSError as e:
+                print(f"추천 색인 저장 실패, 메모리에서만 사용합니다: {e}")
+            index["meta"]["signature"] = signature
+            _set_recommender(index)
+            print(f"추천 색인 생성 완료: 질문 {len(index['meta']['questions'])}개")
+        except Exception as e:
+            print(f"추천 색인 생성 실패: {type(e).__name__} {e}")
+
+
+def _start_build(questions: List[Dict], signature: str):
+    global _pending_build, _builder
+    with _build_lock:
+        _pending_build = (list(questions), signature)
+        if _builder is None:
+            _builder = threading.Thread(target=_build_pending, name="recommend-index-build", daemon=True)
+            _builder.start()
+
+
+def _on_questions_loaded(questions: List[Dict]):
+    """
+    질문 뱅크를 불러올 때 저장된 색인이 같은 뱅크로 만든 것이면 mmap으로 열고, 아니면 백그라운드에서 다시 만듭니다.
+    새 색인이 준비될 때까지는 이전 색인(메모리에 있던 것, 없으면 저장된 이전 뱅크의 색인)으로 추천합니다.
+    """
+    signature = bank_signature(questions)
+    index = load_index()
+    if index is not None and index["meta"].get("signature") == signature:
+        _set_recommender(index)
+        return
+
+    with _lock:
+        has_previous = _recommender is not None
+    if index is not None and not has_previous:
+        _set_recommender(index)
+    print("추천 색인이 없거나 질문 뱅크가 바뀌어 백그라운드에서 다시 만듭니다.")
+    _start_build(questions, signature)
+
+
+def recommend_questions(keywords: List[str], top_k: int = 3, exclude: Optional[List[str]] = None) -> List[Dict]:
+    """
+    키워드(예: 평가 리포트의 improvement_keywords)에 맞는 연습 질문을 카테고리별로 추천합니다.
+    처음 만드는 색인이 아직 준비되지 않았으면 빈 리스트를 반환합니다.
+    """
+    ensure_questions_loaded()
+    with _lock:
+        recommender = _recommender
+    if recommender is None:
+        return []
+    return recommender.recommend(keywords, top_k, exclude)
+
+
+add_questions_listener(_on_questions_loaded)
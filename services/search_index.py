@@ -0,0 +1,301 @@
+# services/search_index.py
+
+import gzip
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+from typing import Dict, List, Optional
+
+from core.config import SEARCH_INDEX_PATH, SEARCH_INDEX_SAVE_DELAY_S
+from services.initial_questions import add_questions_listener
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    한국어는 띄어쓰기/조사 변화가 많아 단어 단위로는 잘 맞지 않으므로, 단어 안의 문자 bigram을 토큰으로 사용합니다.
+    (예: '캐시메모리' -> 캐시, 시메, 메모, 모리) 한 글자 단어는 그대로 토큰이 됩니다.
+    """
+    tokens = []
+    for word in re.findall(r'[0-9a-z가-힣]+', text.lower()):
+        if len(word) == 1:
+            tokens.append(word)
+        else:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+class SearchIndex:
+    """
+    BM25로 순위를 매기는 메모리 역색인입니다.
+    문서는 그룹(질문 뱅크 'bank', 회사별 후기 'reviews:naver' 등) 단위로 교체되며,
+    그룹 내용이 바뀌지 않았으면(서명이 같으면) 다시 색인하지 않습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._docs: List[Optional[Dict]] = []
+        self._doc_tokens: List[Optional[Dict[str, int]]] = []
+        self._doc_lengths: List[int] = []
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._groups: Dict[str, Dict] = {}
+        self._free_ids: List[int] = []
+        self._total_length = 0
+        self._doc_count = 0
+
+    def _add_doc(self, doc: Dict) -> int:
+        term_freqs: Dict[str, int] = {}
+        for token in tokenize(doc["text"]):
+            term_freqs[token] = term_freqs.get(token, 0) + 1
+
+        doc_id = self._free_ids.pop() if self._free_ids else len(self._docs)
+        if doc_id == len(self._docs):
+            self._docs.append(None)
+            self._doc_tokens.append(None)
+            self._doc_lengths.append(0)
+        self._docs[doc_id] = doc
+        self._doc_tokens[doc_id] = term_freqs
+        self._doc_lengths[doc_id] = sum(term_freqs.values())
+        for token, tf in term_freqs.items():
+            self._postings.setdefault(token, {})[doc_id] = tf
+        self._total_length += self._doc_lengths[doc_id]
+        self._doc_count += 1
+        return doc_id
+
+    def _remove_doc(self, doc_id: int):
+        term_freqs = self._doc_tokens[doc_id]
+        for token in term_freqs:
+            postings = self._postings.get(token)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[token]
+        self._total_length -= self._doc_lengths[doc_id]
+        self._doc_count -= 1
+        self._docs[doc_id] = None
+        self._doc_tokens[doc_id] = None
+        self._doc_lengths[doc_id] = 0
+        self._free_ids.append(doc_id)
+
+    def replace_group(self, group: str, docs: List[Dict]) -> bool:
+        """
+        그룹의 문서를 docs로 교체합니다. 내용이 이전과 같으면 아무것도 하지 않고 False를 반환합니다.
+
+        Args:
+            group: 문서 그룹 이름
+            docs: {"text": 검색 대상 문장, ...부가 정보} 리스트
+        """
+        signature = hashlib.sha1(
+            json.dumps(docs, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        ).hexdigest()
+        with self._lock:
+            previous = self._groups.get(group)
+            if previous and previous["signature"] == signature:
+                return False
+            for doc_id in previous["doc_ids"] if previous else []:
+                self._remove_doc(doc_id)
+            doc_ids = [self._add_doc({**doc, "group": group}) for doc in docs if doc.get("text")]
+            self._groups[group] = {"signature": signature, "doc_ids": doc_ids}
+            return True
+
+    def search(self, query: str, limit: int = 10, kind: Optional[str] = None) -> List[Dict]:
+        """
+        BM25 점수가 높은 순서로 문서를 반환합니다. 질의 토큰이 하나 이상 포함된 문서만 점수를 계산합니다.
+        """
+        query_tokens = set(tokenize(query))
+        with self._lock:
+            if not query_tokens or not self._doc_count:
+                return []
+            avg_length = self._total_length / self._doc_count
+            scores: Dict[int, float] = {}
+            for token in query_tokens:
+                postings = self._postings.get(token)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (self._doc_count - df + 0.5) / (df + 0.5))
+                for doc_id, tf in postings.items():
+                    doc = self._docs[doc_id]
+                    if kind and doc.get("kind") != kind:
+                        continue
+                    norm = tf + BM25_K1 * (1 - BM25_B + BM25_B * self._doc_lengths[doc_id] / avg_length)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (BM25_K1 + 1) / norm
+
+            top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+            return [{**self._docs[doc_id], "score": round(score, 4)} for doc_id, score in top]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"documents": self._doc_count, "tokens": len(self._postings), "groups": len(self._groups)}
+
+    def dumps_snapshot(self) -> str:
+        """
+        다시 토큰화하지 않고 복원할 수 있도록 문서와 문서별 토큰 빈도를 JSON 문자열로 직렬화합니다.
+        문서와 토큰 빈도 dict는 추가된 뒤 바뀌지 않고 교체만 되므로, 잠금 안에서는 목록만 얕게 복사하고
+        직렬화는 잠금 밖에서 수행해 그동안 검색이 막히지 않도록 합니다.
+        """
+        with self._lock:
+            snapshot = {
+                "version": 1,
+                "docs": list(self._docs),
+                "doc_tokens": list(self._doc_tokens),
+                "groups": dict(self._groups),
+            }
+        return json.dumps(snapshot, ensure_ascii=False, separators=(',', ':'))
+
+    @classmethod
+    def from_snapshot(cls, snapshot: Dict) -> "SearchIndex":
+        index = cls()
+        index._docs = snapshot["docs"]
+        index._doc_tokens = snapshot["doc_tokens"]
+        index._groups = snapshot["groups"]
+        for doc_id, term_freqs in enumerate(index._doc_tokens):
+            length = sum(term_freqs.values()) if term_freqs is not None else 0
+            index._doc_lengths.append(length)
+            if term_freqs is None:
+                index._free_ids.append(doc_id)
+                continue
+            for token, tf in term_freqs.items():
+                index._postings.setdefault(token, {})[doc_id] = tf
+            index._total_length += length
+            index._doc_count += 1
+        return index
+
+
+_index = SearchIndex()
+_save_lock = threading.Lock()
+_timer_lock = threading.Lock()
+_save_timer: Optional[threading.Timer] = None
+
+
+def load_search_index(path: str = SEARCH_INDEX_PATH):
+    """
+    저장된 스냅샷이 있으면 불러옵니다. 서버 시작 시 질문 뱅크를 불러오기 전에 호출하며,
+    이후 질문 뱅크/후기는 내용이 바뀐 그룹만 다시 색인합니다. 이미 색인된 문서가 있으면 덮어쓰지 않습니다.
+    """
+    global _index
+    if _index.stats()["groups"]:
+        return
+    try:
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            snapshot = json.load(f)
+        _index = SearchIndex.from_snapshot(snapshot)
+        print(f"검색 색인 스냅샷을 불러왔습니다: 문서 {_index.stats()['documents']}개")
+    except FileNotFoundError:
+        print(f"Info: '{path}' 스냅샷이 없어 빈 검색 색인으로 시작합니다.")
+    except Exception as e:
+        print(f"검색 색인 스냅샷을 불러오는 중 오류 발생, 빈 색인으로 시작합니다: {e}")
+
+
+def save_search_index(path: str = SEARCH_INDEX_PATH):
+    """
+    현재 색인을 스냅샷 파일로 저장합니다. 쓰는 도중 중단되어도 기존 파일이 깨지지 않도록 임시 파일을 교체하며,
+    여러 워커 프로세스가 동시에 저장해도 섞이지 않도록 임시 파일은 저장할 때마다 새 이름으로 만듭니다.
+    """
+    snapshot = _index.dumps_snapshot().encode('utf-8')
+    directory = os.path.dirname(os.path.abspath(path))
+    with _save_lock:
+        os.makedirs(directory, exist_ok=True)
+        with tempfile.NamedTemporaryFile(dir=directory, prefix=".search_index.", suffix=".tmp", delete=False) as f:
+            tmp_path = f.name
+            try:
+                with gzip.GzipFile(fileobj=f, mode='wb') as gz:
+                    gz.write(snapshot)
+            except BaseException:
+                f.close()
+                os.remove(tmp_path)
+                raise
+        os.replace(tmp_path, path)
+
+
+def _save_in_background():
+    global _save_timer
+    with _timer_lock:
+        _save_timer = None
+    try:
+        save_search_index()
+    except Exception as e:
+        print(f"검색 색인 스냅샷 저장 실패: {e}")
+
+
+def _schedule_save():
+    """
+    SEARCH_INDEX_SAVE_DELAY_S 뒤에 백그라운드 스레드에서 스냅샷을 저장합니다.
+    이미 예약된 저장이 있으면 그 저장이 최신 색인을 기록하므로 새로 예약하지 않습니다.
+    """
+    global _save_timer
+    with _timer_lock:
+        if _save_timer is not None:
+            return
+        _save_timer = threading.Timer(SEARCH_INDEX_SAVE_DELAY_S, _save_in_background)
+        _save_timer.daemon = True
+        _save_timer.start()
+
+
+def flush_search_index():
+    """
+    예약된 저장이 있으면 바로 저장합니다. (서버 종료 시 호출)
+    """
+    global _save_timer
+    with _timer_lock:
+        timer, _save_timer = _save_timer, None
+    if timer is not None:
+        timer.cancel()
+        try:
+            save_search_index()
+        except Exception as e:
+            print(f"검색 색인 스냅샷 저장 실패: {e}")
+
+
+def _update_group(group: str, docs: List[Dict]):
+    # 스냅샷 저장은 요청 처리 경로에서 하지 않고 모아서 백그라운드로 수행합니다.
+    if _index.replace_group(group, docs):
+        _schedule_save()
+
+
+def index_bank_questions(questions: List[Dict]):
+    """
+    질문 뱅크(cs_questions.csv)를 색인합니다. 질문 뱅크를 다시 불러올 때마다 호출됩니다.
+    """
+    _update_group("bank", [
+        {"text": q["question"], "kind": "bank", "category": q["category"]}
+        for q in questions if q.get("category") != "N/A"
+    ])
+
+
+def index_company_reviews(company_name: str, result: Dict):
+    """
+    회사의 통합 크롤링 결과에서 면접 질문을 색인합니다. 크롤링할 때마다 호출되며, 후기가 바뀌지 않았으면 건너뜁니다.
+    """
+    jobkorea_count = result.get("jobkorea_count", 0)
+    docs = []
+    for i, review in enumerate(result.get("reviews", [])):
+        for item in review.get("questions", []):
+            for pair in item.get("qna_pairs", []):
+                if pair.get("question"):
+                    docs.append({
+                        "text": pair["question"],
+                        "kind": "review",
+                        "company": company_name,
+                        "source": "jobkorea" if i < jobkorea_count else "saramin",
+                    })
+    _update_group(f"reviews:{company_name}", docs)
+
+
+# 질문 뱅크를 (다시) 불러올 때마다 색인을 갱신합니다.
+add_questions_listener(index_bank_questions)
+
+
+def search(query: str, limit: int = 10, kind: Optional[str] = None) -> List[Dict]:
+    return _index.search(query, limit, kind)
+
+
+def get_search_stats() -> Dict[str, int]:
+    return _index.stats()
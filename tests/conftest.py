@@ -0,0 +1,11 @@
+import os
+import sys
+
+# 프로젝트 루트(core, services 등)와 scripts 디렉토리의 모듈을 테스트에서 import할 수 있도록 합니다.
+ROOT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT_DIR)
+sys.path.insert(0, os.path.join(ROOT_DIR, 'scripts'))
+
+# 테스트는 외부 서비스 없이 실행되도록 메모리 캐시와 가짜 모델 백엔드를 기본으로 사용합니다.
+os.environ.setdefault("CACHE_BACKEND", "memory")
+os.environ.setdefault("MODEL_BACKEND", "fake")
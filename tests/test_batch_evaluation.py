@@ -0,0 +1,108 @@
+import asyncio
+import json
+
+import batch_evaluate
+from models.interview_models import BatchEvaluationItem
+from services import batch_evaluation, gemini_service
+
+
+class FakeReport:
+    turn_evaluations = [{"turn": 1}]
+
+    def model_dump(self):
+        return {"overall_score": 80}
+
+
+def make_item(item_id="a", answer="프로세스는 자원 할당의 단위입니다."):
+    return BatchEvaluationItem(
+        id=item_id,
+        interviewType="Operating System",
+        conversation=[
+            {"role": "assistant", "content": "프로세스와 스레드의 차이는?"},
+            {"role": "user", "content": answer},
+        ],
+    )
+
+
+def stub_evaluation(monkeypatch):
+    calls = []
+
+    async def fake_evaluate(conversation, deadline=None):
+        calls.append(conversation[-1].content)
+        return {"evaluation_report": FakeReport()}
+
+    monkeypatch.setattr(batch_evaluation, "evaluate_conversation", fake_evaluate)
+    return calls
+
+
+def test_content_hash_tracks_interview_content():
+    assert batch_evaluation.content_hash(make_item("a")) == batch_evaluation.content_hash(make_item("b"))
+    assert batch_evaluation.content_hash(make_item()) != batch_evaluation.content_hash(make_item(answer="수정"))
+
+
+def test_batch_resume_reuses_only_unchanged_items(monkeypatch):
+    calls = stub_evaluation(monkeypatch)
+
+    first = asyncio.run(batch_evaluation.evaluate_item(make_item(), batch_id="resume-test"))
+    again = asyncio.run(batch_evaluation.evaluate_item(make_item(), batch_id="resume-test"))
+    changed = asyncio.run(batch_evaluation.evaluate_item(make_item(answer="수정된 답변"), batch_id="resume-test"))
+
+    assert first["status"] == "succeeded" and "resumed" not in first
+    assert again["resumed"] is True
+    assert "resumed" not in changed
+    assert calls == ["프로세스는 자원 할당의 단위입니다.", "수정된 답변"]
+
+
+def test_cli_skips_only_items_completed_with_same_content(tmp_path):
+    unchanged, edited, failed = make_item("1"), make_item("2"), make_item("3")
+    output = tmp_path / "results.jsonl"
+    output.write_text("\n".join([
+        json.dumps({"id": "1", "content_hash": batch_evaluation.content_hash(unchanged), "status": "succeeded"}),
+        json.dumps({"id": "2", "content_hash": batch_evaluation.content_hash(edited), "status": "succeeded"}),
+        json.dumps({"id": "3", "content_hash": batch_evaluation.content_hash(failed), "status": "failed"}),
+        json.dumps({"id": "4", "status": "succeeded"}),
+        '{"id": "5", "sta',
+    ]), encoding="utf-8")
+
+    items = [unchanged, make_item("2", answer="수정된 답변"), failed, make_item("4")]
+    source = tmp_path / "interviews.jsonl"
+    source.write_text("\n".join(item.model_dump_json() for item in items) + "\n", encoding="utf-8")
+
+    completed = batch_evaluate.load_completed(str(output))
+    assert set(completed) == {"1", "2"}
+    pending = [item.id for item in batch_evaluate.read_items(str(source), completed, [])]
+    assert pending == ["2", "3", "4"]
+
+
+VALID_REPORT = """# 최종 종합 평가
+**- 종합 점수:** 80
+**- 종합 피드백:** 핵심 개념을 정확히 설명했습니다.
+**- 개선 키워드:**
+    - 스레드 동기화
+
+---
+## 질문별 상세 평가
+### 턴 1: 프로세스와 스레드
+**- 점수:** 80
+**- 피드백:** 좋습니다.
+"""
+
+
+def test_unparseable_report_fails_and_is_retried_on_resume(monkeypatch):
+    responses = ['{"overall_score": 80, "turn_evaluations": [', VALID_REPORT]
+
+    async def fake_generate(model_name, static_prefix, dynamic_suffix, hedge_model_name=None):
+        return responses.pop(0), {}
+
+    monkeypatch.setattr(gemini_service, "_generate_with_static_prefix", fake_generate)
+    item = make_item(answer="파싱 실패 후 재시도되는 답변입니다.")
+
+    failed = asyncio.run(batch_evaluation.evaluate_item(item, max_retries=0, batch_id="malformed-test"))
+    assert failed["status"] == "failed"
+    assert "IncompleteEvaluation" in failed["error"]
+
+    retried = asyncio.run(batch_evaluation.evaluate_item(item, max_retries=0, batch_id="malformed-test"))
+    assert retried["status"] == "succeeded"
+    assert "resumed" not in retried
+    assert retried["result"]["evaluation_report"]["overall_score"] == 80
+    assert responses == []
@@ -0,0 +1,94 @@
+import asyncio
+import time
+
+import pytest
+
+from core.cache import MemoryLRUBackend, NamespaceCache, SQLiteBackend, make_key
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryLRUBackend()
+    # 정리 주기를 3으로 두어 최대 항목 수 테스트(3번 저장)에서 정리가 실행되도록 합니다.
+    return SQLiteBackend(str(tmp_path / "cache.db"), evict_every=3)
+
+
+def test_round_trips_json_bytes_and_compressed_values(backend):
+    cache = NamespaceCache(backend, "test", ttl_s=60, max_entries=10)
+    large = {"reviews": ["면접 후기 " * 50] * 20}
+    cache.set("json", {"a": [1, 2]})
+    cache.set("bytes", b"\x00\x01raw")
+    cache.set("large", large)
+
+    assert cache.get("json") == {"a": [1, 2]}
+    assert cache.get("bytes") == b"\x00\x01raw"
+    assert cache.get("large") == large
+    assert cache.get("missing") is None
+    assert cache.stats["hits"] == 3 and cache.stats["misses"] == 1
+
+
+def test_entries_expire_after_ttl(backend):
+    cache = NamespaceCache(backend, "test", ttl_s=60, max_entries=10)
+    cache.set("short", "value", ttl_s=0.05)
+    cache.set("long", "value")
+    time.sleep(0.1)
+    assert cache.get("short") is None
+    assert cache.get("long") == "value"
+
+
+def test_evicts_oldest_entries_over_limit_per_namespace(backend):
+    cache = NamespaceCache(backend, "small", ttl_s=60, max_entries=2)
+    other = NamespaceCache(backend, "other", ttl_s=60, max_entries=2)
+    other.set("kept", 1)
+    for key in ["a", "b", "c"]:
+        cache.set(key, key)
+        time.sleep(0.01)
+
+    assert cache.get("a") is None
+    assert cache.get("b") == "b" and cache.get("c") == "c"
+    assert backend.count("small") == 2
+    assert other.get("kept") == 1
+
+
+def test_sqlite_evicts_periodically_instead_of_on_every_set(tmp_path):
+    backend = SQLiteBackend(str(tmp_path / "cache.db"), evict_every=10)
+    cache = NamespaceCache(backend, "test", ttl_s=60, max_entries=2)
+    for i in range(9):
+        cache.set(f"key{i}", i)
+    assert backend.count("test") == 9
+
+    cache.set("key9", 9)
+    assert backend.count("test") == 2
+    assert cache.get("key9") == 9
+
+
+def test_async_accessors_round_trip(backend):
+    cache = NamespaceCache(backend, "test", ttl_s=60, max_entries=10)
+
+    async def scenario():
+        await cache.aset("key", {"value": 1})
+        value = await cache.aget("key")
+        await cache.adelete("key")
+        return value, await cache.aget("key")
+
+    assert asyncio.run(scenario()) == ({"value": 1}, None)
+
+
+def test_backend_errors_become_cache_misses():
+    class BrokenBackend:
+        def get(self, namespace, key):
+            raise OSError("disk error")
+
+        def set(self, namespace, key, data, ttl_s, max_entries):
+            raise OSError("disk error")
+
+    cache = NamespaceCache(BrokenBackend(), "test", ttl_s=60, max_entries=10)
+    cache.set("key", "value")
+    assert cache.get("key") is None
+    assert cache.stats["errors"] == 2
+
+
+def test_make_key_separates_parts():
+    assert make_key("ab", "c") != make_key("a", "bc")
+    assert make_key("a", 1) == make_key("a", "1")
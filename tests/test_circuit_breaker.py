@@ -0,0 +1,64 @@
+from crawler import circuit_breaker
+from crawler.circuit_breaker import CircuitBreaker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+def make_breaker(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", clock.monotonic)
+    return CircuitBreaker("test", failure_threshold=2, recovery_timeout_s=30), clock
+
+
+def test_opens_after_consecutive_failures(monkeypatch):
+    breaker, _ = make_breaker(monkeypatch)
+    breaker.record_failure("timeout")
+    assert breaker.allow_request()
+    breaker.record_success()
+    breaker.record_failure("timeout")
+    assert breaker.snapshot()["state"] == "closed"
+
+    breaker.record_failure("timeout")
+    assert breaker.snapshot()["state"] == "open"
+    assert not breaker.allow_request()
+    assert breaker.snapshot()["total_rejected"] == 1
+
+
+def test_half_open_allows_one_trial_and_closes_on_success(monkeypatch):
+    breaker, clock = make_breaker(monkeypatch)
+    breaker.record_failure()
+    breaker.record_failure()
+
+    clock.now += 30
+    assert breaker.allow_request()
+    assert breaker.snapshot()["state"] == "half_open"
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.snapshot()["state"] == "closed"
+    assert breaker.allow_request()
+
+
+def test_half_open_failure_reopens_for_another_timeout(monkeypatch):
+    breaker, clock = make_breaker(monkeypatch)
+    breaker.record_failure()
+    breaker.record_failure()
+
+    clock.now += 30
+    assert breaker.allow_request()
+    breaker.record_failure("still down")
+    snapshot = breaker.snapshot()
+    assert snapshot["state"] == "open"
+    assert snapshot["retry_in_s"] == 30.0
+    assert snapshot["last_error"] == "still down"
+
+    clock.now += 29
+    assert not breaker.allow_request()
+    clock.now += 1
+    assert breaker.allow_request()
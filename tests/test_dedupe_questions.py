@@ -0,0 +1,60 @@
+import pytest
+
+from dedupe_questions import DEFAULT_THRESHOLD, NearDuplicateIndex, find_duplicate_groups
+
+# 표현만 다른 질문 (중복으로 판단해야 함)
+NEAR_DUPLICATES = [
+    ("프로세스와 스레드의 차이점은 무엇인가요?", "프로세스와 스레드의 차이는 무엇인가요?"),
+    ("TCP와 UDP의 차이점을 설명해주세요.", "TCP 와 UDP 의 차이점을 설명해 주세요!"),
+    ("데이터베이스 인덱스의 동작 원리와 장단점을 설명해주세요.", "데이터베이스에서 인덱스의 동작 원리와 장단점에 대해 설명해주세요."),
+    ("Explain the difference between a process and a thread.", "Explain the differences between processes and threads."),
+    ("What is the difference between a process and a thread?", "Explain the difference between a process and a thread."),
+]
+
+# 주제는 같지만 묻는 내용이 다른 질문 (질문 뱅크에서 0.5 기준일 때 중복으로 잘못 판단되던 쌍 포함)
+DISTINCT = [
+    ('Describe the end-to-end Authorization Code Grant flow, detailing the roles of the Client, Resource Owner, Authorization Server, and Resource Server, and the specific OAuth 2.0 terms exchanged at each step. Why is this flow generally preferred over the Implicit Grant for confidential clients (e.g., traditional web applications), particularly in terms of preventing token leakage and ensuring client authentication?',
+     'Compare and contrast the Authorization Code Grant with PKCE, the Client Credentials Grant, and the Resource Owner Password Credentials (ROPC) Grant. For which types of clients or use cases would each be appropriate, and what are the primary security concerns that lead to the recommendation against using ROPC for most public clients? Specifically, how does PKCE enhance the security of the Authorization Code flow for public clients?'),
+    ('Analyze the time complexity of BST operations (search, insertion, deletion) in both average and worst-case scenarios. Explain precisely what structural characteristic causes the worst-case performance and discuss its implications compared to a sorted array or a hash table in terms of guaranteed performance.',
+     "A standard BST can degrade into a structure resembling a linked list under certain insertion patterns. Explain why this degradation occurs, its impact on the tree's performance characteristics, and the general class of solutions designed to mitigate this issue."),
+    ("이진 탐색 트리의 시간 복잡도를 설명해주세요.", "이진 탐색 트리가 편향될 때 성능이 저하되는 이유를 설명해주세요."),
+    ("두 개의 스택만을 사용하여 큐의 enqueue, dequeue 연산을 구현하는 방법을 설명해주세요.",
+     "두 개의 큐만을 사용하여 스택의 push, pop 연산을 구현하는 방법을 설명해주세요."),
+]
+
+
+@pytest.mark.parametrize("original, rephrased", NEAR_DUPLICATES, ids=["ko-suffix", "ko-spacing", "ko-particle", "en-plural", "en-wh-question"])
+def test_rephrased_question_is_duplicate(original, rephrased):
+    index = NearDuplicateIndex()
+    index.add(original)
+    duplicate = index.find_duplicate(rephrased)
+    assert duplicate is not None
+    assert duplicate[0] == original
+    assert duplicate[1] >= DEFAULT_THRESHOLD
+
+
+@pytest.mark.parametrize("first, second", DISTINCT, ids=["oauth-grants", "bst-complexity-vs-degradation", "ko-bst", "stack-queue"])
+def test_distinct_questions_are_kept(first, second):
+    index = NearDuplicateIndex()
+    index.add(first)
+    assert index.find_duplicate(second) is None
+
+
+def test_exact_match_ignores_spacing_and_punctuation():
+    index = NearDuplicateIndex()
+    index.add("캐시 메모리란 무엇인가요?")
+    assert index.find_duplicate("캐시메모리란  무엇인가요") == ("캐시 메모리란 무엇인가요?", 1.0)
+    assert "캐시메모리란 무엇인가요" in index
+
+
+def test_find_duplicate_groups_keeps_first_occurrence():
+    rows = [
+        {"category": "OS", "question": NEAR_DUPLICATES[0][0]},
+        {"category": "Network", "question": NEAR_DUPLICATES[1][0]},
+        {"category": "OS", "question": NEAR_DUPLICATES[0][1]},
+    ]
+    kept, groups = find_duplicate_groups(rows, DEFAULT_THRESHOLD)
+    assert [row["question"] for row in kept] == [NEAR_DUPLICATES[0][0], NEAR_DUPLICATES[1][0]]
+    assert len(groups) == 1
+    assert groups[0]["kept"] == NEAR_DUPLICATES[0][0]
+    assert groups[0]["duplicates"][0]["question"] == NEAR_DUPLICATES[0][1]
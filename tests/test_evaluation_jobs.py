@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+import requests
+
+from services import evaluation_jobs
+from services.evaluation_jobs import InvalidCallbackUrl, validate_callback_url
+
+
+@pytest.mark.parametrize("url", [
+    "http://8.8.8.8/callback",
+    "https://127.0.0.1/callback",
+    "https://10.0.0.5/callback",
+    "https://192.168.0.10/callback",
+    "https://169.254.169.254/latest/meta-data",
+    "https://[::1]/callback",
+    "https://[::ffff:10.0.0.1]/callback",
+    "https://224.0.0.1/callback",
+])
+def test_rejects_non_https_and_internal_callbacks(url):
+    with pytest.raises(InvalidCallbackUrl):
+        asyncio.run(validate_callback_url(url))
+
+
+def test_accepts_public_https_callback():
+    asyncio.run(validate_callback_url("https://8.8.8.8/callback"))
+
+
+def fake_dns(monkeypatch, answers):
+    """호스트마다 조회 결과 목록을 받아, 조회할 때마다 다음 결과를 돌려줍니다(마지막 결과는 계속 유지)."""
+    async def resolve(host, port):
+        results = answers[host]
+        return results.pop(0) if len(results) > 1 else results[0]
+
+    monkeypatch.setattr(evaluation_jobs, "_resolve", resolve)
+
+
+def test_allowlist_limits_callbacks_to_listed_hosts(monkeypatch):
+    monkeypatch.setattr(evaluation_jobs, "EVALUATION_CALLBACK_ALLOWED_HOSTS", {"hooks.internal"})
+    fake_dns(monkeypatch, {"hooks.internal": [["10.0.0.7"]]})
+    asyncio.run(validate_callback_url("https://hooks.internal/callback"))
+    with pytest.raises(InvalidCallbackUrl):
+        asyncio.run(validate_callback_url("https://8.8.8.8/callback"))
+    with pytest.raises(InvalidCallbackUrl):
+        asyncio.run(validate_callback_url("http://hooks.internal/callback"))
+
+
+def test_callback_connects_to_validated_address_with_original_host(monkeypatch):
+    fake_dns(monkeypatch, {"hooks.example.com": [["93.184.216.34"]]})
+    sent = []
+
+    def fake_send(adapter, request, **kwargs):
+        sent.append((request.url, request.headers["Host"], adapter.poolmanager.connection_pool_kw))
+        response = requests.Response()
+        response.status_code = 204
+        return response
+
+    monkeypatch.setattr(evaluation_jobs._PinnedHostAdapter, "send", fake_send)
+    job = {"job_id": "job-1", "status": "succeeded", "callback_url": "https://hooks.example.com:8443/done?x=1"}
+    assert asyncio.run(evaluation_jobs._send_callback(job, retries=0)) == "delivered"
+
+    url, host, pool_kwargs = sent[0]
+    assert url == "https://93.184.216.34:8443/done?x=1"
+    assert host == "hooks.example.com:8443"
+    assert pool_kwargs["server_hostname"] == "hooks.example.com"
+    assert pool_kwargs["assert_hostname"] == "hooks.example.com"
+
+
+def test_callback_is_refused_when_dns_rebinds_to_private_address(monkeypatch):
+    fake_dns(monkeypatch, {"hooks.example.com": [["93.184.216.34"], ["127.0.0.1"]]})
+    monkeypatch.setattr(evaluation_jobs, "_post_pinned", lambda *args: pytest.fail("콜백을 보내면 안 됩니다"))
+
+    asyncio.run(validate_callback_url("https://hooks.example.com/done"))
+    job = {"job_id": "job-2", "status": "succeeded", "callback_url": "https://hooks.example.com/done"}
+    assert asyncio.run(evaluation_jobs._send_callback(job, retries=0)) == "failed"
+
+def test_shutdown_fails_unfinished_jobs_and_sends_callbacks(monkeypatch):
+    sent = []
+
+    async def never_finishes(conversation, deadline=None):
+        await asyncio.Event().wait()
+
+    async def record_callback(job, retries=evaluation_jobs.EVALUATION_CALLBACK_RETRIES):
+        sent.append((job["job_id"], job["status"], retries))
+        return "delivered"
+
+    monkeypatch.setattr(evaluation_jobs, "evaluate_conversation", never_finishes)
+    monkeypatch.setattr(evaluation_jobs, "_send_callback", record_callback)
+    monkeypatch.setattr(evaluation_jobs, "EVALUATION_WORKERS", 1)
+
+    async def scenario():
+        evaluation_jobs.start_evaluation_workers()
+        running = await evaluation_jobs.submit_job("CS", [], "https://8.8.8.8/callback")
+        queued = await evaluation_jobs.submit_job("CS", [], "https://8.8.8.8/callback")
+        await asyncio.sleep(0.01)
+        assert evaluation_jobs.get_job(running["job_id"])["status"] == "running"
+        await evaluation_jobs.stop_evaluation_workers()
+        return running["job_id"], queued["job_id"]
+
+    job_ids = asyncio.run(scenario())
+
+    for job_id in job_ids:
+        job = evaluation_jobs.get_job(job_id)
+        assert job["status"] == "failed"
+        assert job["error"] == "서버 종료로 작업이 중단되었습니다."
+        assert job["callback_status"] == "delivered"
+    assert sorted(sent) == sorted((job_id, "failed", 0) for job_id in job_ids)
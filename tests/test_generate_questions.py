@@ -0,0 +1,88 @@
+import csv
+import sys
+
+import pytest
+
+
+@pytest.fixture
+def generate_questions(monkeypatch, tmp_path):
+    # 모듈을 import할 때 API 키를 확인하므로 가짜 키를 넣어 두고, 입출력 경로는 임시 디렉토리로 바꿉니다.
+    monkeypatch.setenv("GEMINI_API_KEY", "test-key")
+    import generate_questions as module
+
+    input_path = tmp_path / "topics.csv"
+    with open(input_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["first_category", "second_category", "title"])
+        writer.writerow(["Operating System", "프로세스", "프로세스와 스레드"])
+        writer.writerow(["Operating System", "프로세스", "컨텍스트 스위칭"])
+        writer.writerow(["Database", "트랜잭션", "격리 수준"])
+
+    monkeypatch.setattr(module, "INPUT_CSV_PATH", str(input_path))
+    monkeypatch.setattr(module, "OUTPUT_CSV_PATH", str(tmp_path / "cs_questions.csv"))
+    monkeypatch.setattr(module, "CHECKPOINT_PATH", str(tmp_path / "checkpoint.json"))
+    return module
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """
+    주제 그룹마다 서로 다른 질문 두 개를 돌려주는 가짜 모델입니다. fail_topics에 포함된 그룹은 빈 응답을 반환합니다.
+    """
+
+    def __init__(self, fail_topics=()):
+        self.fail_topics = set(fail_topics)
+        self.prompts = []
+
+    async def generate_content_async(self, prompt):
+        self.prompts.append(prompt)
+        if any(topic in prompt for topic in self.fail_topics):
+            return FakeResponse("")
+        if "격리 수준" in prompt:
+            return FakeResponse("1. 트랜잭션 격리 수준별로 발생하는 이상 현상을 설명해주세요.\n"
+                                "2. MVCC가 잠금 없이 읽기 일관성을 보장하는 방법을 설명해주세요.")
+        return FakeResponse("1. 프로세스와 스레드가 메모리를 공유하는 방식의 차이를 설명해주세요.\n"
+                            "2. 컨텍스트 스위칭 비용이 발생하는 원인과 줄이는 방법을 설명해주세요.")
+
+
+def run_main(module, *args):
+    argv = ["generate_questions.py", "--rpm", "6000", "--max-retries", "0", *args]
+    original = sys.argv
+    sys.argv = argv
+    try:
+        module.main()
+    finally:
+        sys.argv = original
+
+
+def read_questions(module):
+    with open(module.OUTPUT_CSV_PATH, encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+def test_load_checkpoint_without_file_starts_fresh(generate_questions):
+    assert generate_questions.load_checkpoint() == set()
+    generate_questions.save_checkpoint({"프로세스"})
+    assert generate_questions.load_checkpoint() == {"프로세스"}
+
+
+def test_main_resumes_failed_groups_and_clears_checkpoint(generate_questions, monkeypatch):
+    failing = FakeModel(fail_topics=["격리 수준"])
+    monkeypatch.setattr(generate_questions, "model", failing)
+    run_main(generate_questions)
+
+    assert generate_questions.load_checkpoint() == {"프로세스"}
+    assert len(read_questions(generate_questions)) == 2
+
+    working = FakeModel()
+    monkeypatch.setattr(generate_questions, "model", working)
+    run_main(generate_questions)
+
+    assert len(working.prompts) == 1
+    assert {row["category"] for row in read_questions(generate_questions)} == {"Operating System", "Database"}
+    assert len(read_questions(generate_questions)) == 4
+    assert generate_questions.load_checkpoint() == set()
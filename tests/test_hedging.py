@@ -0,0 +1,75 @@
+import asyncio
+import time
+
+from services import gemini_service, hedging
+
+MODEL = "primary-model"
+
+
+def started(model_name, ttft_s):
+    start = time.time()
+    return {"model": None, "model_name": model_name, "iterator": None,
+            "start_time": start, "first_chunk_time": start + ttft_s, "text": "질문"}
+
+
+def test_hedged_call_reports_cancelled_primary_wait():
+    cancelled = []
+
+    async def slow():
+        await asyncio.sleep(1)
+        return "primary"
+
+    async def fast():
+        return "hedge"
+
+    label, result = asyncio.run(hedging.hedged_call(slow, fast, 0.02, on_primary_cancelled=cancelled.append))
+    assert (label, result) == ("hedge", "hedge")
+    assert len(cancelled) == 1 and cancelled[0] >= 0.02
+
+
+def test_hedge_deadline_stays_stable_when_hedges_win(monkeypatch):
+    # 기본 요청 5개 중 1개는 느리고(100ms) 나머지는 빠릅니다(2ms). 헤지 요청은 항상 빠릅니다.
+    tracker = hedging.LatencyTracker(window_size=20)
+    monkeypatch.setattr(hedging, "latency_tracker", tracker)
+    monkeypatch.setattr(gemini_service, "latency_tracker", tracker)
+    monkeypatch.setattr(hedging, "HEDGE_DEADLINE_MS", 30)
+    monkeypatch.setattr(hedging, "HEDGE_MIN_DEADLINE_MS", 1)
+    monkeypatch.setattr(hedging, "HEDGE_MIN_SAMPLES", 10)
+    monkeypatch.setattr(hedging, "HEDGE_PERCENTILE", 90)
+    monkeypatch.setattr(gemini_service, "HEDGE_ENABLED", True)
+
+    primary_ttfts = [0.1 if i % 5 == 0 else 0.002 for i in range(60)]
+    hedged = []
+
+    async def resolve(model_name, static_prefix, dynamic_suffix):
+        return None, dynamic_suffix, False
+
+    async def open_primary(model_name, static_prefix, dynamic_suffix, resolved):
+        ttft = primary_ttfts[len(hedged)]
+        await asyncio.sleep(ttft)
+        return started(model_name, ttft)
+
+    async def open_hedge(model_name, static_prefix, dynamic_suffix):
+        hedged[-1] = True
+        await asyncio.sleep(0.002)
+        return started(model_name, 0.002)
+
+    async def finish(started_stream, request_start_time=None):
+        return started_stream["text"], {}
+
+    monkeypatch.setattr(gemini_service, "_resolve_static_prefix_model", resolve)
+    monkeypatch.setattr(gemini_service, "_open_resolved", open_primary)
+    monkeypatch.setattr(gemini_service, "_open_with_static_prefix", open_hedge)
+    monkeypatch.setattr(gemini_service, "_finish_stream", finish)
+
+    async def scenario():
+        for _ in primary_ttfts:
+            hedged.append(False)
+            await gemini_service._generate_with_static_prefix(MODEL, "prefix", "suffix", hedge_model_name=MODEL)
+
+    asyncio.run(scenario())
+
+    # 느린 요청이 헤지에 져도 하한값이 표본에 남아 대기 시간이 빠른 요청의 TTFT까지 내려가지 않습니다.
+    assert hedging.hedge_deadline_s(MODEL) >= 0.02
+    # 마지막 20개 중 헤징은 느린 기본 요청(4개)에서만 일어납니다.
+    assert sum(hedged[-20:]) == 4
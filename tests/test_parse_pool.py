@@ -0,0 +1,24 @@
+from concurrent.futures.process import BrokenProcessPool
+
+from crawler import parse_pool
+
+
+class BrokenPool:
+    def __init__(self):
+        self.shutdown_calls = []
+
+    def submit(self, fn, *args):
+        raise BrokenProcessPool("파서 프로세스 종료")
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        self.shutdown_calls.append((wait, cancel_futures))
+
+
+def test_broken_pool_is_shut_down_and_replaced(monkeypatch):
+    broken = BrokenPool()
+    monkeypatch.setitem(parse_pool._settings, "enabled", True)
+    monkeypatch.setattr(parse_pool, "_pool", broken)
+
+    assert parse_pool.parse_html(len, "<html>") == 6
+    assert broken.shutdown_calls == [(False, True)]
+    assert parse_pool._pool is None
@@ -0,0 +1,51 @@
+import json
+import os
+
+from services.recommendation import (
+    QuestionRecommender, bank_signature, build_index, load_index, save_index
+)
+
+BANK = [
+    {"category": "Operating System", "question": "교착 상태(Deadlock)가 발생하는 네 가지 조건을 설명해주세요."},
+    {"category": "Operating System", "question": "가상 메모리와 페이지 교체 알고리즘에 대해 설명해주세요."},
+    {"category": "Database", "question": "트랜잭션 격리 수준과 각 수준에서 발생하는 문제를 설명해주세요."},
+    {"category": "Database", "question": "인덱스가 조회 성능을 높이는 원리를 설명해주세요."},
+    {"category": "N/A", "question": "분류되지 않은 질문"},
+]
+
+
+def test_recommend_ranks_questions_per_category():
+    recommender = QuestionRecommender(build_index(BANK))
+    results = recommender.recommend(["교착 상태", "트랜잭션 격리"], top_k=1)
+
+    assert {result["category"] for result in results} == {"Operating System", "Database"}
+    by_category = {result["category"]: result["questions"][0] for result in results}
+    assert by_category["Operating System"]["question"] == BANK[0]["question"]
+    assert by_category["Operating System"]["keyword"] == "교착 상태"
+    assert by_category["Database"]["question"] == BANK[2]["question"]
+    assert "분류되지 않은 질문" not in json.dumps(results, ensure_ascii=False)
+
+
+def test_recommend_respects_exclude_and_empty_keywords():
+    recommender = QuestionRecommender(build_index(BANK))
+    assert recommender.recommend(["", "  "]) == []
+
+    results = recommender.recommend(["교착 상태"], top_k=1, exclude=[BANK[0]["question"]])
+    assert BANK[0]["question"] not in [q["question"] for result in results for q in result["questions"]]
+
+
+def test_saved_index_round_trips_and_rejects_corrupt_arrays(tmp_path):
+    index = build_index(BANK)
+    signature = bank_signature(BANK)
+    save_index(index, signature, str(tmp_path))
+
+    loaded = load_index(str(tmp_path))
+    assert loaded["meta"]["signature"] == signature
+    keywords = ["페이지 교체", "인덱스"]
+    assert QuestionRecommender(loaded).recommend(keywords) == QuestionRecommender(index).recommend(keywords)
+
+    indptr_file = os.path.join(str(tmp_path), loaded["meta"]["arrays"]["indptr"])
+    del loaded
+    with open(indptr_file, 'wb') as f:
+        f.write(b"broken")
+    assert load_index(str(tmp_path)) is None
@@ -0,0 +1,36 @@
+from crawler.revalidation import _marked_sections, _section_hash
+
+PAGE = """
+<html><body>
+<div class="hd"><strong>네이버</strong></div>
+<div class="box_review"><dl class="review"><dt>질문</dt><dd>답변 <div>중첩</div></dd></dl></div>
+<div class="ad">광고 {ad}</div>
+<div class="box_review"><dl class="review"><dt>질문2</dt><dd>{answer}</dd></dl></div>
+<script>var token = "{token}"; document.write("<div>");</script>
+<footer><input type="hidden" name="csrf" value="{token}"/></footer>
+</body></html>
+"""
+
+
+def render(answer="답변2", ad="A", token="t1"):
+    return PAGE.format(answer=answer, ad=ad, token=token)
+
+
+def test_marked_sections_returns_every_marked_element():
+    sections = _marked_sections(render(), "box_review")
+    assert sections.count('<div class="box_review">') == 2
+    assert "중첩</div></dd></dl></div>" in sections
+    assert "광고" not in sections
+    assert "csrf" not in sections
+
+
+def test_hash_ignores_churn_outside_review_section():
+    assert _section_hash(render(), "box_review") == _section_hash(render(ad="B", token="t2"), "box_review")
+
+
+def test_hash_changes_when_review_changes():
+    assert _section_hash(render(), "box_review") != _section_hash(render(answer="수정된 답변"), "box_review")
+
+
+def test_hash_falls_back_to_whole_document_without_marker():
+    assert _section_hash(render(), "qnaLists") != _section_hash(render(ad="B"), "qnaLists")
@@ -0,0 +1,49 @@
+import os
+import threading
+
+from crawler.review_store import load_reviews, review_fingerprint, save_reviews
+
+URL = "https://www.saramin.co.kr/zf_user/company-review?csn=1"
+
+
+def make_review(i):
+    return {"questions": [{"question": "면접 질문", "qna_pairs": [{"question": f"질문 {i}", "answer": f"답변 {i}"}]}]}
+
+
+def test_save_and_load_round_trip(tmp_path):
+    reviews = [make_review(i) for i in range(3)]
+    save_reviews("saramin", URL, "네이버", reviews, store_dir=str(tmp_path))
+    stored = load_reviews("saramin", URL, store_dir=str(tmp_path))
+    assert stored["company_name"] == "네이버"
+    assert stored["reviews"] == reviews
+    assert load_reviews("saramin", URL + "&other", store_dir=str(tmp_path)) is None
+
+
+def test_concurrent_saves_leave_one_complete_file(tmp_path):
+    errors = []
+
+    def save(writer):
+        try:
+            for round_no in range(20):
+                reviews = [make_review(f"{writer}-{round_no}-{i}") for i in range(50)]
+                save_reviews("saramin", URL, "네이버", reviews, store_dir=str(tmp_path))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save, args=(writer,)) for writer in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert [name for name in os.listdir(tmp_path) if name.endswith(".tmp")] == []
+    stored = load_reviews("saramin", URL, store_dir=str(tmp_path))
+    writers = {review["questions"][0]["qna_pairs"][0]["question"].split("-")[0] for review in stored["reviews"]}
+    assert len(stored["reviews"]) == 50 and len(writers) == 1
+
+
+def test_fingerprint_ignores_whitespace():
+    spaced = {"questions": [{"question": " 면접  질문 ", "qna_pairs": [{"question": "질문\n1", "answer": "답변 1"}]}]}
+    compact = {"questions": [{"question": "면접 질문", "qna_pairs": [{"question": "질문 1", "answer": "답변 1"}]}]}
+    assert review_fingerprint(spaced) == review_fingerprint(compact)
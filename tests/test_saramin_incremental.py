@@ -0,0 +1,105 @@
+from crawler import saramin
+from crawler.review_store import load_reviews
+
+URL = "https://www.saramin.co.kr/zf_user/interview-review?page=1&orderby=registration&company_nm=test"
+PAGE_SIZE = 2
+
+
+def make_review(name):
+    return {"questions": [{"question": "면접 질문", "qna_pairs": [{"question": name, "answer": ""}]}]}
+
+
+class FakeSite:
+    """
+    최신 후기가 먼저 나오는 사람인 목록을 흉내 냅니다. budget은 한 번의 크롤링에서 받을 수 있는 페이지 수입니다.
+    """
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.budget = None
+        self.failing = False
+
+    def crawl(self, url, timeout):
+        if self.failing:
+            return {"error": "503"}
+        if self.budget is not None:
+            if self.budget <= 0:
+                raise AssertionError("제한 시간을 넘겨 요청했습니다")
+            self.budget -= 1
+        page = int(url.split("page=")[1].split("&")[0])
+        names = self.names[(page - 1) * PAGE_SIZE:page * PAGE_SIZE]
+        return {"company_name": "테스트", "reviews": [make_review(name) for name in names]}
+
+
+def run(monkeypatch, site, store_dir, pages):
+    site.budget = pages
+    clock = {"now": 0.0}
+
+    def monotonic():
+        # 남은 페이지 예산을 다 쓰면 제한 시간이 지난 것으로 봅니다.
+        if site.budget is not None and site.budget <= 0:
+            clock["now"] = 100.0
+        return clock["now"]
+
+    monkeypatch.setattr(saramin, "crawl_saramin_reviews", site.crawl)
+    monkeypatch.setattr(saramin.time, "monotonic", monotonic)
+    return saramin.crawl_saramin_reviews_incremental(URL, timeout=10, max_pages=50, store_dir=str(store_dir))
+
+
+def names_of(result):
+    return [review["questions"][0]["qna_pairs"][0]["question"] for review in result["reviews"]]
+
+
+def test_bootstrap_progresses_across_deadlines(monkeypatch, tmp_path):
+    site = FakeSite([f"r{i}" for i in range(9, -1, -1)])
+
+    first = run(monkeypatch, site, tmp_path, pages=2)
+    assert names_of(first) == ["r9", "r8", "r7", "r6"]
+    assert first["backfill_pending"] is True and "stale" not in first
+    assert load_reviews("saramin", URL, str(tmp_path))["resume_page"] == 3
+
+    # 그 사이 새 후기가 올라와 이전 후기가 뒤 페이지로 밀려도 빠지거나 중복되는 후기가 없어야 합니다.
+    site.names = ["r11", "r10"] + site.names
+    second = run(monkeypatch, site, tmp_path, pages=4)
+    assert names_of(second) == ["r11", "r10", "r9", "r8", "r7", "r6", "r5", "r4"]
+    assert second["backfill_pending"] is True
+
+    third = run(monkeypatch, site, tmp_path, pages=10)
+    assert names_of(third) == [f"r{i}" for i in range(11, -1, -1)]
+    assert "backfill_pending" not in third and "stale" not in third
+    assert load_reviews("saramin", URL, str(tmp_path))["resume_page"] is None
+
+
+def test_bootstrap_without_any_page_is_an_error(monkeypatch, tmp_path):
+    site = FakeSite(["r1"])
+    site.failing = True
+    assert "error" in run(monkeypatch, site, tmp_path, pages=None)
+    assert load_reviews("saramin", URL, str(tmp_path)) is None
+
+
+def test_incomplete_latest_walk_is_stale_and_not_saved(monkeypatch, tmp_path):
+    site = FakeSite(["r3", "r2", "r1", "r0"])
+    run(monkeypatch, site, tmp_path, pages=10)
+
+    site.names = ["r7", "r6", "r5", "r4"] + site.names
+    result = run(monkeypatch, site, tmp_path, pages=1)
+    assert result["stale"] is True
+    assert names_of(result) == ["r3", "r2", "r1", "r0"]
+    assert len(load_reviews("saramin", URL, str(tmp_path))["reviews"]) == 4
+
+
+def test_combined_crawl_counts_backfill_progress_as_success(monkeypatch):
+    from crawler import combined
+
+    partial = {"company_name": "테스트", "reviews": [make_review("r1")], "total_reviews": 1, "backfill_pending": True}
+    monkeypatch.setattr(combined, "crawl_jobkorea", lambda url, timeout: {"company_name": "테스트", "reviews": [], "total_reviews": 0})
+    monkeypatch.setattr(combined, "crawl_saramin", lambda url, timeout: partial)
+    breaker = combined.CircuitBreaker("saramin", failure_threshold=1)
+    monkeypatch.setitem(combined._breakers, "saramin", breaker)
+
+    result = combined.crawl_all_reviews("naver")
+    assert result["backfill_sources"] == ["saramin"]
+    assert "errors" not in result and result["saramin_count"] == 1
+    assert breaker.snapshot()["state"] == "closed"
+    # 다음 요청에서 이어서 모으도록 통합 결과는 캐시하지 않습니다.
+    assert combined._crawl_cache.get("naver") is None
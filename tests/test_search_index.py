@@ -0,0 +1,58 @@
+import json
+
+from services.search_index import SearchIndex
+
+BANK = [
+    {"text": "프로세스와 스레드의 차이를 설명해주세요.", "kind": "question"},
+    {"text": "데이터베이스 인덱스의 동작 원리를 설명해주세요.", "kind": "question"},
+    {"text": "TCP와 UDP의 차이는 무엇인가요?", "kind": "question"},
+]
+REVIEWS = [
+    {"text": "면접에서 프로세스 스케줄링과 스레드 동기화를 물어봤습니다.", "kind": "review"},
+]
+
+
+def build_index():
+    index = SearchIndex()
+    index.replace_group("bank", BANK)
+    index.replace_group("reviews:naver", REVIEWS)
+    return index
+
+
+def texts(results):
+    return [result["text"] for result in results]
+
+
+def test_bm25_ranks_matching_documents_first():
+    results = build_index().search("TCP UDP 차이")
+    assert results[0]["text"] == BANK[2]["text"]
+    assert [result["score"] for result in results] == sorted((result["score"] for result in results), reverse=True)
+
+
+def test_search_filters_by_kind_and_ignores_unknown_terms():
+    index = build_index()
+    assert texts(index.search("스레드", kind="review")) == [REVIEWS[0]["text"]]
+    assert index.search("존재하지않는검색어") == []
+
+
+def test_replace_group_is_noop_for_same_docs_and_replaces_changed_docs():
+    index = build_index()
+    assert index.replace_group("bank", BANK) is False
+
+    assert index.replace_group("bank", BANK[:1]) is True
+    assert index.stats()["documents"] == 2 and index.stats()["groups"] == 2
+    assert index.search("데이터베이스 인덱스") == []
+    assert index.search("스레드", kind="question")[0]["group"] == "bank"
+
+
+def test_snapshot_round_trip_keeps_scores_and_free_slots():
+    index = build_index()
+    index.replace_group("bank", BANK[1:])
+    restored = SearchIndex.from_snapshot(json.loads(index.dumps_snapshot()))
+
+    assert restored.stats() == index.stats()
+    for query in ["프로세스 스레드", "TCP", "인덱스 원리"]:
+        assert restored.search(query) == index.search(query)
+    # 비어 있는 문서 번호를 재사용해도 그룹 교체가 그대로 동작해야 합니다.
+    assert restored.replace_group("reviews:naver", []) is True
+    assert restored.search("스케줄링") == []
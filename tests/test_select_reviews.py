@@ -0,0 +1,61 @@
+import pytest
+
+from crawler.combined import select_reviews
+
+
+def make_result(jobkorea=3, saramin=2):
+    reviews = [
+        {"questions": [{"question": "면접 유형", "answer": f"잡코리아 {i}"},
+                       {"question": "면접 질문", "qna_pairs": [{"question": f"jk-{i}", "answer": ""}]}]}
+        for i in range(jobkorea)
+    ] + [
+        {"questions": [{"question": "면접 질문", "qna_pairs": [{"question": f"sr-{i}", "answer": ""}]}]}
+        for i in range(saramin)
+    ]
+    return {"company_name": "네이버", "reviews": reviews, "jobkorea_count": jobkorea, "total_reviews": len(reviews)}
+
+
+def pair_ids(selected):
+    return [pair["question"] for review in selected["reviews"] for pair in review["qna_pairs"]]
+
+
+def test_pages_through_all_reviews():
+    first = select_reviews(make_result(), offset=0, limit=2, fields=["qna_pairs"])
+    second = select_reviews(make_result(), offset=first["next_offset"], limit=2, fields=["qna_pairs"])
+    last = select_reviews(make_result(), offset=second["next_offset"], limit=2, fields=["qna_pairs"])
+
+    assert pair_ids(first) + pair_ids(second) + pair_ids(last) == ["jk-0", "jk-1", "jk-2", "sr-0", "sr-1"]
+    assert [first["next_offset"], second["next_offset"], last["next_offset"]] == [2, 4, None]
+    assert [review["source"] for review in second["reviews"]] == ["jobkorea", "saramin"]
+
+
+def test_offset_past_end_returns_empty_last_page():
+    selected = select_reviews(make_result(), offset=10, limit=2)
+    assert selected["reviews"] == []
+    assert selected["next_offset"] is None
+    assert selected["total_reviews"] == 5
+
+    saramin = select_reviews(make_result(), source="saramin", offset=2)
+    assert saramin["reviews"] == [] and saramin["next_offset"] is None
+
+
+def test_source_filter_with_limit_stays_within_source():
+    saramin = select_reviews(make_result(), source="saramin", offset=1, limit=5, fields=["qna_pairs"])
+    assert pair_ids(saramin) == ["sr-1"]
+    assert saramin["total_reviews"] == 2 and saramin["next_offset"] is None
+    assert {review["source"] for review in saramin["reviews"]} == {"saramin"}
+
+    jobkorea = select_reviews(make_result(), source="jobkorea", limit=2, fields=["qna_pairs", "info"])
+    assert pair_ids(jobkorea) == ["jk-0", "jk-1"]
+    assert jobkorea["next_offset"] == 2
+    assert jobkorea["reviews"][0]["info"] == [{"question": "면접 유형", "answer": "잡코리아 0"}]
+
+
+def test_without_fields_returns_original_reviews():
+    result = make_result()
+    assert select_reviews(result, limit=1)["reviews"] == result["reviews"][:1]
+
+
+def test_unknown_field_is_rejected():
+    with pytest.raises(ValueError):
+        select_reviews(make_result(), fields=["questions", "salary"])